@@ -5,11 +5,16 @@ from backend.services.stock_service import StockService
 from backend.services.llm_service import LLMService
 from backend.services.financial_service import FinancialService
 
-def get_dart_service(api_key: str = Header(..., alias="X-DART-API-Key")) -> DARTService:
-    """DART 서비스 의존성"""
+async def get_dart_service(api_key: str = Header(..., alias="X-DART-API-Key")) -> DARTService:
+    """DART 서비스 의존성 (회사 목록 스냅샷이 없으면 먼저 준비)"""
     if not api_key:
         raise HTTPException(status_code=400, detail="DART API Key required")
-    return DARTService(api_key=api_key)
+    dart_service = DARTService(api_key=api_key)
+    try:
+        await dart_service.ensure_corp_snapshot()
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"회사 목록을 불러오지 못했습니다: {e}")
+    return dart_service
 
 def get_krx_service() -> KRXService:
     """KRX 서비스 의존성"""
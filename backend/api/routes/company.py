@@ -1,52 +1,106 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List
+from fastapi.responses import JSONResponse
+from typing import List, Optional
 from backend.services.dart_service import DARTService
+from backend.services.corp_registry import get_corp_registry
 from backend.api.dependencies import get_dart_service
-from shared.schemas import Company, CompanySearchResponse, ErrorResponse
+from backend.core.exceptions import InvalidCursorException
+from backend.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from shared.schemas import Company, CompanySearchResponse, CompanyPageResponse, ErrorResponse
 from backend.core.logger import get_backend_logger
 
 logger = get_backend_logger("company")
 router = APIRouter(prefix="/api/companies", tags=["companies"])
 
 
-@router.get("/list", response_model=CompanySearchResponse)
+@router.get("/list", response_model=CompanyPageResponse)
 async def get_company_list(
     force_refresh: bool = Query(False, description="캐시 무시하고 새로 다운로드"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    fields: Optional[str] = Query(None, description="반환 필드 (예: corp_code,corp_name)"),
+    listed_only: bool = Query(False, description="상장회사만"),
     dart_service: DARTService = Depends(get_dart_service)
 ):
-    """전체 회사 목록 조회"""
+    """전체 회사 목록 조회 (커서 페이지네이션)"""
     try:
-        logger.info(f"Fetching company list (force_refresh={force_refresh})")
-        companies = dart_service.get_corp_list(force_refresh=force_refresh)
-        logger.info(f"Successfully fetched {len(companies)} companies")
-        return {
-            "companies": companies,
-            "total": len(companies)
-        }
+        logger.info(f"Fetching company list (force_refresh={force_refresh}, limit={limit}, listed_only={listed_only})")
+        if force_refresh:
+            await dart_service.ensure_corp_snapshot(force_refresh=True)
+        page = dart_service.list_companies_page(cursor, limit, fields, listed_only)
+        logger.info(f"Successfully fetched {len(page['companies'])} of {page['total']} companies")
+        # 행 단위 모델 검증 없이 그대로 직렬화
+        return JSONResponse(content=page)
+    except (InvalidCursorException, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch company list: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/search", response_model=CompanySearchResponse)
+@router.get("/search", response_model=CompanyPageResponse)
 async def search_companies(
     keyword: str = Query(..., min_length=1, description="검색 키워드"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    fields: Optional[str] = Query(None, description="반환 필드 (예: corp_code,corp_name)"),
+    listed_only: bool = Query(False, description="상장회사만"),
     dart_service: DARTService = Depends(get_dart_service)
 ):
-    """회사 검색"""
+    """회사 검색 (커서 페이지네이션)"""
     try:
         logger.info(f"Searching companies with keyword: '{keyword}'")
-        companies = dart_service.search_companies(keyword)
-        logger.info(f"Found {len(companies)} companies for keyword '{keyword}'")
+        page = dart_service.search_companies_page(keyword, cursor, limit, fields, listed_only)
+        logger.info(f"Found {page['total']} companies for keyword '{keyword}'")
+        return JSONResponse(content=page)
+    except (InvalidCursorException, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to search companies with keyword '{keyword}': {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/autocomplete", response_model=CompanySearchResponse)
+async def autocomplete_companies(
+    prefix: str = Query(..., min_length=1, description="회사명 접두어"),
+    k: int = Query(10, ge=1, le=50, description="최대 결과 수"),
+    dart_service: DARTService = Depends(get_dart_service)
+):
+    """회사명 자동완성 (상위 k개)"""
+    try:
+        companies = dart_service.autocomplete_companies(prefix, k)
+        logger.info(f"Autocomplete '{prefix}' returned {len(companies)} companies")
         return {
             "companies": companies,
             "total": len(companies)
         }
     except Exception as e:
-        logger.error(f"Failed to search companies with keyword '{keyword}': {str(e)}", exc_info=True)
+        logger.error(f"Failed to autocomplete companies with prefix '{prefix}': {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/registry/status")
+async def get_registry_status():
+    """회사 목록 레지스트리 상태 (마지막 갱신 시각, 차분 크기)"""
+    return get_corp_registry().status()
+
+
+@router.get("/by-stock/{stock_code}", response_model=Company)
+async def get_company_by_stock_code(
+    stock_code: str,
+    dart_service: DARTService = Depends(get_dart_service)
+):
+    """종목코드로 회사 정보 조회"""
+    try:
+        logger.info(f"Fetching company info for stock_code: {stock_code}")
+        company = dart_service.get_company_by_stock_code(stock_code)
+        logger.info(f"Successfully fetched company: {company.get('corp_name')}")
+        return company
+    except Exception as e:
+        logger.error(f"Failed to fetch company with stock_code {stock_code}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.get("/{corp_code}", response_model=Company)
 async def get_company(
     corp_code: str,
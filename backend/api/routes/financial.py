@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
@@ -7,15 +7,20 @@ from backend.services.financial_service import FinancialService
 from backend.services.stock_service import StockService
 from backend.services.excel_service import ExcelService
 from backend.services.document_financial_service import DocumentFinancialService
+from backend.services.timeseries_service import TimeSeriesService
+from backend.services.corp_registry import get_corp_registry
 from backend.api.dependencies import get_dart_service, get_financial_service, get_stock_service
 from backend.core.logger import get_backend_logger
 from backend.core.config import settings
 from backend.core.llm.upstage import UpstageProvider
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 logger = get_backend_logger("financial")
 router = APIRouter(prefix="/api/financial", tags=["financial"])
 
+# Periodic report codes accepted by fnlttMultiAcnt
+REPRT_CODE_PATTERN = "^(11011|11012|11013|11014)$"
+
 class ExcelDownloadRequest(BaseModel):
     """Excel download request"""
     companies: List[dict]
@@ -26,38 +31,132 @@ class MultipleCompaniesComparisonRequest(BaseModel):
     corp_codes: List[str]
     bsns_year: str
     fs_div: str = "CFS"
+    reprt_code: str = Field("11011", pattern=REPRT_CODE_PATTERN)
 
 
 @router.get("/{corp_code}")
 async def get_financial_data(
     corp_code: str,
     bsns_year: str = Query(..., description="business year"),
-    fs_div: str = Query("CFS", description="financial statement type"),
+    fs_div: str = Query("CFS", pattern="^(CFS|OFS|ALL)$",
+                        description="financial statement type (CFS, OFS, or ALL for both)"),
+    reprt_code: str = Query("11011", pattern=REPRT_CODE_PATTERN,
+                            description="report code (11011 annual, 11012 half-year, 11013 Q1, 11014 Q3)"),
     dart_service: DARTService = Depends(get_dart_service)
 ):
-    """Get financial data"""
+    """Get financial data
+
+    With fs_div=ALL the consolidated and separate statements come from a single
+    upstream fetch and are returned side by side under "statements".
+    """
     try:
-        logger.info('Fetching financial data: corp_code={}, year={}, fs_div={}'.format(corp_code, bsns_year, fs_div))
-        result = await dart_service.get_financial_data(corp_code, bsns_year, fs_div)
+        logger.info('Fetching financial data: corp_code={}, year={}, fs_div={}, reprt_code={}'.format(corp_code, bsns_year, fs_div, reprt_code))
+        result = await dart_service.get_financial_data(corp_code, bsns_year, fs_div, reprt_code)
 
         if not result['items']:
             logger.warning('No financial data found: corp_code={}, year={}'.format(corp_code, bsns_year))
         else:
             logger.info('Successfully fetched {} financial items'.format(len(result['items'])))
 
-        return {
+        response = {
             "financial_data": result['items'],
             "ratios": result['ratios'],
+            "reprt_code": reprt_code,
             "is_listed": result.get('is_listed', True),
             "source": result.get('source'),
             "error": result.get('error'),
             "message": result.get('error') or ("No data available" if not result['items'] else None)
         }
+        if 'statements' in result:
+            response["statements"] = {
+                div: {"financial_data": statement['items'], "ratios": statement['ratios']}
+                for div, statement in result['statements'].items()
+            }
+        return response
     except Exception as e:
         logger.error('Failed to fetch financial data: {}'.format(str(e)), exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{corp_code}/ttm")
+async def get_financial_ttm(
+    corp_code: str,
+    fs_div: str = Query("CFS", pattern="^(CFS|OFS)$", description="financial statement type"),
+    dart_service: DARTService = Depends(get_dart_service)
+):
+    """Get trailing-twelve-month figures
+
+    Built from the quarterly, half-year and annual reports of recent years. Income
+    statement accounts are summed over the last four quarters; balance sheet accounts
+    use the period-end balance.
+    """
+    try:
+        logger.info('Fetching TTM financial data: corp_code={}, fs_div={}'.format(corp_code, fs_div))
+
+        company = dart_service.get_company_by_code(corp_code)
+        if company['stock_code'] == 'N/A':
+            raise HTTPException(status_code=400, detail='TTM is only available for listed companies')
+
+        result = await dart_service.get_ttm_financial_data(corp_code, fs_div)
+        if result['period'] is None:
+            raise HTTPException(status_code=404, detail='No periodic reports found')
+
+        logger.info('Successfully built TTM for {} ({} windows recomputed)'.format(result['period'], result['recomputed']))
+        return {
+            'corp_name': result['corp_name'],
+            'stock_code': result['stock_code'],
+            'period': result['period'],
+            'periods': result['periods'],
+            'financial_data': result['items'],
+            'ratios': result['ratios'],
+            'series': result['series'],
+            'recomputed': result['recomputed']
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error('Failed to fetch TTM financial data: {}'.format(str(e)), exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{corp_code}/timeseries")
+async def get_financial_timeseries(
+    corp_code: str,
+    start_year: int = Query(..., description="first year of the series"),
+    end_year: int = Query(..., description="last year of the series"),
+    fs_div: str = Query("CFS", pattern="^(CFS|OFS)$", description="financial statement type"),
+    dart_service: DARTService = Depends(get_dart_service)
+):
+    """Get a per-account yearly series
+
+    Each annual filing carries three years, so only every third business year is
+    requested and the periods are stitched together, preferring the most recent filing.
+    """
+    try:
+        logger.info('Fetching financial timeseries: corp_code={}, years={}~{}, fs_div={}'.format(corp_code, start_year, end_year, fs_div))
+
+        company = dart_service.get_company_by_code(corp_code)
+        if company['stock_code'] == 'N/A':
+            raise HTTPException(status_code=400, detail='Time series is only available for listed companies')
+
+        timeseries_service = TimeSeriesService(dart_service.dart_repo)
+        result = await timeseries_service.get_account_series(corp_code, start_year, end_year, fs_div)
+
+        logger.info('Successfully built {} account series from {} filings'.format(len(result['series']), result['requests']))
+        return {
+            'corp_name': company['corp_name'],
+            'stock_code': company['stock_code'],
+            **result
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error('Failed to fetch financial timeseries: {}'.format(str(e)), exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{corp_code}/stock-info")
 async def get_stock_info(
     corp_code: str,
@@ -68,8 +167,14 @@ async def get_stock_info(
 ):
     """Get stock information"""
     try:
+        # 회사명이 없으면 레지스트리 종목코드 색인으로 보완
+        if not corp_name:
+            company = get_corp_registry().find_by_stock_code(stock_code)
+            if company is not None:
+                corp_name = company.corp_name
+
         logger.info('Fetching stock info: stock_code={}, corp_name={}, bsns_year={}'.format(stock_code, corp_name, bsns_year))
-        stock_info = stock_service.get_stock_info(stock_code, corp_name, bsns_year)
+        stock_info = await stock_service.get_stock_info_shared(stock_code, corp_name, bsns_year)
         logger.info('Successfully fetched stock info for {}'.format(stock_code))
         return stock_info
     except Exception as e:
@@ -95,7 +200,7 @@ async def calc_per_pbr(
         logger.info('Calculating PER/PBR: corp_code={}, stock_code={}'.format(corp_code, request.stock_code))
 
         # Get stock info
-        stock_info = stock_service.get_stock_info(request.stock_code, request.corp_name)
+        stock_info = await stock_service.get_stock_info_shared(request.stock_code, request.corp_name)
 
         # Prepare financial data format
         financial_data = {'items': request.financial_items}
@@ -130,7 +235,7 @@ async def get_disclosures(
     """Get disclosure list"""
     try:
         logger.info('Fetching disclosures: corp_code={}, year={}'.format(corp_code, bsns_year))
-        result = dart_service.get_disclosure_list(corp_code, bsns_year)
+        result = await dart_service.get_disclosure_list(corp_code, bsns_year)
         logger.info('Successfully fetched {} disclosures'.format(result['total']))
         return result
     except Exception as e:
@@ -153,7 +258,7 @@ async def get_financial_documents(
         company = dart_service.get_company_by_code(corp_code)
 
         # Get financial documents list
-        documents = dart_service.dart_repo.get_financial_documents(corp_code, start_year, end_year)
+        documents = await dart_service.dart_repo.get_financial_documents(corp_code, start_year, end_year)
 
         logger.info('Successfully fetched {} financial documents'.format(len(documents)))
         return {
@@ -261,8 +366,18 @@ async def get_multiple_companies_comparison(
             ],
             "2023": [...],
             "2022": [...]
-        }
+        },
+        "partial": false,
+        "failed": [{"corp_code": "...", "bsns_year": "...", "error": "..."}]
     }
+
+    Each annual report carries three years (current, previous, the one before), so
+    only the reports needed to cover bsns_year and the two years before are fetched
+    (usually just bsns_year's). Companies still missing years, e.g. because the
+    latest report is not filed yet, fall back to earlier reports. Fetches run
+    concurrently, bounded by comparison_max_concurrency, and each one is limited to
+    comparison_task_timeout seconds. Failed fetches are reported in "failed"
+    instead of failing the request.
     """
     try:
         logger.info('Fetching comparison data for {} companies'.format(len(request.corp_codes)))
@@ -272,36 +387,30 @@ async def get_multiple_companies_comparison(
         
         # Step 1: Get company information
         company_info = {}
-        companies_financial_data = {}
-        
         for corp_code in request.corp_codes:
             try:
-                company = dart_service.get_company_by_code(corp_code)
-                company_info[corp_code] = company
-                
-                # Get financial data for this company
-                years = [
-                    str(int(request.bsns_year)),
-                    str(int(request.bsns_year) - 1),
-                    str(int(request.bsns_year) - 2)
-                ]
-                
-                all_financial_data = []
-                for year in years:
-                    try:
-                        result = await dart_service.get_financial_data(corp_code, year, request.fs_div)
-                        if result and result.get('items'):
-                            all_financial_data.extend(result['items'])
-                    except Exception as year_error:
-                        logger.warning('Failed to fetch data for corp_code={}, year={}: {}'.format(corp_code, year, str(year_error)))
-                
-                companies_financial_data[corp_code] = all_financial_data
-                logger.info('Successfully fetched {} items for corp_code={}'.format(len(all_financial_data), corp_code))
-                
+                company_info[corp_code] = dart_service.get_company_by_code(corp_code)
             except Exception as company_error:
                 logger.error('Failed to process corp_code={}: {}'.format(corp_code, str(company_error)))
                 raise HTTPException(status_code=500, detail='Failed to process corp_code={}: {}'.format(corp_code, str(company_error)))
         
+        # Get the reports covering the last three years for all companies
+        results, failures = await dart_service.get_comparison_filings(
+            list(company_info), request.bsns_year, request.fs_div, request.reprt_code
+        )
+        for failure in failures:
+            logger.warning('Failed to fetch data for corp_code={}, year={}: {}'.format(failure['corp_code'], failure['bsns_year'], failure['error']))
+        
+        companies_financial_data = {}
+        for corp_code, by_year in results.items():
+            all_financial_data = []
+            for year in sorted(by_year, reverse=True):
+                result = by_year.get(year)
+                if result and result.get('items'):
+                    all_financial_data.extend(result['items'])
+            companies_financial_data[corp_code] = all_financial_data
+            logger.info('Successfully fetched {} items for corp_code={}'.format(len(all_financial_data), corp_code))
+        
         # Step 2: Prepare comparison data
         companies_comparison_data = financial_service.prepare_comparison_data(companies_financial_data)
         
@@ -315,7 +424,9 @@ async def get_multiple_companies_comparison(
         
         return {
             'success': True,
-            'comparison_data': comparison_data
+            'comparison_data': comparison_data,
+            'partial': bool(failures),
+            'failed': failures
         }
         
     except HTTPException:
@@ -325,59 +436,140 @@ async def get_multiple_companies_comparison(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _statements_from_items(financial_items: List[dict], ratios: dict) -> dict:
+    """Group fnlttMultiAcnt-style items sent by the client into sheet sections"""
+    financial_statements = {
+        'balance_sheet': {},
+        'income_statement': {},
+        'cash_flow': {},
+        'ratios': ratios
+    }
+
+    for item in financial_items:
+        account_nm = item.get('display_name', item.get('account_nm', ''))
+        sj_div = item.get('sj_div', '')
+
+        year_data = {}
+
+        if item.get('thstrm_dt'):
+            year = item['thstrm_dt'][:4] if len(item['thstrm_dt']) >= 4 else None
+            if year:
+                year_data[year] = item.get('thstrm_amount', 0)
+
+        if item.get('frmtrm_dt'):
+            year = item['frmtrm_dt'][:4] if len(item['frmtrm_dt']) >= 4 else None
+            if year:
+                year_data[year] = item.get('frmtrm_amount', 0)
+
+        if item.get('bfefrmtrm_dt'):
+            year = item['bfefrmtrm_dt'][:4] if len(item['bfefrmtrm_dt']) >= 4 else None
+            if year:
+                year_data[year] = item.get('bfefrmtrm_amount', 0)
+
+        if sj_div == 'BS':
+            financial_statements['balance_sheet'][account_nm] = year_data
+        elif sj_div == 'IS':
+            financial_statements['income_statement'][account_nm] = year_data
+        elif sj_div == 'CF':
+            financial_statements['cash_flow'][account_nm] = year_data
+
+    return financial_statements
+
+
+@router.get("/{corp_code}/statements")
+async def get_full_statements(
+    corp_code: str,
+    bsns_year: str = Query(..., description="business year"),
+    fs_div: str = Query("CFS", pattern="^(CFS|OFS)$", description="financial statement type"),
+    reprt_code: str = Query("11011", pattern=REPRT_CODE_PATTERN, description="report code"),
+    dart_service: DARTService = Depends(get_dart_service)
+):
+    """Get the full statements (every account of BS/IS/CIS/CF/SCE)
+
+    The fnlttSinglAcntAll response is parsed once into the local statement store;
+    later requests for the same filing are served from the store.
+    """
+    try:
+        logger.info('Fetching full statements: corp_code={}, year={}, fs_div={}, reprt_code={}'.format(corp_code, bsns_year, fs_div, reprt_code))
+
+        company = dart_service.get_company_by_code(corp_code)
+        if company['stock_code'] == 'N/A':
+            raise HTTPException(status_code=400, detail='Full statements are only available for listed companies')
+
+        result = await dart_service.get_full_statements(corp_code, bsns_year, fs_div, reprt_code)
+        if not result['lines']:
+            raise HTTPException(status_code=404, detail='No statements found')
+
+        logger.info('Successfully loaded {} statement lines'.format(len(result['lines'])))
+        return {
+            'corp_name': result['corp_name'],
+            'stock_code': result['stock_code'],
+            'bsns_year': bsns_year,
+            'reprt_code': reprt_code,
+            'fs_div': fs_div,
+            'rcept_no': result['rcept_no'],
+            'statements': result['financial_statements'],
+            'ratios': result['ratios'],
+            'lines': [
+                {key: line[key] for key in line if key not in ('corp_code', 'bsns_year', 'reprt_code', 'fs_div')}
+                for line in result['lines']
+            ]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error('Failed to fetch full statements: {}'.format(str(e)), exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/download-excel")
-async def download_financial_excel(request: ExcelDownloadRequest):
-    """Download financial information as Excel file"""
+async def download_financial_excel(
+    request: ExcelDownloadRequest,
+    api_key: Optional[str] = Header(None, alias="X-DART-API-Key")
+):
+    """Download financial information as Excel file
+
+    Listed companies sent with corp_code and bsns_year are built from the full
+    statement store when an API key is given; otherwise the financial_data sent
+    by the client is used as before.
+    """
     try:
         logger.info('Excel download requested for {} companies'.format(len(request.companies)))
         
         if not request.companies:
             raise HTTPException(status_code=400, detail='No company data')
         
+        dart_service = None
+        if api_key:
+            try:
+                dart_service = DARTService(api_key=api_key)
+                await dart_service.ensure_corp_snapshot()
+            except Exception as e:
+                logger.warning('Company list unavailable, using request data: {}'.format(e))
+                dart_service = None
+
         financial_data = []
         
         for company in request.companies:
             corp_name = company.get('corp_name', 'Unknown')
             stock_code = company.get('stock_code', 'N/A')
-            financial_items = company.get('financial_data', [])
-            ratios = company.get('ratios', {})
-            
-            logger.info('Processing company: {}, items={}'.format(corp_name, len(financial_items)))
-            
-            financial_statements = {
-                'balance_sheet': {},
-                'income_statement': {},
-                'cash_flow': {},
-                'ratios': ratios
-            }
-            
-            for item in financial_items:
-                account_nm = item.get('display_name', item.get('account_nm', ''))
-                sj_div = item.get('sj_div', '')
-                
-                year_data = {}
-                
-                if item.get('thstrm_dt'):
-                    year = item['thstrm_dt'][:4] if len(item['thstrm_dt']) >= 4 else None
-                    if year:
-                        year_data[year] = item.get('thstrm_amount', 0)
-                
-                if item.get('frmtrm_dt'):
-                    year = item['frmtrm_dt'][:4] if len(item['frmtrm_dt']) >= 4 else None
-                    if year:
-                        year_data[year] = item.get('frmtrm_amount', 0)
-                
-                if item.get('bfefrmtrm_dt'):
-                    year = item['bfefrmtrm_dt'][:4] if len(item['bfefrmtrm_dt']) >= 4 else None
-                    if year:
-                        year_data[year] = item.get('bfefrmtrm_amount', 0)
-                
-                if sj_div == 'BS':
-                    financial_statements['balance_sheet'][account_nm] = year_data
-                elif sj_div == 'IS':
-                    financial_statements['income_statement'][account_nm] = year_data
-                elif sj_div == 'CF':
-                    financial_statements['cash_flow'][account_nm] = year_data
+            financial_statements = None
+
+            if dart_service and company.get('corp_code') and company.get('bsns_year') and stock_code != 'N/A':
+                try:
+                    result = await dart_service.get_full_statements(
+                        company['corp_code'], str(company['bsns_year']), company.get('fs_div', 'CFS')
+                    )
+                    if result['lines']:
+                        financial_statements = result['financial_statements']
+                        logger.info('Processing company from statement store: {}, lines={}'.format(corp_name, len(result['lines'])))
+                except Exception as e:
+                    logger.warning('Statement store unavailable for {}, using request data: {}'.format(corp_name, e))
+
+            if financial_statements is None:
+                financial_items = company.get('financial_data', [])
+                logger.info('Processing company: {}, items={}'.format(corp_name, len(financial_items)))
+                financial_statements = _statements_from_items(financial_items, company.get('ratios', {}))
             
             financial_data.append({
                 'company_name': corp_name,
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from backend.repositories.dart_scheduler import get_dart_scheduler
+from backend.repositories.bulk_store import get_bulk_store
+from backend.repositories.financial_cache import get_financial_cache
+from backend.repositories.statement_store import get_statement_store
+from backend.utils.singleflight import single_flight_stats
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("/dart")
+async def get_dart_metrics():
+    """DART 호출 한도 현황 (API 키별 오늘 사용량, 남은 한도, 버킷 상태), 재무정보 캐시 크기,
+    동시 요청 합치기 통계, 전체 재무제표 저장소/일괄 자료 크기"""
+    cache = get_financial_cache()
+    bulk_store = get_bulk_store()
+    return {
+        'quota': get_dart_scheduler().metrics(),
+        'financial_cache': cache.stats() if cache else None,
+        'single_flight': single_flight_stats(),
+        'statement_store': get_statement_store().stats(),
+        'bulk_store': bulk_store.stats() if bulk_store else None,
+    }
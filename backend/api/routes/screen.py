@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import asyncio
+from backend.repositories.bulk_store import get_bulk_store
+from backend.services.screen_service import MAX_LIMIT, ScreenService
+from backend.core.logger import get_backend_logger
+
+logger = get_backend_logger("screen")
+router = APIRouter(prefix="/api/screen", tags=["screen"])
+
+
+@router.get("")
+async def screen_companies(
+    q: str = Query(..., min_length=1,
+                   description="filter expression, e.g. 'ROE > 15 and 부채비율 < 100 and 매출액 CAGR3 > 10%'"),
+    year: Optional[int] = Query(None, description="business year (default: latest year with broad coverage)"),
+    fs_div: str = Query("CFS", pattern="^(CFS|OFS)$", description="financial statement type"),
+    sort: Optional[str] = Query(None, description="sort expression, e.g. 'ROE' or '매출액 CAGR3'"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="sort order"),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT, description="maximum number of results")
+):
+    """Screen every company in the bulk financial store with a filter expression
+
+    Metrics are the ratios (영업이익률, 순이익률, ROE, ROA, 부채비율, 자기자본비율) and
+    accounts (매출액, 영업이익, 당기순이익, 자산총계, 부채총계, 자본총계) of the annual report,
+    optionally followed by CAGR<n> or YOY. Numbers accept %, 억 and 조 suffixes.
+    """
+    bulk_store = get_bulk_store()
+    if bulk_store is None:
+        raise HTTPException(status_code=503, detail='Bulk financial store is not loaded (run run_bulk_loader.py)')
+
+    try:
+        logger.info('Screening: q={}, year={}, fs_div={}, sort={}'.format(q, year, fs_div, sort))
+        result = await asyncio.to_thread(
+            ScreenService(bulk_store).screen, q, year, fs_div, sort, order == "desc", limit
+        )
+        logger.info('Screen matched {} of {} companies in {}ms'.format(
+            result['matched'], result['universe'], result['elapsed_ms']))
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error('Error screening companies: {}'.format(str(e)), exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -32,6 +32,47 @@ class Settings(BaseSettings):
     # DART API
     dart_base_url: str = "https://opendart.fss.or.kr/api"
     
+    # 회사 목록 스냅샷 (corpCode.xml)
+    corp_snapshot_path: str = "data/corp_codes.bin"
+    corp_refresh_interval_hours: float = 24
+    corp_load_trace_memory: bool = False  # tracemalloc으로 파싱 최대 메모리 측정
+    
+    # 재무정보 응답 캐시 (SQLite)
+    financial_cache_enabled: bool = True
+    financial_cache_path: str = "data/financial_cache.sqlite3"
+    financial_cache_max_entries: int = 20000  # 초과 시 LRU 제거
+    financial_cache_ttl_past_days: float = 30  # 확정된 과거 사업연도
+    financial_cache_ttl_current_hours: float = 6  # 공시가 진행 중인 연도
+    financial_cache_stale_hours: float = 24  # 유효기간 이후 기존 값 사용 + 백그라운드 갱신 구간
+    financial_cache_negative_hours: float = 6  # DART "데이터 없음"(013) 응답 보관 기간
+    
+    # 전체 재무제표 저장소 (fnlttSinglAcntAll, SQLite)
+    statement_store_path: str = "data/statements.sqlite3"
+    statement_store_ttl_past_days: float = 30  # 확정된 과거 사업연도 재적재 주기
+    statement_store_ttl_current_hours: float = 6  # 공시가 진행 중인 연도 재적재 주기
+    
+    # 재무제표 일괄 자료 (Parquet, run_bulk_loader.py로 적재)
+    bulk_store_path: str = "data/bulk"
+    
+    # HTTP 연결 풀 (외부 API 호출 공통)
+    http_pool_connections: int = 4  # 연결 풀을 유지할 호스트 수
+    http_pool_maxsize: int = 10  # 호스트별 최대 연결 수
+    http_connect_timeout: float = 5
+    http_read_timeout: float = 30
+    http_max_retries: int = 2  # 연결 실패 시 재시도 횟수
+    
+    # DART 호출 스케줄러 (API 키별 토큰 버킷 + 일일 한도)
+    dart_rate_per_second: float = 10  # 초당 토큰 충전 수
+    dart_burst: int = 20  # 순간 최대 호출 수
+    dart_daily_quota: int = 20000  # 일일 호출 한도
+    dart_background_reserve: float = 0.5  # 백그라운드 호출 뒤에도 남겨 둘 토큰 비율
+    dart_background_daily_share: float = 0.8  # 백그라운드 호출이 쓸 수 있는 일일 한도 비율
+    dart_quota_ledger_path: str = "data/dart_quota.sqlite3"
+    
+    # 다중 기업 비교 (회사 x 연도 동시 조회)
+    comparison_max_concurrency: int = 8  # 동시에 진행할 조회 수
+    comparison_task_timeout: float = 20  # 조회 하나의 제한 시간 (초)
+    
     # KRX
     krx_url: str = "https://kind.krx.co.kr/corpgeneral/corpList.do"
     
@@ -3,6 +3,11 @@ class DARTAPIException(Exception):
     pass
 
 
+class DARTQuotaExceededException(DARTAPIException):
+    """DART 일일 호출 한도 초과"""
+    pass
+
+
 class KRXDataException(Exception):
     """KRX 데이터 관련 예외"""
     pass
@@ -26,3 +31,8 @@ class CompanyNotFoundException(Exception):
 class FinancialDataNotFoundException(Exception):
     """재무 데이터를 찾을 수 없음"""
     pass
+
+
+class InvalidCursorException(Exception):
+    """잘못되었거나 만료된 페이지 커서"""
+    pass
@@ -0,0 +1,125 @@
+"""
+공유 HTTP 세션
+외부 API(DART 등) 호출이 매번 TCP/TLS 연결을 새로 맺지 않도록
+프로세스 전체에서 연결 풀과 keep-alive를 공유합니다.
+동기 코드(백그라운드 스레드)는 requests 세션을, async 라우트는 httpx 클라이언트를 사용합니다.
+"""
+import asyncio
+import threading
+from typing import Optional, Tuple
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.core.config import settings
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def create_session(
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None,
+    max_retries: Optional[int] = None
+) -> requests.Session:
+    """연결 풀 세션 생성
+
+    Args:
+        pool_connections: 연결 풀을 유지할 호스트 수
+        pool_maxsize: 호스트별 최대 연결 수 (초과 요청은 연결이 반납될 때까지 대기)
+        max_retries: 연결 실패 시 재시도 횟수 (응답을 받은 요청은 재시도하지 않음)
+    """
+    retry = Retry(
+        total=settings.http_max_retries if max_retries is None else max_retries,
+        connect=settings.http_max_retries if max_retries is None else max_retries,
+        read=0,
+        status=0,
+        backoff_factor=0.3,
+        allowed_methods=frozenset(['GET']),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or settings.http_pool_connections,
+        pool_maxsize=pool_maxsize or settings.http_pool_maxsize,
+        max_retries=retry,
+        pool_block=True,
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # 기존 DART 호출과 동일하게 인증서 검증 생략
+    session.verify = False
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """프로세스 공유 세션 반환"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def close_http_session():
+    """공유 세션 종료 (풀의 연결 반납)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def http_timeout(read: Optional[float] = None) -> Tuple[float, float]:
+    """(연결, 읽기) 타임아웃
+
+    Args:
+        read: 읽기 타임아웃 (없으면 설정 기본값)
+    """
+    return settings.http_connect_timeout, settings.http_read_timeout if read is None else read
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """연결 풀 async 클라이언트 생성 (create_session()과 같은 설정)"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.http_pool_maxsize * settings.http_pool_connections,
+            max_keepalive_connections=settings.http_pool_maxsize,
+        ),
+        timeout=httpx.Timeout(settings.http_read_timeout, connect=settings.http_connect_timeout),
+        transport=httpx.AsyncHTTPTransport(retries=settings.http_max_retries, verify=False),
+        verify=False,
+        # requests와 동일하게 리다이렉트 따라감
+        follow_redirects=True,
+    )
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공유 async 클라이언트 반환
+
+    httpx 연결 풀은 생성된 이벤트 루프에 묶이므로, 루프가 바뀌면 새로 만듭니다.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop or _async_client.is_closed:
+        _async_client = create_async_client()
+        _async_client_loop = loop
+    return _async_client
+
+
+async def close_async_http_client():
+    """공유 async 클라이언트 종료"""
+    global _async_client, _async_client_loop
+    client, _async_client, _async_client_loop = _async_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def async_http_timeout(read: Optional[float] = None) -> httpx.Timeout:
+    """async 클라이언트용 (연결, 읽기) 타임아웃"""
+    connect, read = http_timeout(read)
+    return httpx.Timeout(read, connect=connect)
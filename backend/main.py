@@ -1,9 +1,14 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from backend.api.routes import company, financial, briefing
+from backend.api.routes import company, financial, briefing, metrics, screen
 from backend.core.config import settings
+from backend.core.http import close_async_http_client, close_http_session
 from backend.core.logger import get_backend_logger
+from backend.repositories.dart_scheduler import get_dart_scheduler
+from backend.repositories.financial_cache import get_financial_cache
+from backend.services.corp_registry import get_corp_registry
 from contextlib import asynccontextmanager
+import asyncio
 import time
 
 # 로거 초기화
@@ -20,9 +25,21 @@ async def lifespan(app: FastAPI):
     logger.info(f"CORS Origins: {settings.cors_origins}")
     logger.info("=" * 60)
 
+    # 회사 목록 스냅샷 로드 및 백그라운드 갱신 시작
+    corp_registry = get_corp_registry()
+    corp_registry.load_from_file()
+    refresh_task = asyncio.create_task(corp_registry.run_refresh_loop())
+
     yield  # <-- 애플리케이션 실행 구간
 
     # Shutdown
+    refresh_task.cancel()
+    financial_cache = get_financial_cache()
+    if financial_cache:
+        financial_cache.flush()  # 모아 둔 조회 시각 기록
+    get_dart_scheduler().flush()  # 모아 둔 호출 사용량 기록
+    close_http_session()
+    await close_async_http_client()
     logger.info("DART 재무정보 분석 API 종료")
 
 
@@ -66,6 +83,8 @@ async def log_requests(request: Request, call_next):
 app.include_router(company.router)
 app.include_router(financial.router)
 app.include_router(briefing.router)
+app.include_router(metrics.router)
+app.include_router(screen.router)
 
 
 @app.get("/")
@@ -0,0 +1,563 @@
+import asyncio
+from typing import Collection, List, Dict, Optional, Tuple
+import httpx
+from backend.core.exceptions import DARTAPIException
+from backend.core.config import settings
+from backend.core.http import get_async_http_client, async_http_timeout
+from backend.core.logger import get_backend_logger
+from backend.repositories.dart_scheduler import (
+    background_priority,
+    get_dart_scheduler,
+    interactive_context,
+    key_id,
+)
+from backend.repositories.financial_cache import CacheEntry, get_financial_cache
+from backend.utils.singleflight import single_flight
+from backend.repositories.dart_repository import (
+    cached_no_data,
+    check_pdf_response,
+    chunked,
+    document_year_range,
+    filter_financial_documents,
+    group_by_corp,
+    group_by_fs_div,
+    multi_acnt_params,
+    remember_no_data,
+    filter_report_documents,
+    save_file,
+    DART_STATUS_OK,
+    DART_STATUS_NO_DATA,
+    MULTI_ACNT_MAX_CORPS,
+)
+
+logger = get_backend_logger("async_dart_repository")
+
+# 같은 조회의 동시 요청 합치기
+_flights = single_flight('dart')
+
+# 백그라운드 갱신 중인 캐시 키 (중복 갱신 방지 및 태스크 참조 유지)
+_revalidating: Dict[tuple, asyncio.Task] = {}
+
+
+class AsyncDARTRepository:
+    """DART API 비동기 데이터 액세스 레이어
+
+    DARTRepository와 같은 메서드를 코루틴으로 제공합니다.
+    요청은 프로세스 공유 httpx 연결 풀을 사용하므로 DART 응답을 기다리는 동안
+    이벤트 루프가 다른 요청을 처리할 수 있습니다.
+    회사 목록(corpCode.xml)은 레지스트리가 백그라운드 스레드에서 DARTRepository로 받습니다.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        use_cache: bool = True
+    ):
+        """
+        Args:
+            api_key: DART API 키 (없으면 설정값)
+            client: httpx 클라이언트 (없으면 현재 이벤트 루프의 공유 클라이언트)
+            use_cache: 재무정보 응답 캐시 사용 여부
+        """
+        self.api_key = api_key or settings.dart_api_key
+        self.base_url = settings.dart_base_url
+        self._client = client
+        self.cache = get_financial_cache() if use_cache else None
+        self.scheduler = get_dart_scheduler()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_async_http_client()
+
+    @property
+    def key_id(self) -> str:
+        """API 키 식별자 (같은 조회 합치기 키용, 다른 키로 받은 결과/오류/한도를 나누지 않도록)"""
+        return key_id(self.api_key or '')
+
+    async def _get_json(self, url: str, params: Dict, cache_negative: bool = False) -> Dict:
+        """DART OpenAPI JSON 호출 (스케줄러 허가 후 요청하고 응답 상태를 스케줄러에 알림)
+
+        cache_negative면 "데이터 없음"(013) 응답을 기억했다가 보관 기간 동안은
+        호출 없이 같은 응답을 돌려줍니다. 일시적 오류 응답은 기억하지 않습니다.
+        """
+        if cache_negative and self.cache:
+            cached = await asyncio.to_thread(cached_no_data, self.cache, url, params)
+            if cached is not None:
+                return cached
+
+        await self.scheduler.acquire(self.api_key)
+        response = await self.client.get(url, params=params, timeout=async_http_timeout())
+        data = response.json()
+        self.scheduler.observe(self.api_key, data.get('status'))
+
+        if cache_negative and self.cache and data.get('status') == DART_STATUS_NO_DATA:
+            await asyncio.to_thread(remember_no_data, self.cache, url, params)
+        return data
+
+    async def get_financial_data(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        fs_div: str = 'CFS',
+        reprt_code: str = '11011'
+    ) -> List[Dict]:
+        """재무정보 조회
+
+        Args:
+            corp_code: 기업 고유번호
+            bsns_year: 사업연도 (YYYY)
+            fs_div: 재무제표 구분 (CFS: 연결, OFS: 별도)
+            reprt_code: 보고서 코드 (11011: 사업보고서)
+
+        Returns:
+            재무 데이터 리스트
+        """
+        statements = await self.get_financial_statements(corp_code, bsns_year, reprt_code)
+        return statements.get(fs_div, [])
+
+    async def get_financial_statements(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        reprt_code: str = '11011'
+    ) -> Dict[str, List[Dict]]:
+        """연결/별도 재무정보를 한 번의 호출로 조회 (응답 캐시 사용, 같은 조회가 진행 중이면 합류)
+
+        Returns:
+            {fs_div: 재무 데이터 리스트}
+        """
+        return await _flights.do(
+            ('fnlttMultiAcnt', self.key_id, corp_code, bsns_year, reprt_code),
+            lambda: self._load_financial_statements(corp_code, bsns_year, reprt_code),
+            interactive_context()
+        )
+
+    async def _load_financial_statements(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        reprt_code: str
+    ) -> Dict[str, List[Dict]]:
+        """캐시 확인 후 필요하면 DART 조회 (stale 항목은 바로 반환하고 뒤에서 갱신)"""
+        key = (corp_code, bsns_year, reprt_code)
+        cached = await asyncio.to_thread(self.cache.get, *key) if self.cache else None
+        if cached is not None:
+            if cached.fresh:
+                return cached.value
+            if cached.revalidate:
+                self._revalidate_in_background(key)
+                return cached.value
+
+        try:
+            status, statements = await self._fetch_financial_statements(*key, cached=cached is not None)
+        except DARTAPIException as e:
+            if cached is None:
+                raise
+            logger.warning(f"재무정보 조회 실패, 캐시 값 사용 {key}: {e}")
+            return cached.value
+
+        # 오류 응답(요청 한도 초과 등)이나 데이터 없음(013)이면 마지막 캐시 값 유지
+        if status != DART_STATUS_OK and cached is not None:
+            logger.warning(f"재무정보 응답({status})에 값이 없어 캐시 값 사용 {key}")
+            return cached.value
+        return statements
+
+    async def _fetch_financial_statements(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        reprt_code: str,
+        cached: bool = False
+    ) -> Tuple[str, Dict[str, List[Dict]]]:
+        """DART에서 재무정보를 받아 정상 응답이면 캐시에 저장
+
+        Args:
+            cached: 캐시 값이 있는 항목의 갱신 여부 (기억해 둔 "데이터 없음"을 쓰지도 기록하지도 않고 DART에 확인)
+
+        Returns:
+            (DART 상태 코드, {fs_div: 재무 데이터 리스트})
+        """
+        try:
+            url = f"{self.base_url}/fnlttMultiAcnt.json"
+            params = {
+                'crtfc_key': self.api_key,
+                **multi_acnt_params(corp_code, bsns_year, reprt_code),
+            }
+
+            data = await self._get_json(url, params, cache_negative=not cached)
+
+        except Exception as e:
+            raise DARTAPIException(f"재무정보 조회 실패: {str(e)}")
+
+        statements = group_by_fs_div(data)
+        status = data.get('status')
+        if status == DART_STATUS_OK and self.cache:
+            await asyncio.to_thread(self.cache.put, corp_code, bsns_year, reprt_code, statements)
+        return status, statements
+
+    async def get_full_statement(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        reprt_code: str = '11011',
+        fs_div: str = 'CFS'
+    ) -> Tuple[str, List[Dict]]:
+        """단일회사 전체 재무제표 조회 (fnlttSinglAcntAll, 모든 계정/재무제표 종류)
+
+        Returns:
+            (DART 상태 코드, 재무 데이터 리스트)
+        """
+        return await _flights.do(
+            ('fnlttSinglAcntAll', self.key_id, corp_code, bsns_year, reprt_code, fs_div),
+            lambda: self._load_full_statement(corp_code, bsns_year, reprt_code, fs_div),
+            interactive_context()
+        )
+
+    async def _load_full_statement(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        reprt_code: str,
+        fs_div: str
+    ) -> Tuple[str, List[Dict]]:
+        """DART 전체 재무제표 요청"""
+        try:
+            url = f"{self.base_url}/fnlttSinglAcntAll.json"
+            params = {
+                'crtfc_key': self.api_key,
+                **multi_acnt_params(corp_code, bsns_year, reprt_code),
+                'fs_div': fs_div,
+            }
+
+            data = await self._get_json(url, params, cache_negative=True)
+
+        except Exception as e:
+            raise DARTAPIException(f"전체 재무제표 조회 실패: {str(e)}")
+
+        return data.get('status'), data.get('list', [])
+
+    async def get_financial_statements_batch(
+        self,
+        corp_codes: List[str],
+        bsns_year: str,
+        reprt_code: str = '11011'
+    ) -> Dict[str, Dict[str, List[Dict]]]:
+        """여러 회사 재무정보 묶음 조회
+
+        캐시에 없는 회사만 MULTI_ACNT_MAX_CORPS개씩 묶어 동시에 요청하고,
+        응답을 회사별로 나눠 캐시에 저장합니다. stale 항목은 바로 반환하고
+        묶음 단위로 백그라운드 갱신합니다.
+
+        Returns:
+            {corp_code: {fs_div: 재무 데이터 리스트}} (조회 실패 시 캐시 값 또는 빈 dict)
+        """
+        results: Dict[str, Dict[str, List[Dict]]] = {}
+        stale: Dict[str, Dict[str, List[Dict]]] = {}
+        pending: List[str] = []
+        revalidate: List[str] = []
+        url = f"{self.base_url}/fnlttMultiAcnt.json"
+
+        def lookup() -> List[Tuple[str, Optional[CacheEntry], bool]]:
+            """회사별 (캐시 항목, "데이터 없음" 기록 여부)"""
+            found = []
+            for corp_code in dict.fromkeys(corp_codes):
+                cached = self.cache.get(corp_code, bsns_year, reprt_code)
+                no_data = cached is None and cached_no_data(
+                    self.cache, url, multi_acnt_params(corp_code, bsns_year, reprt_code)
+                ) is not None
+                found.append((corp_code, cached, no_data))
+            return found
+
+        if self.cache:
+            lookups = await asyncio.to_thread(lookup)
+        else:
+            lookups = [(corp_code, None, False) for corp_code in dict.fromkeys(corp_codes)]
+
+        for corp_code, cached, no_data in lookups:
+            if cached is None:
+                if no_data:
+                    results[corp_code] = {}
+                else:
+                    pending.append(corp_code)
+            elif cached.fresh or cached.revalidate:
+                results[corp_code] = cached.value
+                if not cached.fresh:
+                    revalidate.append(corp_code)
+            else:
+                stale[corp_code] = cached.value
+                pending.append(corp_code)
+
+        if revalidate:
+            self._revalidate_batch_in_background(revalidate, bsns_year, reprt_code)
+
+        chunks = chunked(pending, MULTI_ACNT_MAX_CORPS)
+        fetched = await asyncio.gather(
+            *(self._fetch_statements_chunk(chunk, bsns_year, reprt_code, stale.keys()) for chunk in chunks),
+            return_exceptions=True
+        )
+        for chunk, outcome in zip(chunks, fetched):
+            if isinstance(outcome, Exception):
+                logger.warning(f"재무정보 묶음 조회 실패 ({len(chunk)}개 회사): {outcome}")
+                outcome = (None, {})
+            _, by_corp = outcome
+            for corp_code in chunk:
+                # 응답에 빠진 회사는 (묶음 안의 다른 회사 때문에 013이 와도) 캐시 값 유지
+                results[corp_code] = by_corp[corp_code] if corp_code in by_corp else stale.get(corp_code, {})
+
+        return results
+
+    async def _fetch_statements_chunk(
+        self,
+        corp_codes: List[str],
+        bsns_year: str,
+        reprt_code: str,
+        cached: Collection[str] = ()
+    ) -> Tuple[str, Dict[str, Dict[str, List[Dict]]]]:
+        """여러 회사 재무정보를 한 번에 받아 회사별로 캐시에 저장
+
+        Args:
+            corp_codes: 고유번호 목록
+            bsns_year: 사업연도
+            reprt_code: 보고서 코드
+            cached: 캐시 값이 있는 회사 (응답에 빠져도 "데이터 없음"으로 기록하지 않음)
+
+        Returns:
+            (DART 상태 코드, {corp_code: {fs_div: 재무 데이터 리스트}})
+        """
+        url = f"{self.base_url}/fnlttMultiAcnt.json"
+        try:
+            params = {
+                'crtfc_key': self.api_key,
+                **multi_acnt_params(','.join(corp_codes), bsns_year, reprt_code),
+            }
+
+            data = await self._get_json(url, params)
+
+        except Exception as e:
+            raise DARTAPIException(f"재무정보 묶음 조회 실패: {str(e)}")
+
+        by_corp = group_by_corp(data)
+        status = data.get('status')
+
+        def store():
+            for corp_code, statements in by_corp.items():
+                self.cache.put(corp_code, bsns_year, reprt_code, statements)
+            if status in (DART_STATUS_OK, DART_STATUS_NO_DATA):
+                # 정상 응답에 빠진 회사도 데이터 없음으로 확정 (캐시 값이 있는 회사는 다음에 다시 확인)
+                for corp_code in corp_codes:
+                    if corp_code not in by_corp and corp_code not in cached:
+                        remember_no_data(self.cache, url, multi_acnt_params(corp_code, bsns_year, reprt_code))
+
+        if self.cache:
+            await asyncio.to_thread(store)
+        return status, by_corp
+
+    def _revalidate_batch_in_background(self, corp_codes: List[str], bsns_year: str, reprt_code: str):
+        """stale 캐시 항목 여러 개를 묶음 요청으로 응답 이후에 갱신"""
+        keys = [
+            (corp_code, bsns_year, reprt_code) for corp_code in corp_codes
+            if (corp_code, bsns_year, reprt_code) not in _revalidating
+        ]
+        if not keys:
+            return
+
+        async def revalidate():
+            try:
+                with background_priority():
+                    for chunk in chunked([key[0] for key in keys], MULTI_ACNT_MAX_CORPS):
+                        await self._fetch_statements_chunk(chunk, bsns_year, reprt_code, chunk)
+            except Exception as e:
+                logger.warning(f"재무정보 캐시 묶음 갱신 실패 ({len(keys)}개 회사): {e}")
+            finally:
+                for key in keys:
+                    _revalidating.pop(key, None)
+
+        task = asyncio.create_task(revalidate())
+        for key in keys:
+            _revalidating[key] = task
+
+    def _revalidate_in_background(self, key: tuple):
+        """stale 캐시 항목을 응답 이후에 갱신"""
+        if key in _revalidating:
+            return
+
+        async def revalidate():
+            try:
+                with background_priority():
+                    await self._fetch_financial_statements(*key, cached=True)
+            except Exception as e:
+                logger.warning(f"재무정보 캐시 백그라운드 갱신 실패 {key}: {e}")
+            finally:
+                _revalidating.pop(key, None)
+
+        _revalidating[key] = asyncio.create_task(revalidate())
+
+    async def get_disclosure_list(
+        self,
+        corp_code: str,
+        bsns_year: str
+    ) -> List[Dict]:
+        """공시 목록 조회
+
+        Args:
+            corp_code: 기업 고유번호
+            bsns_year: 사업연도 (YYYY)
+
+        Returns:
+            공시 목록
+        """
+        return await _flights.do(
+            ('list', self.key_id, corp_code, bsns_year),
+            lambda: self._load_disclosure_list(corp_code, bsns_year),
+            interactive_context()
+        )
+
+    async def _load_disclosure_list(self, corp_code: str, bsns_year: str) -> List[Dict]:
+        """DART 공시 목록 요청"""
+        try:
+            url = f"{self.base_url}/list.json"
+
+            params = {
+                'crtfc_key': self.api_key,
+                'corp_code': corp_code,
+                'bgn_de': f"{bsns_year}0101",
+                'end_de': f"{bsns_year}1231",
+                'page_count': '100'
+            }
+
+            data = await self._get_json(url, params, cache_negative=True)
+
+            if data.get('status') == '000':
+                return data.get('list', [])
+            else:
+                return []
+
+        except Exception as e:
+            raise DARTAPIException(f"공시 조회 실패: {str(e)}")
+
+    async def search_report_documents(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        report_types: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """사업보고서/감사보고서 검색
+
+        Args:
+            corp_code: 기업 고유번호
+            bsns_year: 사업연도 (YYYY)
+            report_types: 보고서 유형 리스트 (기본값: 사업보고서, 감사보고서)
+
+        Returns:
+            검색된 보고서 목록
+        """
+        if report_types is None:
+            report_types = ['사업보고서', '감사보고서']
+
+        try:
+            disclosures = await self.get_disclosure_list(corp_code, bsns_year)
+            return filter_report_documents(disclosures, report_types)
+
+        except Exception as e:
+            raise DARTAPIException(f"보고서 검색 실패: {str(e)}")
+
+    async def get_financial_documents(
+        self,
+        corp_code: str,
+        start_year: Optional[str] = None,
+        end_year: Optional[str] = None
+    ) -> List[Dict]:
+        """재무정보가 포함된 공시 문서 목록 조회
+
+        Args:
+            corp_code: 기업 고유번호
+            start_year: 시작 연도 (선택, 기본값: 현재년도-3)
+            end_year: 종료 연도 (선택, 기본값: 현재년도)
+
+        Returns:
+            재무정보가 포함된 문서 목록
+        """
+        try:
+            start_year, end_year = document_year_range(start_year, end_year)
+
+            url = f"{self.base_url}/list.json"
+
+            params = {
+                'crtfc_key': self.api_key,
+                'corp_code': corp_code,
+                'bgn_de': f"{start_year}0101",
+                'end_de': f"{end_year}1231",
+                'page_count': '100'
+            }
+
+            data = await self._get_json(url, params, cache_negative=True)
+
+            if data.get('status') != '000':
+                return []
+
+            return filter_financial_documents(data.get('list', []))
+
+        except Exception as e:
+            raise DARTAPIException(f"재무문서 목록 조회 실패: {str(e)}")
+
+    async def download_document(
+        self,
+        rcept_no: str,
+        save_path: str
+    ) -> str:
+        """공시문서 다운로드 (HTML/XML)
+
+        Args:
+            rcept_no: 접수번호
+            save_path: 저장 경로
+
+        Returns:
+            저장된 파일 경로
+        """
+        try:
+            url = f"{self.base_url}/document.xml"
+            params = {
+                'crtfc_key': self.api_key,
+                'rcept_no': rcept_no
+            }
+
+            await self.scheduler.acquire(self.api_key)
+            response = await self.client.get(url, params=params, timeout=async_http_timeout(60))
+            response.raise_for_status()
+
+            return save_file(save_path, response.content)
+
+        except Exception as e:
+            raise DARTAPIException(f"문서 다운로드 실패: {str(e)}")
+
+    async def download_document_pdf(
+        self,
+        rcept_no: str,
+        save_path: str
+    ) -> str:
+        """공시문서 PDF 다운로드
+
+        Args:
+            rcept_no: 접수번호
+            save_path: 저장 경로
+
+        Returns:
+            저장된 PDF 파일 경로
+        """
+        try:
+            # DART PDF 다운로드 URL
+            url = "https://dart.fss.or.kr/pdf/download/main.do"
+            params = {
+                'rcp_no': rcept_no
+            }
+
+            response = await self.client.get(url, params=params, timeout=async_http_timeout(120))
+            response.raise_for_status()
+
+            check_pdf_response(response.headers.get('Content-Type', ''), save_path)
+
+            return save_file(save_path, response.content)
+
+        except Exception as e:
+            raise DARTAPIException(f"PDF 다운로드 실패: {str(e)}")
@@ -0,0 +1,235 @@
+"""
+재무제표 일괄 자료 저장소
+DART 재무정보 일괄다운로드(TSV)를 정리해 둔 Parquet 파일을 읽어 회사별 재무정보를 돌려줍니다.
+파일은 사업연도/보고서별 디렉토리(hive 파티션)에 원본 파일 하나당 하나씩 쌓이며
+적재는 run_bulk_loader.py가 맡습니다. 조회에는 네트워크 호출이 없습니다.
+"""
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+import pyarrow as pa
+import pyarrow.dataset as ds
+from backend.core.config import settings
+from backend.core.logger import get_backend_logger
+
+logger = get_backend_logger("bulk_store")
+
+# 적재한 원본 파일 목록 (저장소 루트)
+MANIFEST_NAME = '_manifest.json'
+
+# 파티션 컬럼 (디렉토리 이름으로 저장)
+PARTITION_SCHEMA = pa.schema([
+    ('bsns_year', pa.string()),
+    ('reprt_code', pa.string()),
+])
+
+# 금액 컬럼 (fnlttSinglAcntAll 컬럼명에서 _amount를 뗀 이름)
+AMOUNT_FIELDS = ('thstrm', 'thstrm_add', 'frmtrm', 'frmtrm_add', 'bfefrmtrm')
+
+# Parquet 파일 스키마
+BULK_SCHEMA = pa.schema([
+    ('stock_code', pa.string()),
+    ('corp_name', pa.string()),
+    ('market', pa.string()),
+    ('settle_date', pa.string()),
+    ('fs_div', pa.string()),
+    ('sj_div', pa.string()),
+    ('account_id', pa.string()),
+    ('account_nm', pa.string()),
+    ('base_name', pa.string()),
+    ('currency', pa.string()),
+    ('ord', pa.int32()),
+    *[(field, pa.float64()) for field in AMOUNT_FIELDS],
+])
+
+# fnlttMultiAcnt처럼 재무상태표/손익계산서 계정만 돌려줌
+SERVED_SJ_DIVS = ('BS', 'IS', 'CIS')
+
+FS_NAMES = {'CFS': '연결재무제표', 'OFS': '재무제표'}
+SJ_NAMES = {'BS': '재무상태표', 'IS': '손익계산서', 'CIS': '포괄손익계산서', 'CF': '현금흐름표', 'SCE': '자본변동표'}
+
+
+def partition_dir(root: str, bsns_year: str, reprt_code: str) -> str:
+    """사업연도/보고서 파티션 디렉토리"""
+    return os.path.join(root, f'bsns_year={bsns_year}', f'reprt_code={reprt_code}')
+
+
+def read_manifest(root: str) -> Dict[str, Dict]:
+    """적재 기록 {원본 파일 이름: {'size', 'mtime', 'rows', 'outputs', 'loaded_at'}}"""
+    path = os.path.join(root, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(root: str, manifest: Dict[str, Dict]):
+    """적재 기록 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = os.path.join(root, MANIFEST_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _format_amount(value: Optional[float]) -> str:
+    return f"{int(value):,}" if value is not None else ''
+
+
+def _period_date(settle_date: str, years_back: int) -> str:
+    """결산기준일(YYYY-MM-DD)을 fnlttMultiAcnt 날짜 표기(YYYY.MM.DD)로, years_back년 전"""
+    if len(settle_date) < 10:
+        return ''
+    return f"{int(settle_date[:4]) - years_back}.{settle_date[5:7]}.{settle_date[8:10]}"
+
+
+def to_statement_item(row: Dict, bsns_year: str, reprt_code: str) -> Dict:
+    """Parquet 행을 fnlttMultiAcnt 형식 재무 데이터로 변환"""
+    settle_date = row['settle_date'] or ''
+    item = {
+        'rcept_no': '',
+        'bsns_year': bsns_year,
+        'reprt_code': reprt_code,
+        'stock_code': row['stock_code'],
+        'fs_div': row['fs_div'],
+        'fs_nm': FS_NAMES.get(row['fs_div'], ''),
+        'sj_div': row['sj_div'],
+        'sj_nm': SJ_NAMES.get(row['sj_div'], ''),
+        'account_id': row['account_id'],
+        'account_nm': row['account_nm'],
+        'thstrm_dt': _period_date(settle_date, 0),
+        'frmtrm_dt': _period_date(settle_date, 1),
+        'bfefrmtrm_dt': _period_date(settle_date, 2),
+        'ord': str(row['ord']),
+        'currency': row['currency'],
+    }
+    for field in AMOUNT_FIELDS:
+        item[f'{field}_amount'] = _format_amount(row[field])
+    return item
+
+
+class BulkFinancialStore:
+    """Parquet 일괄 자료 조회 (적재 기록이 바뀌면 파일 목록을 다시 읽음)"""
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: 저장소 루트 디렉토리
+        """
+        self.root = root
+        self._lock = threading.Lock()
+        self._dataset: Optional[ds.Dataset] = None
+        self._manifest_mtime: Optional[float] = None
+
+    def available(self) -> bool:
+        """적재된 자료가 있는지"""
+        return os.path.exists(os.path.join(self.root, MANIFEST_NAME))
+
+    def get_financial_statements(self, stock_code: str, bsns_year: str, reprt_code: str) -> Dict[str, List[Dict]]:
+        """회사 재무정보 (fnlttMultiAcnt와 같은 형식)
+
+        Returns:
+            {fs_div: 재무 데이터 리스트} (자료가 없으면 빈 dict)
+        """
+        return self.get_financial_statements_batch([stock_code], bsns_year, reprt_code).get(stock_code, {})
+
+    def get_financial_statements_batch(
+        self,
+        stock_codes: List[str],
+        bsns_year: str,
+        reprt_code: str
+    ) -> Dict[str, Dict[str, List[Dict]]]:
+        """여러 회사 재무정보 (파일을 한 번만 훑음)
+
+        Returns:
+            {stock_code: {fs_div: 재무 데이터 리스트}} (자료가 있는 회사만)
+        """
+        dataset = self._get_dataset()
+        if dataset is None or not stock_codes:
+            return {}
+        table = dataset.to_table(filter=(
+            (ds.field('bsns_year') == bsns_year)
+            & (ds.field('reprt_code') == reprt_code)
+            & ds.field('stock_code').isin(stock_codes)
+            & ds.field('sj_div').isin(SERVED_SJ_DIVS)
+        ))
+
+        results: Dict[str, Dict[str, List[Dict]]] = {}
+        rows = sorted(table.to_pylist(), key=lambda r: (r['stock_code'], SERVED_SJ_DIVS.index(r['sj_div']), r['ord']))
+        for row in rows:
+            statements = results.setdefault(row['stock_code'], {})
+            statements.setdefault(row['fs_div'], []).append(to_statement_item(row, bsns_year, reprt_code))
+        return results
+
+    def read_accounts(self, reprt_code: str, fs_div: str, base_names: List[str]) -> Optional[pa.Table]:
+        """전체 회사의 지정 계정 행 (시장 전체 분석용, 손익/재무상태표만)
+
+        Returns:
+            stock_code, corp_name, market, bsns_year, sj_div, ord, account_id, account_nm, base_name,
+            금액 컬럼 테이블 (자료가 없으면 None)
+        """
+        dataset = self._get_dataset()
+        if dataset is None:
+            return None
+        return dataset.to_table(
+            columns=['stock_code', 'corp_name', 'market', 'bsns_year', 'sj_div', 'ord',
+                     'account_id', 'account_nm', 'base_name', *AMOUNT_FIELDS],
+            filter=(
+                (ds.field('reprt_code') == reprt_code)
+                & (ds.field('fs_div') == fs_div)
+                & ds.field('sj_div').isin(SERVED_SJ_DIVS)
+                & ds.field('base_name').isin(base_names)
+            )
+        )
+
+    def version(self) -> Optional[float]:
+        """적재 기록 수정 시각 (자료가 바뀌었는지 확인용)"""
+        try:
+            return os.path.getmtime(os.path.join(self.root, MANIFEST_NAME))
+        except OSError:
+            return None
+
+    def stats(self) -> Dict:
+        """적재한 원본 파일/행 수와 Parquet 파일 크기"""
+        manifest = read_manifest(self.root)
+        files = [path for entry in manifest.values() for path in entry.get('outputs', [])]
+        return {
+            'sources': len(manifest),
+            'rows': sum(entry.get('rows', 0) for entry in manifest.values()),
+            'files': len(files),
+            'file_bytes': sum(os.path.getsize(path) for path in files if os.path.exists(path)),
+        }
+
+    def _get_dataset(self) -> Optional[ds.Dataset]:
+        manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        try:
+            mtime = os.path.getmtime(manifest_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            if self._dataset is None or mtime != self._manifest_mtime:
+                self._dataset = ds.dataset(
+                    self.root,
+                    schema=pa.unify_schemas([BULK_SCHEMA, PARTITION_SCHEMA]),
+                    format='parquet',
+                    partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+                )
+                self._manifest_mtime = mtime
+                logger.info(f"일괄 자료 파일 목록 갱신: {len(self._dataset.files)}개")
+            return self._dataset
+
+
+_store: Optional[BulkFinancialStore] = None
+_store_lock = threading.Lock()
+
+
+def get_bulk_store() -> Optional[BulkFinancialStore]:
+    """프로세스 공유 일괄 자료 저장소 (적재된 자료가 없으면 None)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BulkFinancialStore(settings.bulk_store_path)
+    return _store if _store.available() else None
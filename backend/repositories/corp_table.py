@@ -0,0 +1,460 @@
+"""
+회사 목록 컬럼 저장소
+레지스트리 스냅샷을 문자열 컬럼(오프셋 배열 + UTF-8 블롭), 정수 순서 배열,
+회사명 n-gram 역색인(정렬된 gram 컬럼 + posting 오프셋 + 문서 ID 배열)으로 묶은
+단일 바이너리 파일입니다. 파일을 mmap으로 열면 같은 서버의 모든 워커가
+색인까지 하나의 물리 메모리 사본을 공유하므로, 워커마다 색인을 다시 만들지 않습니다.
+
+파일 구조:
+    MAGIC(8) | 헤더 길이(uint32) | 헤더 JSON | 패딩 | 섹션...
+    헤더: {"count": N, "meta": {...}, "sections": {이름: [데이터 영역 기준 오프셋, 바이트 수]}}
+정수 배열은 플랫폼 기본 바이트 순서의 uint32로, 같은 머신에서만 읽는 것을 전제로 합니다.
+
+행 번호는 차분 갱신 사이에 유지됩니다. 삭제된 회사는 빈 행(tombstone)으로 남고
+정렬 순서 배열에는 살아 있는 행만 들어갑니다.
+"""
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from backend.repositories.dart_repository import CorpRecord
+from backend.utils.korean import normalize_name, to_chosung
+
+MAGIC = b'CORPTBL3'
+_HEADER_LEN = struct.Struct('<I')
+_ALIGN = 8
+
+# 문자열 컬럼 (name_lower, chosung_name, name_normalized는 검색 색인용 파생 컬럼)
+STRING_COLUMNS = ('corp_code', 'stock_code', 'corp_name', 'name_lower', 'chosung_name', 'name_normalized')
+# 정렬 순서 배열
+ORDER_COLUMNS = ('code_order', 'name_lower_order', 'chosung_order', 'rank_order', 'rank_of')
+
+# n-gram 역색인을 함께 저장하는 문자열 컬럼 (posting list는 검색 순위 순서)
+GRAM_COLUMNS = ('name_lower', 'chosung_name', 'name_normalized')
+
+# 삭제된 행의 rank_of 값
+NO_RANK = 0xFFFFFFFF
+
+# 문자열 컬럼 값 (삭제된 행은 빈 문자열)
+_COLUMN_VALUES: Dict[str, Callable[[CorpRecord], str]] = {
+    'corp_code': lambda r: r.corp_code,
+    'stock_code': lambda r: '' if r.stock_code == 'N/A' else r.stock_code,
+    'corp_name': lambda r: r.corp_name,
+    'name_lower': lambda r: r.corp_name.lower(),
+    'chosung_name': lambda r: to_chosung(r.corp_name.lower()),
+    'name_normalized': lambda r: normalize_name(r.corp_name),
+}
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def index_grams(text: str) -> Set[str]:
+    """색인하는 gram (1-gram과 2-gram, 한글 음절/영문 문자 단위)"""
+    return {text[i:i + n] for n in (1, 2) for i in range(len(text) - n + 1)}
+
+
+class StringColumn(Sequence):
+    """오프셋 배열 + UTF-8 블롭으로 된 문자열 컬럼 (조회 시에만 str 생성)"""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        offsets = self._offsets
+        return str(self._data[offsets[i]:offsets[i + 1]], 'utf-8')
+
+
+class SortedView(Sequence):
+    """정렬 순서 배열로 본 컬럼 (이진 탐색용)"""
+
+    def __init__(self, column: Sequence, order: Sequence[int]):
+        self._column = column
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, i: int):
+        return self._column[self._order[i]]
+
+
+class GramPostings:
+    """파일에 저장된 n-gram 역색인 (gram → 순위 순서 문서 ID, dict처럼 get()으로 조회)"""
+
+    def __init__(self, grams: StringColumn, offsets: memoryview, doc_ids: memoryview):
+        self._grams = grams
+        self._offsets = offsets
+        self._doc_ids = doc_ids
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def get(self, gram: str, default=None) -> Optional[Sequence[int]]:
+        """gram의 posting list (정렬된 gram 컬럼 이진 탐색, 없으면 default)"""
+        grams = self._grams
+        i = bisect_left(grams, gram)
+        if i < len(grams) and grams[i] == gram:
+            return self._doc_ids[self._offsets[i]:self._offsets[i + 1]]
+        return default
+
+    def items(self) -> Iterator[Tuple[str, Sequence[int]]]:
+        offsets, doc_ids = self._offsets, self._doc_ids
+        for i, gram in enumerate(self._grams):
+            yield gram, doc_ids[offsets[i]:offsets[i + 1]]
+
+
+class CorpTable:
+    """회사 목록 컬럼 테이블
+
+    table[row_id]로 레코드를 읽고, 순회/len()은 살아 있는 행만 순위 순서로 다룹니다.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        """
+        Args:
+            buffer: build()로 만든 바이트 또는 그 파일의 mmap
+        """
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError("회사 목록 테이블 형식이 아닙니다")
+
+        header_len = _HEADER_LEN.unpack_from(view, len(MAGIC))[0]
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        header = json.loads(bytes(view[header_start:header_start + header_len]))
+        data_start = _align(header_start + header_len)
+
+        sections = {
+            name: view[data_start + offset:data_start + offset + size]
+            for name, (offset, size) in header['sections'].items()
+        }
+        self.count: int = header['count']
+        self.meta: Dict = header.get('meta', {})
+
+        self.columns: Dict[str, StringColumn] = {
+            name: StringColumn(sections[f'{name}.offsets'].cast('I'), sections[f'{name}.data'])
+            for name in STRING_COLUMNS
+        }
+        self.corp_codes = self.columns['corp_code']
+        self.stock_codes = self.columns['stock_code']
+        self.corp_names = self.columns['corp_name']
+        self.names_lower = self.columns['name_lower']
+        self.chosung_names = self.columns['chosung_name']
+        self.names_normalized = self.columns['name_normalized']
+
+        orders = {name: sections[name].cast('I') for name in ORDER_COLUMNS}
+        self.code_order: Sequence[int] = orders['code_order']
+        self.name_lower_order: Sequence[int] = orders['name_lower_order']
+        self.chosung_order: Sequence[int] = orders['chosung_order']
+        self.rank_order: Sequence[int] = orders['rank_order']
+        self.rank_of: Sequence[int] = orders['rank_of']
+
+        self._sorted_codes = SortedView(self.corp_codes, self.code_order)
+
+        # 검색 색인 (컬럼 이름 → gram별 posting list)
+        self.gram_postings: Dict[str, GramPostings] = {
+            name: GramPostings(
+                StringColumn(sections[f'{name}.grams.offsets'].cast('I'), sections[f'{name}.grams.data']),
+                sections[f'{name}.postings.offsets'].cast('I'),
+                sections[f'{name}.postings'].cast('I'),
+            )
+            for name in GRAM_COLUMNS
+        }
+
+    def __len__(self) -> int:
+        return len(self.rank_order)
+
+    def __iter__(self) -> Iterator[CorpRecord]:
+        for i in self.rank_order:
+            yield self[i]
+
+    def __getitem__(self, i: int) -> CorpRecord:
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return CorpRecord(self.corp_codes[i], self.corp_names[i], self.stock_codes[i] or 'N/A')
+
+    @property
+    def tombstones(self) -> int:
+        """삭제된 행 수"""
+        return self.count - len(self.rank_order)
+
+    def is_live(self, i: int) -> bool:
+        """살아 있는 행 여부"""
+        return self.rank_of[i] != NO_RANK
+
+    def live_ids(self) -> Dict[str, int]:
+        """살아 있는 행의 고유번호 → 행 번호"""
+        codes = self.corp_codes
+        return {codes[i]: i for i in self.rank_order}
+
+    @property
+    def nbytes(self) -> int:
+        """테이블 전체 크기 (바이트)"""
+        return len(self._buffer)
+
+    def find_corp_code(self, corp_code: str) -> Optional[int]:
+        """고유번호의 행 번호 (정렬 배열 이진 탐색)"""
+        codes = self._sorted_codes
+        lo, hi = 0, len(codes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if codes[mid] < corp_code:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(codes) and codes[lo] == corp_code:
+            return self.code_order[lo]
+        return None
+
+    @classmethod
+    def from_records(cls, records: Iterable[CorpRecord], meta: Optional[Dict] = None) -> 'CorpTable':
+        """레코드로 메모리 테이블 생성"""
+        return cls(cls.build(list(records), meta))
+
+    @classmethod
+    def open(cls, path: str) -> 'CorpTable':
+        """파일을 읽기 전용 mmap으로 열기"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    @staticmethod
+    def write(path: str, data: bytes):
+        """테이블 바이트를 파일로 저장 (임시 파일 작성 후 교체)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def build_delta(
+        cls,
+        base: 'CorpTable',
+        removed: Iterable[int],
+        changed: Dict[int, CorpRecord],
+        added: List[CorpRecord],
+        meta: Optional[Dict] = None
+    ) -> bytes:
+        """기존 테이블에 차분을 적용한 테이블 바이트
+
+        기존 행 번호는 그대로 두고, 삭제 행은 tombstone으로, 추가 행은 끝에 붙입니다.
+        정렬 순서 배열과 n-gram posting list는 다시 만들지 않고 바뀐 행만 빼고 끼워 넣습니다.
+
+        Args:
+            base: 기존 테이블
+            removed: 삭제된 행 번호
+            changed: 내용이 바뀐 행 번호 → 새 레코드
+            added: 새로 추가된 레코드
+            meta: 헤더에 기록할 메타데이터
+        """
+        rows: List[Optional[CorpRecord]] = [
+            base[i] if base.is_live(i) else None for i in range(base.count)
+        ]
+        removed = set(removed)
+        for i in removed:
+            rows[i] = None
+        for i, record in changed.items():
+            rows[i] = record
+        rows.extend(added)
+
+        touched = removed | set(changed)
+        inserted = list(changed) + list(range(base.count, len(rows)))
+        orders = {
+            name: _merge_order(getattr(base, name), touched, inserted, key)
+            for name, key in _order_keys(rows).items()
+        }
+        rank_of = _rank_of(orders['rank_order'], len(rows))
+        postings = {
+            name: _merge_postings(
+                base.gram_postings[name],
+                [(i, base.columns[name][i]) for i in touched],
+                [(i, _COLUMN_VALUES[name](rows[i])) for i in inserted],
+                rank_of
+            )
+            for name in GRAM_COLUMNS
+        }
+        return cls.build(rows, meta, orders, postings)
+
+    @staticmethod
+    def build(
+        records: List[Optional[CorpRecord]],
+        meta: Optional[Dict] = None,
+        orders: Optional[Dict[str, array]] = None,
+        postings: Optional[Dict[str, Dict[str, Sequence[int]]]] = None
+    ) -> bytes:
+        """레코드를 테이블 바이트로 직렬화
+
+        Args:
+            records: 행 번호 순 레코드 (None은 삭제된 행)
+            meta: 헤더에 기록할 메타데이터
+            orders: 미리 계산한 정렬 순서 배열 (없으면 전체 정렬)
+            postings: 미리 계산한 컬럼별 n-gram posting list (없으면 전체 색인)
+        """
+        values = {
+            name: [value(r) if r else '' for r in records]
+            for name, value in _COLUMN_VALUES.items()
+        }
+
+        sections: List[Tuple[str, bytes]] = []
+        for name in STRING_COLUMNS:
+            sections.extend(_string_sections(name, values[name]))
+
+        if orders is None:
+            live = [i for i, r in enumerate(records) if r is not None]
+            orders = {
+                name: array('I', sorted(live, key=key))
+                for name, key in _order_keys(records).items()
+            }
+        orders['rank_of'] = _rank_of(orders['rank_order'], len(records))
+        sections.extend((name, orders[name].tobytes()) for name in ORDER_COLUMNS)
+
+        if postings is None:
+            postings = {name: _build_postings(values[name], orders['rank_order']) for name in GRAM_COLUMNS}
+        for name in GRAM_COLUMNS:
+            grams = sorted(postings[name])
+            offsets = array('I', [0])
+            total = 0
+            for gram in grams:
+                total += len(postings[name][gram])
+                offsets.append(total)
+            sections.extend(_string_sections(f'{name}.grams', grams))
+            sections.append((f'{name}.postings.offsets', offsets.tobytes()))
+            sections.append((f'{name}.postings', b''.join(bytes(postings[name][gram]) for gram in grams)))
+
+        # 섹션 배치 (각 섹션은 8바이트 정렬)
+        layout = {}
+        offset = 0
+        for name, data in sections:
+            layout[name] = [offset, len(data)]
+            offset = _align(offset + len(data))
+
+        header = json.dumps({
+            'count': len(records),
+            'meta': meta or {},
+            'sections': layout
+        }).encode('utf-8')
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        data_start = _align(header_start + len(header))
+
+        out = bytearray(data_start + offset)
+        out[:len(MAGIC)] = MAGIC
+        _HEADER_LEN.pack_into(out, len(MAGIC), len(header))
+        out[header_start:header_start + len(header)] = header
+        for name, data in sections:
+            start = data_start + layout[name][0]
+            out[start:start + len(data)] = data
+        return bytes(out)
+
+
+def _order_keys(records: List[Optional[CorpRecord]]) -> Dict[str, Callable[[int], object]]:
+    """정렬 순서 배열별 정렬 키 (살아 있는 행에만 사용)
+
+    키가 같은 행은 행 번호 순으로 두어, 차분으로 끼워 넣은 순서가 전체 정렬과 같도록 합니다.
+    """
+    return {
+        'code_order': lambda i: (records[i].corp_code, i),
+        'name_lower_order': lambda i: (records[i].corp_name.lower(), i),
+        'chosung_order': lambda i: (to_chosung(records[i].corp_name.lower()), i),
+        # 검색 순위: 상장회사 우선, 이름순
+        'rank_order': lambda i: (records[i].stock_code == 'N/A', records[i].corp_name, i),
+    }
+
+
+def _string_sections(name: str, values: Iterable[str]) -> List[Tuple[str, bytes]]:
+    """문자열 컬럼 섹션 (오프셋 배열, UTF-8 블롭)"""
+    offsets = array('I', [0])
+    encoded = []
+    total = 0
+    for value in values:
+        data = value.encode('utf-8')
+        encoded.append(data)
+        total += len(data)
+        offsets.append(total)
+    return [(f'{name}.offsets', offsets.tobytes()), (f'{name}.data', b''.join(encoded))]
+
+
+def _rank_of(rank_order: Sequence[int], count: int) -> array:
+    """행 번호 → 검색 순위 (삭제된 행은 NO_RANK)"""
+    rank_of = array('I', [NO_RANK]) * count
+    for rank, doc_id in enumerate(rank_order):
+        rank_of[doc_id] = rank
+    return rank_of
+
+
+def _build_postings(texts: Sequence[str], rank_order: Iterable[int]) -> Dict[str, array]:
+    """전체 n-gram 역색인 (순위 순서로 쌓으므로 posting list가 순위 순서)"""
+    postings: Dict[str, array] = {}
+    for doc_id in rank_order:
+        for gram in index_grams(texts[doc_id]):
+            doc_ids = postings.get(gram)
+            if doc_ids is None:
+                doc_ids = postings[gram] = array('I')
+            doc_ids.append(doc_id)
+    return postings
+
+
+def _merge_postings(
+    base: GramPostings,
+    removed: List[Tuple[int, str]],
+    added: List[Tuple[int, str]],
+    rank_of: Sequence[int]
+) -> Dict[str, Sequence[int]]:
+    """기존 역색인에서 바뀐 gram의 posting list만 고친 역색인
+
+    바뀌지 않은 문서끼리의 순위 순서는 그대로이므로 나머지 gram은 기존 posting list를 그대로 씁니다.
+
+    Args:
+        base: 기존 역색인
+        removed: 뺄 (행 번호, 기존 문자열)
+        added: 넣을 (행 번호, 새 문자열)
+        rank_of: 새 테이블의 행 번호 → 순위
+    """
+    postings: Dict[str, Sequence[int]] = dict(base.items())
+    drop = {doc_id for doc_id, _ in removed}
+    affected: Set[str] = set()
+    for _, text in removed:
+        affected |= index_grams(text)
+    inserts: Dict[str, List[int]] = {}
+    for doc_id, text in added:
+        for gram in index_grams(text):
+            inserts.setdefault(gram, []).append(doc_id)
+    affected |= inserts.keys()
+
+    for gram in affected:
+        merged = [doc_id for doc_id in postings.get(gram, ()) if doc_id not in drop]
+        for doc_id in inserts.get(gram, ()):
+            insort(merged, doc_id, key=rank_of.__getitem__)
+        if merged:
+            postings[gram] = array('I', merged)
+        else:
+            postings.pop(gram, None)
+    return postings
+
+
+def _merge_order(
+    order: Sequence[int],
+    drop: Set[int],
+    insert: List[int],
+    key: Callable[[int], object]
+) -> array:
+    """정렬된 순서 배열에서 drop을 빼고 insert를 정렬 위치에 끼워 넣음"""
+    merged = [i for i in order if i not in drop] if drop else list(order)
+    for i in insert:
+        insort(merged, i, key=key)
+    return array('I', merged)
@@ -1,67 +1,320 @@
 import requests
+import sys
 import xml.etree.ElementTree as ET
 import zipfile
-import io
-from typing import List, Dict, Optional
+import tempfile
+import time
+import tracemalloc
+from typing import List, Dict, Optional, Iterator, NamedTuple, BinaryIO, Tuple
 from backend.core.exceptions import DARTAPIException
 from backend.core.config import settings
+from backend.core.http import get_http_session, http_timeout
+from backend.core.logger import get_backend_logger
+from backend.repositories.dart_scheduler import get_dart_scheduler
+from backend.repositories.financial_cache import FinancialCache
 import urllib3
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+logger = get_backend_logger("dart_repository")
+
+# corpCode.xml 응답을 메모리에 둘 최대 크기 (초과 시 디스크로 넘김)
+CORP_CODE_SPOOL_SIZE = 4 * 1024 * 1024
+
+# DART 응답 상태 코드
+DART_STATUS_OK = '000'
+DART_STATUS_NO_DATA = '013'
+
+# 보고서 코드 (정기보고서)
+REPRT_ANNUAL = '11011'
+REPRT_HALF = '11012'
+REPRT_Q1 = '11013'
+REPRT_Q3 = '11014'
+# 보고서 코드 → 회계연도 내 분기 (사업보고서는 4분기 말 기준)
+REPORT_QUARTERS = {REPRT_Q1: 1, REPRT_HALF: 2, REPRT_Q3: 3, REPRT_ANNUAL: 4}
+REPORT_NAMES = {
+    REPRT_Q1: '1분기보고서',
+    REPRT_HALF: '반기보고서',
+    REPRT_Q3: '3분기보고서',
+    REPRT_ANNUAL: '사업보고서',
+}
+
+# fnlttMultiAcnt 한 번에 조회할 수 있는 최대 회사 수 (corp_code 쉼표 구분)
+MULTI_ACNT_MAX_CORPS = 100
+
+
+class CorpRecord(NamedTuple):
+    """회사 코드 레코드"""
+    corp_code: str
+    corp_name: str
+    stock_code: str
+
+
+def _iterparse_corp_codes(f: BinaryIO) -> Iterator[CorpRecord]:
+    """CORPCODE.xml 스트리밍 파싱 (처리한 요소는 바로 해제)"""
+    root = None
+    for event, elem in ET.iterparse(f, events=('start', 'end')):
+        if root is None:
+            root = elem
+            continue
+        if event != 'end' or elem.tag != 'list':
+            continue
+
+        corp_code = elem.findtext('corp_code')
+        corp_name = elem.findtext('corp_name')
+        stock_code = (elem.findtext('stock_code') or '').strip() or 'N/A'
+
+        if corp_code and corp_name:
+            yield CorpRecord(corp_code, corp_name, stock_code)
+
+        # 처리한 <list> 요소를 루트에서 떼어내 트리가 커지지 않도록 함
+        elem.clear()
+        root.clear()
+
+
+def group_by_fs_div(data: Dict) -> Dict[str, List[Dict]]:
+    """fnlttMultiAcnt 응답을 재무제표 구분(CFS/OFS)별로 묶음 (오류 응답은 빈 dict)"""
+    statements: Dict[str, List[Dict]] = {}
+    if data.get('status') == DART_STATUS_OK:
+        for item in data.get('list', []):
+            statements.setdefault(item.get('fs_div'), []).append(item)
+    return statements
+
+
+def group_by_corp(data: Dict) -> Dict[str, Dict[str, List[Dict]]]:
+    """여러 회사 fnlttMultiAcnt 응답을 회사별, 재무제표 구분별로 묶음 (오류 응답은 빈 dict)"""
+    by_corp: Dict[str, Dict[str, List[Dict]]] = {}
+    if data.get('status') == DART_STATUS_OK:
+        for item in data.get('list', []):
+            by_corp.setdefault(item.get('corp_code'), {}).setdefault(item.get('fs_div'), []).append(item)
+    return by_corp
+
+
+def negative_cache_key(url: str, params: Dict) -> Tuple[str, str]:
+    """"데이터 없음" 기록 키 (엔드포인트, API 키를 뺀 요청 파라미터)"""
+    request_key = '&'.join(f'{k}={v}' for k, v in sorted(params.items()) if k != 'crtfc_key')
+    return url.rsplit('/', 1)[-1], request_key
+
+
+def cached_no_data(cache: Optional[FinancialCache], url: str, params: Dict) -> Optional[Dict]:
+    """기억해 둔 "데이터 없음" 응답 (없거나 만료되었으면 None)"""
+    if cache is None:
+        return None
+    status = cache.get_negative(*negative_cache_key(url, params))
+    if status is None:
+        return None
+    return {'status': status, 'message': '조회된 데이터가 없습니다 (캐시)', 'list': []}
+
+
+def remember_no_data(cache: Optional[FinancialCache], url: str, params: Dict):
+    """DART가 "데이터 없음"(013)으로 확정 응답한 요청 기록"""
+    if cache is not None:
+        cache.put_negative(*negative_cache_key(url, params), DART_STATUS_NO_DATA)
+
+
+def multi_acnt_params(corp_code: str, bsns_year: str, reprt_code: str) -> Dict[str, str]:
+    """fnlttMultiAcnt 요청 파라미터 (API 키 제외, corp_code는 쉼표로 여러 개 가능)"""
+    return {'corp_code': corp_code, 'bsns_year': bsns_year, 'reprt_code': reprt_code}
+
+
+def chunked(items: List, size: int) -> List[List]:
+    """size개씩 나눈 목록"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def filter_report_documents(disclosures: List[Dict], report_types: List[str]) -> List[Dict]:
+    """공시 목록에서 report_types 보고서만 (정정 보고서 제외)"""
+    reports = []
+    for doc in disclosures:
+        report_nm = doc.get('report_nm', '')
+        # 정정, 첨부정정 제외
+        if any(rt in report_nm for rt in report_types) and '정정' not in report_nm:
+            reports.append(doc)
+    return reports
+
+
+def filter_financial_documents(disclosures: List[Dict]) -> List[Dict]:
+    """공시 목록에서 재무정보가 포함된 문서만 (접수일자 내림차순)"""
+    financial_keywords = [
+        '사업보고서', '반기보고서', '분기보고서',
+        '감사보고서', '검토보고서'
+    ]
+
+    exclude_keywords = ['정정', '취소', '철회', '연장', '첨부정정']
+
+    financial_docs = []
+    for doc in disclosures:
+        report_nm = doc.get('report_nm', '')
+
+        # 재무정보 포함 문서만 선택
+        if any(kw in report_nm for kw in financial_keywords):
+            # 제외 키워드 체크
+            if not any(ex in report_nm for ex in exclude_keywords):
+                financial_docs.append({
+                    'rcept_no': doc.get('rcept_no'),
+                    'corp_code': doc.get('corp_code'),
+                    'corp_name': doc.get('corp_name'),
+                    'report_nm': report_nm,
+                    'rcept_dt': doc.get('rcept_dt'),
+                    'flr_nm': doc.get('flr_nm'),
+                    'rm': doc.get('rm', '')
+                })
+
+    # 접수일자 기준 내림차순 정렬
+    financial_docs.sort(key=lambda x: x['rcept_dt'], reverse=True)
+
+    return financial_docs
+
+
+def document_year_range(start_year: Optional[str], end_year: Optional[str]) -> tuple:
+    """재무문서 조회 기간 (기본값: 현재년도-3 ~ 현재년도)"""
+    from datetime import datetime
+
+    if not end_year:
+        end_year = str(datetime.now().year)
+    if not start_year:
+        start_year = str(int(end_year) - 3)
+    return start_year, end_year
+
+
+def check_pdf_response(content_type: str, save_path: str):
+    """PDF 응답인지 확인"""
+    if 'pdf' not in content_type.lower() and not save_path.endswith('.pdf'):
+        raise DARTAPIException(f"PDF 다운로드 실패: 응답이 PDF가 아닙니다 (Content-Type: {content_type})")
+
+
+def save_file(save_path: str, content: bytes) -> str:
+    """다운로드한 내용을 파일로 저장"""
+    import os
+    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+
+    with open(save_path, 'wb') as f:
+        f.write(content)
+
+    return save_path
+
+
+def _max_rss_kb() -> Optional[int]:
+    """프로세스 시작 이후 최대 RSS (KB, 지원하지 않는 플랫폼은 None)"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트 단위
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
 
 class DARTRepository:
     """DART API 데이터 액세스 레이어"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Args:
+            api_key: DART API 키 (없으면 설정값)
+            session: HTTP 세션 (없으면 프로세스 공유 연결 풀 세션)
+        """
         self.api_key = api_key or settings.dart_api_key
         self.base_url = settings.dart_base_url
+        self.session = session or get_http_session()
+        self.scheduler = get_dart_scheduler()
+        self.last_corp_load_stats: Optional[Dict] = None
     
-    def download_corp_codes(self) -> List[Dict]:
-        """회사 코드 다운로드"""
+    def _get_json(self, url: str, params: Dict) -> Dict:
+        """DART OpenAPI JSON 호출 (스케줄러 허가 후 요청하고 응답 상태를 스케줄러에 알림)"""
+        self.scheduler.acquire_sync(self.api_key)
+        response = self.session.get(url, params=params, timeout=http_timeout())
+        data = response.json()
+        self.scheduler.observe(self.api_key, data.get('status'))
+        return data
+    
+    def iter_corp_codes(self) -> Iterator[CorpRecord]:
+        """회사 코드 스트리밍 다운로드
+
+        응답을 임시 파일로 받은 뒤 ZIP 안의 CORPCODE.xml을 iterparse로 읽고,
+        처리한 요소는 즉시 비워 최대 메모리 사용량을 일정하게 유지합니다.
+        전체를 소비하면 처리 통계가 last_corp_load_stats에 기록됩니다.
+        최대 RSS는 프로세스 전체 기준이라 이번 갱신의 메모리는 traced_peak_bytes
+        (corp_load_trace_memory 설정 시)나 갱신 중 최대 RSS 증가분(max_rss_growth_kb)으로 봅니다.
+
+        Yields:
+            CorpRecord (corp_code, corp_name, stock_code)
+        """
+        start_time = time.perf_counter()
+        start_max_rss = _max_rss_kb()
+        trace_memory = settings.corp_load_trace_memory and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+
         try:
-            response = requests.get(
-                f"{self.base_url}/corpCode.xml",
-                params={'crtfc_key': self.api_key.strip()},
-                verify=False,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
-                with zf.open('CORPCODE.xml') as f:
-                    root = ET.parse(f).getroot()
-                    corp_list = []
-                    
-                    for item in root.findall('.//list'):
-                        corp_code = item.findtext('corp_code')
-                        corp_name = item.findtext('corp_name')
-                        stock_code = item.findtext('stock_code', '').strip() or 'N/A'
-                        
-                        if corp_code and corp_name:
-                            corp_list.append({
-                                'corp_code': corp_code,
-                                'corp_name': corp_name,
-                                'stock_code': stock_code
-                            })
-                    
-                    return corp_list
-                    
+            with tempfile.SpooledTemporaryFile(max_size=CORP_CODE_SPOOL_SIZE) as buffer:
+                self.scheduler.acquire_sync(self.api_key)
+                with self.session.get(
+                    f"{self.base_url}/corpCode.xml",
+                    params={'crtfc_key': self.api_key.strip()},
+                    timeout=http_timeout(),
+                    stream=True
+                ) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        buffer.write(chunk)
+
+                download_size = buffer.tell()
+                download_time = time.perf_counter() - start_time
+                buffer.seek(0)
+
+                count = 0
+                with zipfile.ZipFile(buffer) as zf:
+                    with zf.open('CORPCODE.xml') as f:
+                        for record in _iterparse_corp_codes(f):
+                            count += 1
+                            yield record
+
+            max_rss = _max_rss_kb()
+            self.last_corp_load_stats = {
+                'count': count,
+                'download_bytes': download_size,
+                'download_seconds': round(download_time, 3),
+                'parse_seconds': round(time.perf_counter() - start_time - download_time, 3),
+                'traced_peak_bytes': tracemalloc.get_traced_memory()[1] if trace_memory else None,
+                'max_rss_growth_kb': max_rss - start_max_rss if max_rss is not None else None,
+                'process_max_rss_kb': max_rss,
+            }
+            logger.info(f"회사 코드 로드 완료: {self.last_corp_load_stats}")
+
+        except DARTAPIException:
+            raise
         except Exception as e:
             raise DARTAPIException(f"회사 코드 다운로드 실패: {str(e)}")
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+
+    def download_corp_codes(self) -> List[Dict]:
+        """회사 코드 다운로드"""
+        return [record._asdict() for record in self.iter_corp_codes()]
     
     def get_financial_data(
         self,
         corp_code: str,
         bsns_year: str,
-        fs_div: str = 'CFS'
+        fs_div: str = 'CFS',
+        reprt_code: str = '11011'
     ) -> List[Dict]:
-        """재무정보 조회
+        """재무정보 조회 (캐시 없이 한 번 요청, 서비스는 AsyncDARTRepository를 씀)
         
         Args:
             corp_code: 기업 고유번호
             bsns_year: 사업연도 (YYYY)
             fs_div: 재무제표 구분 (CFS: 연결, OFS: 별도)
+            reprt_code: 보고서 코드 (11011: 사업보고서)
             
         Returns:
             재무 데이터 리스트
@@ -70,21 +323,15 @@ class DARTRepository:
             url = f"{self.base_url}/fnlttMultiAcnt.json"
             params = {
                 'crtfc_key': self.api_key,
-                'corp_code': corp_code,
-                'bsns_year': bsns_year,
-                'reprt_code': '11011',  # 사업보고서
+                **multi_acnt_params(corp_code, bsns_year, reprt_code),
             }
             
-            response = requests.get(url, params=params, verify=False, timeout=30)
-            data = response.json()
-            
-            if data.get('status') == '000':
-                return [i for i in data.get('list', []) if i.get('fs_div') == fs_div]
-            else:
-                return []
+            data = self._get_json(url, params)
                 
         except Exception as e:
             raise DARTAPIException(f"재무정보 조회 실패: {str(e)}")
+
+        return group_by_fs_div(data).get(fs_div, [])
     
     def get_disclosure_list(
         self,
@@ -111,8 +358,7 @@ class DARTRepository:
                 'page_count': '100'
             }
 
-            response = requests.get(url, params=params, verify=False, timeout=30)
-            data = response.json()
+            data = self._get_json(url, params)
 
             if data.get('status') == '000':
                 return data.get('list', [])
@@ -145,14 +391,7 @@ class DARTRepository:
             disclosures = self.get_disclosure_list(corp_code, bsns_year)
 
             # 사업보고서 또는 감사보고서만 필터링
-            reports = []
-            for doc in disclosures:
-                report_nm = doc.get('report_nm', '')
-                # 정정, 첨부정정 제외
-                if any(rt in report_nm for rt in report_types) and '정정' not in report_nm:
-                    reports.append(doc)
-
-            return reports
+            return filter_report_documents(disclosures, report_types)
 
         except Exception as e:
             raise DARTAPIException(f"보고서 검색 실패: {str(e)}")
@@ -174,12 +413,7 @@ class DARTRepository:
             재무정보가 포함된 문서 목록
         """
         try:
-            from datetime import datetime
-
-            if not end_year:
-                end_year = str(datetime.now().year)
-            if not start_year:
-                start_year = str(int(end_year) - 3)
+            start_year, end_year = document_year_range(start_year, end_year)
 
             url = f"{self.base_url}/list.json"
 
@@ -191,44 +425,13 @@ class DARTRepository:
                 'page_count': '100'
             }
 
-            response = requests.get(url, params=params, verify=False, timeout=30)
-            data = response.json()
+            data = self._get_json(url, params)
 
             if data.get('status') != '000':
                 return []
 
-            disclosures = data.get('list', [])
-
             # 재무정보가 있는 문서만 필터링
-            financial_keywords = [
-                '사업보고서', '반기보고서', '분기보고서',
-                '감사보고서', '검토보고서'
-            ]
-
-            exclude_keywords = ['정정', '취소', '철회', '연장', '첨부정정']
-
-            financial_docs = []
-            for doc in disclosures:
-                report_nm = doc.get('report_nm', '')
-
-                # 재무정보 포함 문서만 선택
-                if any(kw in report_nm for kw in financial_keywords):
-                    # 제외 키워드 체크
-                    if not any(ex in report_nm for ex in exclude_keywords):
-                        financial_docs.append({
-                            'rcept_no': doc.get('rcept_no'),
-                            'corp_code': doc.get('corp_code'),
-                            'corp_name': doc.get('corp_name'),
-                            'report_nm': report_nm,
-                            'rcept_dt': doc.get('rcept_dt'),
-                            'flr_nm': doc.get('flr_nm'),
-                            'rm': doc.get('rm', '')
-                        })
-
-            # 접수일자 기준 내림차순 정렬
-            financial_docs.sort(key=lambda x: x['rcept_dt'], reverse=True)
-
-            return financial_docs
+            return filter_financial_documents(data.get('list', []))
 
         except Exception as e:
             raise DARTAPIException(f"재무문서 목록 조회 실패: {str(e)}")
@@ -254,17 +457,12 @@ class DARTRepository:
                 'rcept_no': rcept_no
             }
 
-            response = requests.get(url, params=params, verify=False, timeout=60)
+            self.scheduler.acquire_sync(self.api_key)
+            response = self.session.get(url, params=params, timeout=http_timeout(60))
             response.raise_for_status()
 
             # 파일로 저장
-            import os
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
-
-            return save_path
+            return save_file(save_path, response.content)
 
         except Exception as e:
             raise DARTAPIException(f"문서 다운로드 실패: {str(e)}")
@@ -290,22 +488,14 @@ class DARTRepository:
                 'rcp_no': rcept_no
             }
 
-            response = requests.get(url, params=params, verify=False, timeout=120)
+            response = self.session.get(url, params=params, timeout=http_timeout(120))
             response.raise_for_status()
 
             # PDF인지 확인
-            content_type = response.headers.get('Content-Type', '')
-            if 'pdf' not in content_type.lower() and not save_path.endswith('.pdf'):
-                raise DARTAPIException(f"PDF 다운로드 실패: 응답이 PDF가 아닙니다 (Content-Type: {content_type})")
+            check_pdf_response(response.headers.get('Content-Type', ''), save_path)
 
             # 파일로 저장
-            import os
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
-
-            return save_path
+            return save_file(save_path, response.content)
 
         except Exception as e:
             raise DARTAPIException(f"PDF 다운로드 실패: {str(e)}")
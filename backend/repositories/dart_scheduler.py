@@ -0,0 +1,337 @@
+"""
+DART 호출 스케줄러
+API 키마다 토큰 버킷으로 순간 호출 속도를, 호출 한도 장부로 일일 사용량을 관리합니다.
+
+호출은 대화형(사용자 요청)과 백그라운드(캐시 갱신, 회사 목록 갱신) 두 등급으로 나뉩니다.
+백그라운드 호출은 버킷이 충분히 차 있고 기다리는 대화형 호출이 없을 때만 나가며,
+일일 한도의 일부만 쓸 수 있어 남은 한도는 대화형 호출 몫으로 남습니다.
+
+오늘 사용량은 키마다 메모리에서 세고(처음 쓰는 키나 날짜가 바뀌면 장부 값으로 시작),
+장부에는 일정 호출 수나 시간마다 모아서 기록하므로 호출 허가마다 SQLite를 거치지 않습니다.
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional
+from backend.core.config import settings
+from backend.core.exceptions import DARTQuotaExceededException
+from backend.core.logger import get_backend_logger
+from backend.repositories.quota_ledger import QuotaLedger
+
+logger = get_backend_logger("dart_scheduler")
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BACKGROUND = 'background'
+
+# DART 응답 상태 코드: 요청 제한 초과
+DART_STATUS_RATE_LIMITED = '020'
+
+# DART 일일 한도는 한국 시간 자정에 초기화
+KST = timezone(timedelta(hours=9))
+
+# 장부 보관 일수
+LEDGER_RETENTION_DAYS = 7
+
+# 메모리 사용량을 장부에 기록하는 주기 (호출 수, 초)
+LEDGER_FLUSH_CALLS = 50
+LEDGER_FLUSH_SECONDS = 5
+
+_priority: ContextVar[str] = ContextVar('dart_request_priority', default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """블록 안(과 여기서 만든 태스크, to_thread 스레드)의 DART 호출을 백그라운드 등급으로"""
+    token = _priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def interactive_context() -> Context:
+    """현재 컨텍스트를 복사해 호출 등급만 대화형으로 바꾼 컨텍스트 (여러 요청이 공유하는 작업용)"""
+    context = copy_context()
+    context.run(_priority.set, PRIORITY_INTERACTIVE)
+    return context
+
+
+def current_priority() -> str:
+    """현재 컨텍스트의 호출 등급"""
+    return _priority.get()
+
+
+def key_id(api_key: str) -> str:
+    """API 키 식별자 (원문 대신 기록/노출용)"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+def quota_day(now: Optional[float] = None) -> str:
+    """일일 한도 기준 날짜 (한국 시간)"""
+    return datetime.fromtimestamp(now or time.time(), KST).date().isoformat()
+
+
+class _KeyState:
+    """API 키별 토큰 버킷과 통계"""
+
+    def __init__(self, tokens: float):
+        self.tokens = tokens
+        self.updated_at = time.monotonic()
+        self.interactive_waiting = 0
+        self.granted = {PRIORITY_INTERACTIVE: 0, PRIORITY_BACKGROUND: 0}
+        self.deferred = 0  # 대화형 호출에 양보한 백그라운드 호출
+        self.rejected = 0  # 일일 한도로 거절한 호출
+        self.rate_limited = 0  # DART가 020(요청 제한 초과)으로 응답한 횟수
+        self.day: Optional[str] = None  # used가 가리키는 날짜
+        self.used = 0  # 오늘 사용량 (장부 값 + 아직 기록하지 않은 호출)
+        self.pending = 0  # 장부에 아직 기록하지 않은 호출
+
+
+class DARTScheduler:
+    """API 키별 DART 호출 허가 (토큰 버킷 + 일일 한도 + 우선순위)"""
+
+    def __init__(
+        self,
+        ledger: QuotaLedger,
+        rate_per_second: float = 10,
+        burst: int = 20,
+        daily_quota: int = 20000,
+        background_reserve: float = 0.5,
+        background_daily_share: float = 0.8
+    ):
+        """
+        Args:
+            ledger: 일일 사용량 장부
+            rate_per_second: 초당 토큰 충전 수
+            burst: 버킷 크기 (순간 최대 호출 수)
+            daily_quota: API 키별 일일 호출 한도
+            background_reserve: 백그라운드 호출 뒤에도 남아 있어야 할 토큰 비율
+            background_daily_share: 백그라운드 호출이 쓸 수 있는 일일 한도 비율
+        """
+        self.ledger = ledger
+        self.rate = rate_per_second
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.background_floor = burst * background_reserve
+        self.background_quota = int(daily_quota * background_daily_share)
+        self._states: Dict[str, _KeyState] = {}
+        self._lock = threading.Lock()
+        self._pruned_day: Optional[str] = None
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    async def acquire(self, api_key: str, priority: Optional[str] = None):
+        """호출 허가를 받을 때까지 대기 (일일 한도를 넘으면 DARTQuotaExceededException)"""
+        priority = priority or current_priority()
+        waiting = False
+        try:
+            while True:
+                wait = self._try_acquire(api_key, priority, waiting)
+                if wait is None:
+                    if self._claim_flush():
+                        await asyncio.to_thread(self.flush)
+                    return
+                waiting = True
+                await asyncio.sleep(wait)
+        finally:
+            if waiting:
+                self._stop_waiting(api_key, priority)
+
+    def acquire_sync(self, api_key: str, priority: Optional[str] = None):
+        """acquire()의 동기 버전 (스레드에서 호출)"""
+        priority = priority or current_priority()
+        waiting = False
+        try:
+            while True:
+                wait = self._try_acquire(api_key, priority, waiting)
+                if wait is None:
+                    if self._claim_flush():
+                        self.flush()
+                    return
+                waiting = True
+                time.sleep(wait)
+        finally:
+            if waiting:
+                self._stop_waiting(api_key, priority)
+
+    def observe(self, api_key: str, status: Optional[str]):
+        """DART 응답 상태 반영 (020이면 오늘 한도를 모두 쓴 것으로 기록)"""
+        if status != DART_STATUS_RATE_LIMITED:
+            return
+        kid = key_id(api_key)
+        day = quota_day()
+        with self._lock:
+            state = self._state(kid)
+            state.rate_limited += 1
+            if state.day == day:
+                state.used = max(state.used, self.daily_quota)
+        self.ledger.set_used(kid, day, self.daily_quota)
+        logger.warning(f"DART 요청 제한 초과 응답 (key {kid}), 오늘 남은 호출 차단")
+
+    def flush(self):
+        """메모리에 모아 둔 사용량을 장부에 기록 (여러 워커 프로세스의 사용량도 이때 반영)"""
+        with self._lock:
+            pending = [(kid, state.day, state.pending) for kid, state in self._states.items() if state.pending]
+            for kid, _, _ in pending:
+                self._states[kid].pending = 0
+            self._pending = 0
+            self._flushed_at = time.monotonic()
+
+        for kid, day, count in pending:
+            try:
+                total = self.ledger.increment(kid, day, count)
+            except sqlite3.Error as e:
+                logger.warning(f"호출 한도 장부 기록 실패 (key {kid}), 다음에 다시 기록: {e}")
+                with self._lock:
+                    state = self._states[kid]
+                    if state.day == day:
+                        state.pending += count
+                        self._pending += count
+                continue
+            with self._lock:
+                state = self._states[kid]
+                if state.day == day:
+                    state.used = max(state.used, total + state.pending)
+
+        day = quota_day()
+        if self._pruned_day != day:
+            self._pruned_day = day
+            self.ledger.prune(quota_day(time.time() - LEDGER_RETENTION_DAYS * 86400))
+
+    def metrics(self) -> Dict:
+        """키별 오늘 사용량, 남은 한도, 버킷 상태"""
+        day = quota_day()
+        usage = dict(self.ledger.usage(day))
+        keys = []
+        with self._lock:
+            for kid in sorted(set(usage) | set(self._states)):
+                state = self._states.get(kid)
+                if state is not None:
+                    self._refill(state)
+                used = usage.get(kid, 0)
+                if state is not None and state.day == day:
+                    used = max(used, state.used)
+                keys.append({
+                    'key_id': kid,
+                    'used': used,
+                    'remaining': max(self.daily_quota - used, 0),
+                    'background_remaining': max(self.background_quota - used, 0),
+                    'tokens': round(state.tokens, 2) if state else float(self.burst),
+                    'interactive_waiting': state.interactive_waiting if state else 0,
+                    'granted': dict(state.granted) if state else {},
+                    'deferred_background': state.deferred if state else 0,
+                    'rejected': state.rejected if state else 0,
+                    'rate_limited': state.rate_limited if state else 0,
+                })
+        return {
+            'day': day,
+            'daily_quota': self.daily_quota,
+            'background_quota': self.background_quota,
+            'rate_per_second': self.rate,
+            'burst': self.burst,
+            'keys': keys,
+        }
+
+    def _try_acquire(self, api_key: str, priority: str, waiting: bool) -> Optional[float]:
+        """토큰을 얻으면 None, 아니면 다시 시도할 때까지 기다릴 시간 (초)"""
+        kid = key_id(api_key)
+        day = quota_day()
+        background = priority == PRIORITY_BACKGROUND
+
+        with self._lock:
+            state = self._state(kid)
+            if state.day != day:
+                self._start_day_locked(kid, state, day)
+            if state.used >= (self.background_quota if background else self.daily_quota):
+                state.rejected += 1
+                raise DARTQuotaExceededException(
+                    f"DART 일일 호출 한도 도달 ({state.used}/{self.daily_quota}, {priority})"
+                )
+
+            self._refill(state)
+            if background:
+                # 대화형 호출이 기다리거나 버킷이 비어 가면 양보
+                floor = self.background_floor + 1
+                if state.interactive_waiting or state.tokens < floor:
+                    if not waiting:
+                        state.deferred += 1
+                    return max(floor - state.tokens, 1) / self.rate
+            elif state.tokens < 1:
+                if not waiting:
+                    state.interactive_waiting += 1
+                return (1 - state.tokens) / self.rate
+
+            state.tokens -= 1
+            state.granted[priority] += 1
+            state.used += 1
+            state.pending += 1
+            self._pending += 1
+        return None
+
+    def _start_day_locked(self, kid: str, state: _KeyState, day: str):
+        """키의 사용량을 장부 값으로 시작 (처음 쓰는 키이거나 날짜가 바뀐 경우, 하루 한 번)"""
+        if state.pending:
+            # 전날 몫은 전날 날짜로 기록
+            self.ledger.increment(kid, state.day, state.pending)
+            self._pending -= state.pending
+            state.pending = 0
+        state.day = day
+        state.used = self.ledger.used(kid, day)
+
+    def _claim_flush(self) -> bool:
+        """장부에 기록할 때가 되었으면 True (동시에 여러 호출이 기록하지 않도록 한 호출만)"""
+        with self._lock:
+            if not self._pending:
+                return False
+            if self._pending < LEDGER_FLUSH_CALLS and time.monotonic() - self._flushed_at < LEDGER_FLUSH_SECONDS:
+                return False
+            self._flushed_at = time.monotonic()
+            return True
+
+    def _stop_waiting(self, api_key: str, priority: str):
+        if priority == PRIORITY_BACKGROUND:
+            return
+        with self._lock:
+            self._state(key_id(api_key)).interactive_waiting -= 1
+
+    def _state(self, kid: str) -> _KeyState:
+        state = self._states.get(kid)
+        if state is None:
+            state = self._states[kid] = _KeyState(self.burst)
+        return state
+
+    def _refill(self, state: _KeyState):
+        now = time.monotonic()
+        state.tokens = min(self.burst, state.tokens + (now - state.updated_at) * self.rate)
+        state.updated_at = now
+
+
+_scheduler: Optional[DARTScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_dart_scheduler() -> DARTScheduler:
+    """프로세스 공유 스케줄러 (장부 파일을 열 수 없으면 메모리 장부 사용)"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                try:
+                    ledger = QuotaLedger(settings.dart_quota_ledger_path)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"호출 한도 장부를 열 수 없어 메모리 장부 사용: {e}")
+                    ledger = QuotaLedger(':memory:')
+                _scheduler = DARTScheduler(
+                    ledger,
+                    rate_per_second=settings.dart_rate_per_second,
+                    burst=settings.dart_burst,
+                    daily_quota=settings.dart_daily_quota,
+                    background_reserve=settings.dart_background_reserve,
+                    background_daily_share=settings.dart_background_daily_share
+                )
+    return _scheduler
@@ -0,0 +1,294 @@
+"""
+재무정보 응답 캐시
+DART 재무정보(fnlttMultiAcnt) 응답 전체를 재무제표 구분(fs_div)별로 묶어 SQLite 파일에 보관합니다.
+연결/별도 전환은 같은 항목에서 꺼내므로 추가 호출이 없습니다.
+제출이 끝난 과거 사업연도는 거의 바뀌지 않으므로 오래 보관하고,
+아직 공시가 나오는 연도는 짧게 보관합니다.
+
+유효기간이 지난 항목도 stale 구간 안에서는 바로 돌려주고 뒤에서 갱신하며
+(stale-while-revalidate), DART 호출이 실패하면 기간과 무관하게 마지막 값을 씁니다.
+
+DART가 "데이터 없음"(013)으로 확정 응답한 요청은 별도 테이블에 짧게 기억해
+같은 요청을 반복하지 않습니다. 요청 한도 초과 같은 일시적 오류는 기록하지 않습니다.
+
+조회마다 파일에 쓰지 않도록 LRU용 조회 시각은 메모리에 모았다가 묶어서 기록하고,
+항목 수는 열 때 한 번 센 뒤 저장/삭제할 때마다 갱신합니다.
+비동기 코드에서는 asyncio.to_thread로 호출합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+from backend.core.config import settings
+from backend.core.logger import get_backend_logger
+
+logger = get_backend_logger("financial_cache")
+
+# 캐시 스키마 버전 (다르면 테이블을 다시 만듦)
+SCHEMA_VERSION = 2
+
+# 조회 시각을 모아 두었다가 기록하는 조건 (개수, 초)
+ACCESS_FLUSH_BATCH = 256
+ACCESS_FLUSH_SECONDS = 60
+
+# 만료된 "데이터 없음" 기록 정리 주기 (초)
+NEGATIVE_PRUNE_SECONDS = 600
+
+# 사업보고서 제출 기한(3월 말) 이후 여유를 두고 전년도를 확정된 연도로 봄
+ANNUAL_REPORT_SETTLED_MONTH = 5
+
+
+def is_settled_year(bsns_year: str, now: Optional[float] = None) -> bool:
+    """사업보고서 제출이 끝나 값이 거의 바뀌지 않는 과거 사업연도인지"""
+    today = datetime.fromtimestamp(now or time.time())
+    try:
+        year = int(bsns_year)
+    except ValueError:
+        return False
+
+    settled_year = today.year - 1 if today.month >= ANNUAL_REPORT_SETTLED_MONTH else today.year - 2
+    return year <= settled_year
+
+
+class CacheEntry(NamedTuple):
+    """캐시 조회 결과"""
+    value: Any
+    fetched_at: float
+    fresh: bool  # 유효기간 이내
+    revalidate: bool  # 유효기간은 지났지만 stale 구간 이내 (값을 쓰고 뒤에서 갱신)
+
+
+class FinancialCache:
+    """SQLite 기반 재무정보 응답 캐시 (LRU 제거)"""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 20000,
+        ttl_past_days: float = 30,
+        ttl_current_hours: float = 6,
+        stale_hours: float = 24,
+        negative_hours: float = 6
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로
+            max_entries: 최대 항목 수 (초과 시 가장 오래 조회되지 않은 항목부터 삭제)
+            ttl_past_days: 확정된 과거 사업연도 유효기간 (일)
+            ttl_current_hours: 공시가 진행 중인 연도 유효기간 (시간)
+            stale_hours: 유효기간 이후 기존 값을 쓰면서 갱신할 수 있는 기간 (시간)
+            negative_hours: "데이터 없음" 응답 보관 기간 (시간)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_past = ttl_past_days * 86400
+        self.ttl_current = ttl_current_hours * 3600
+        self.stale = stale_hours * 3600
+        self.negative_ttl = negative_hours * 3600
+        self._lock = threading.Lock()
+        self._accessed: Dict[tuple, float] = {}
+        self._accessed_flushed_at = time.time()
+        self._negative_pruned_at = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self._conn.execute('DROP TABLE IF EXISTS financial_cache')
+            self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS financial_cache (
+                corp_code TEXT NOT NULL,
+                bsns_year TEXT NOT NULL,
+                reprt_code TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (corp_code, bsns_year, reprt_code)
+            )
+        ''')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_financial_cache_accessed ON financial_cache (accessed_at)'
+        )
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS negative_cache (
+                endpoint TEXT NOT NULL,
+                request_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                cached_at REAL NOT NULL,
+                PRIMARY KEY (endpoint, request_key)
+            )
+        ''')
+        self._count = self._conn.execute('SELECT COUNT(*) FROM financial_cache').fetchone()[0]
+
+    def ttl_seconds(self, bsns_year: str, now: Optional[float] = None) -> float:
+        """사업연도별 유효기간 (초)"""
+        return self.ttl_past if is_settled_year(bsns_year, now) else self.ttl_current
+
+    def get(self, corp_code: str, bsns_year: str, reprt_code: str) -> Optional[CacheEntry]:
+        """캐시 조회 (없으면 None, 있으면 신선도와 함께 반환)
+
+        Returns:
+            value는 {fs_div: 재무 데이터 리스트}
+        """
+        now = time.time()
+        key = (corp_code, bsns_year, reprt_code)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT payload, fetched_at FROM financial_cache '
+                'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ?',
+                key
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= ACCESS_FLUSH_BATCH or now - self._accessed_flushed_at >= ACCESS_FLUSH_SECONDS:
+                self._flush_accessed_locked()
+
+        payload, fetched_at = row
+        age = now - fetched_at
+        ttl = self.ttl_seconds(bsns_year, now)
+        return CacheEntry(
+            value=json.loads(payload),
+            fetched_at=fetched_at,
+            fresh=age < ttl,
+            revalidate=ttl <= age < ttl + self.stale
+        )
+
+    def put(self, corp_code: str, bsns_year: str, reprt_code: str, value: Dict[str, List[Dict]]):
+        """캐시 저장 (최대 항목 수를 넘으면 LRU 제거)
+
+        Args:
+            value: {fs_div: 재무 데이터 리스트}
+        """
+        now = time.time()
+        key = (corp_code, bsns_year, reprt_code)
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            exists = self._conn.execute(
+                'SELECT 1 FROM financial_cache WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ?',
+                key
+            ).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO financial_cache '
+                '(corp_code, bsns_year, reprt_code, payload, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (*key, payload, now, now)
+            )
+            self._accessed.pop(key, None)
+            if not exists:
+                self._count += 1
+            self._evict_locked()
+
+    def get_negative(self, endpoint: str, request_key: str) -> Optional[str]:
+        """보관 기간 안의 "데이터 없음" 기록이 있으면 그 DART 상태 코드"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, cached_at FROM negative_cache WHERE endpoint = ? AND request_key = ?',
+                (endpoint, request_key)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.negative_ttl:
+            return None
+        return row[0]
+
+    def put_negative(self, endpoint: str, request_key: str, status: str):
+        """"데이터 없음" 응답 기록 (만료된 기록은 NEGATIVE_PRUNE_SECONDS마다 정리)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO negative_cache (endpoint, request_key, status, cached_at) '
+                'VALUES (?, ?, ?, ?)',
+                (endpoint, request_key, status, now)
+            )
+            if now - self._negative_pruned_at >= NEGATIVE_PRUNE_SECONDS:
+                self._conn.execute('DELETE FROM negative_cache WHERE cached_at < ?', (now - self.negative_ttl,))
+                self._negative_pruned_at = now
+
+    def stats(self) -> dict:
+        """캐시 항목 수와 파일 크기"""
+        with self._lock:
+            count = self._count
+            negative = self._conn.execute('SELECT COUNT(*) FROM negative_cache').fetchone()[0]
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {
+            'entries': count,
+            'negative_entries': negative,
+            'max_entries': self.max_entries,
+            'file_bytes': size
+        }
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._conn.execute('DELETE FROM financial_cache')
+            self._conn.execute('DELETE FROM negative_cache')
+            self._accessed.clear()
+            self._count = 0
+
+    def flush(self):
+        """모아 둔 조회 시각 기록"""
+        with self._lock:
+            self._flush_accessed_locked()
+
+    def _flush_accessed_locked(self):
+        if self._accessed:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany(
+                    'UPDATE financial_cache SET accessed_at = ? '
+                    'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ?',
+                    [(accessed_at, *key) for key, accessed_at in self._accessed.items()]
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._accessed.clear()
+        self._accessed_flushed_at = time.time()
+
+    def _evict_locked(self):
+        excess = self._count - self.max_entries
+        if excess > 0:
+            # 최근 조회 시각을 반영한 뒤 가장 오래 조회되지 않은 항목부터 삭제
+            self._flush_accessed_locked()
+            deleted = self._conn.execute(
+                'DELETE FROM financial_cache WHERE rowid IN ('
+                'SELECT rowid FROM financial_cache ORDER BY accessed_at LIMIT ?)',
+                (excess,)
+            ).rowcount
+            self._count -= deleted
+
+
+_cache: Optional[FinancialCache] = None
+_cache_disabled = False
+_cache_lock = threading.Lock()
+
+
+def get_financial_cache() -> Optional[FinancialCache]:
+    """프로세스 공유 재무정보 캐시 (비활성화되었거나 열 수 없으면 None)"""
+    global _cache, _cache_disabled
+    if _cache is None and not _cache_disabled:
+        with _cache_lock:
+            if _cache is None and not _cache_disabled:
+                if not settings.financial_cache_enabled:
+                    _cache_disabled = True
+                    return None
+                try:
+                    _cache = FinancialCache(
+                        settings.financial_cache_path,
+                        max_entries=settings.financial_cache_max_entries,
+                        ttl_past_days=settings.financial_cache_ttl_past_days,
+                        ttl_current_hours=settings.financial_cache_ttl_current_hours,
+                        stale_hours=settings.financial_cache_stale_hours,
+                        negative_hours=settings.financial_cache_negative_hours
+                    )
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"재무정보 캐시를 열 수 없어 사용하지 않음: {e}")
+                    _cache_disabled = True
+    return _cache
@@ -2,13 +2,18 @@ import pandas as pd
 import os
 import requests
 from bs4 import BeautifulSoup
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from backend.core.exceptions import KRXDataException
+from backend.services.corp_search_index import FuzzyMatcher
+from backend.utils.korean import normalize_name
 from backend.core.config import settings
 from backend.core.logger import get_backend_logger
 
 logger = get_backend_logger("krx_repository")
 
+# 회사명 퍼지 매칭 색인 (캐시 파일별, 파일이 바뀌면 다시 생성)
+_name_matchers: Dict[str, Tuple[tuple, FuzzyMatcher]] = {}
+
 
 class KRXRepository:
     """KRX 데이터 액세스 레이어"""
@@ -150,13 +155,13 @@ class KRXRepository:
                 logger.info(f"부분 매칭: {corp_name} -> {partial.iloc[0]['회사명']} ({code})")
                 return code
             
-            # 3. 공백 제거 후 매칭
-            corp_name_stripped = corp_name.replace(' ', '')
-            df['회사명_stripped'] = df['회사명'].str.replace(' ', '')
-            stripped_match = df[df['회사명_stripped'] == corp_name_stripped]
-            if not stripped_match.empty:
-                code = stripped_match.iloc[0]['종목코드']
-                logger.info(f"공백 무시 매칭: {corp_name} -> {stripped_match.iloc[0]['회사명']} ({code})")
+            # 3. 정규화(공백/법인 표기 무시) 후 편집 거리 매칭
+            # 다른 회사의 종목코드를 잘못 고르지 않도록 최단 거리 후보가 하나일 때만 채택
+            matches = self._get_name_matcher(df).search(corp_name, limit=2)
+            if matches and (len(matches) == 1 or matches[0][1] < matches[1][1]):
+                row, distance = matches[0]
+                code = df.iloc[row]['종목코드']
+                logger.info(f"유사 매칭 (거리 {distance}): {corp_name} -> {df.iloc[row]['회사명']} ({code})")
                 return code
             
             logger.info(f"매칭 실패: {corp_name}")
@@ -166,6 +171,22 @@ class KRXRepository:
             logger.error(f"종목코드 검색 오류: {e}")
             return None
     
+    def _get_name_matcher(self, df: pd.DataFrame) -> FuzzyMatcher:
+        """회사명 퍼지 매칭 색인 (캐시 파일이 그대로면 재사용)"""
+        try:
+            key = (os.path.getmtime(self.cache_file), len(df))
+        except OSError:
+            key = None
+
+        cached = _name_matchers.get(self.cache_file)
+        if key is not None and cached is not None and cached[0] == key:
+            return cached[1]
+
+        matcher = FuzzyMatcher([normalize_name(name) for name in df['회사명'].astype(str)])
+        if key is not None:
+            _name_matchers[self.cache_file] = (key, matcher)
+        return matcher
+    
     def find_by_name(self, corp_name: str) -> Optional[str]:
         """회사명으로 종목코드 찾기 (별칭)"""
         return self.get_krx_code_by_name(corp_name)
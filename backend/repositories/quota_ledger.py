@@ -0,0 +1,75 @@
+"""
+DART 호출 한도 장부
+API 키별 일일 호출 수를 SQLite 파일에 기록해 서버를 다시 시작해도 사용량이 이어지도록 합니다.
+API 키 원문은 저장하지 않고 해시 앞부분(key_id)만 씁니다.
+"""
+import os
+import sqlite3
+import threading
+from typing import List, Tuple
+
+
+class QuotaLedger:
+    """SQLite 기반 일일 호출 수 장부"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite 파일 경로
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS dart_quota (
+                key_id TEXT NOT NULL,
+                day TEXT NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (key_id, day)
+            )
+        ''')
+
+    def used(self, key_id: str, day: str) -> int:
+        """해당 날짜 사용량"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT used FROM dart_quota WHERE key_id = ? AND day = ?', (key_id, day)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def increment(self, key_id: str, day: str, count: int = 1) -> int:
+        """사용량 증가 후 새 사용량 반환 (여러 워커 프로세스가 같은 파일을 써도 누적됨)"""
+        with self._lock:
+            return self._conn.execute(
+                'INSERT INTO dart_quota (key_id, day, used) VALUES (?, ?, ?) '
+                'ON CONFLICT (key_id, day) DO UPDATE SET used = used + excluded.used '
+                'RETURNING used',
+                (key_id, day, count)
+            ).fetchone()[0]
+
+    def set_used(self, key_id: str, day: str, used: int):
+        """사용량을 지정한 값 이상으로 맞춤 (DART가 한도 초과를 알린 경우)"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO dart_quota (key_id, day, used) VALUES (?, ?, ?) '
+                'ON CONFLICT (key_id, day) DO UPDATE SET used = MAX(used, excluded.used)',
+                (key_id, day, used)
+            )
+
+    def usage(self, day: str) -> List[Tuple[str, int]]:
+        """해당 날짜의 키별 사용량"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT key_id, used FROM dart_quota WHERE day = ? ORDER BY key_id', (day,)
+            ).fetchall()
+
+    def prune(self, keep_day: str):
+        """keep_day 이전 기록 삭제"""
+        with self._lock:
+            self._conn.execute('DELETE FROM dart_quota WHERE day < ?', (keep_day,))
@@ -0,0 +1,231 @@
+"""
+전체 재무제표 저장소
+DART 단일회사 전체 재무제표(fnlttSinglAcntAll) 응답을 한 번 파싱해 계정 행 단위로 SQLite에 보관합니다.
+행은 (기업, 사업연도, 보고서, 재무제표 구분, 재무제표 종류, 계정)으로 식별하고
+금액은 숫자로 바꿔 저장하므로 엑셀/차트/비율 계산이 응답 JSON을 다시 훑지 않습니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from backend.core.config import settings
+from backend.core.logger import get_backend_logger
+from backend.utils.formatters import parse_amount
+
+logger = get_backend_logger("statement_store")
+
+# 재무제표 종류 (표시 순서)
+SJ_DIV_ORDER = ('BS', 'IS', 'CIS', 'CF', 'SCE')
+
+# 응답 금액 컬럼 -> 저장 컬럼
+AMOUNT_COLUMNS = (
+    ('thstrm_amount', 'thstrm'),
+    ('thstrm_add_amount', 'thstrm_add'),
+    ('frmtrm_amount', 'frmtrm'),
+    ('frmtrm_q_amount', 'frmtrm_q'),
+    ('frmtrm_add_amount', 'frmtrm_add'),
+    ('bfefrmtrm_amount', 'bfefrmtrm'),
+)
+
+# 표준계정코드가 없는 계정의 account_id
+NON_STANDARD_ACCOUNT_ID = '-표준계정코드 미사용-'
+
+
+class StatementFiling(NamedTuple):
+    """적재된 보고서 정보"""
+    rcept_no: str
+    lines: int
+    loaded_at: float
+
+
+def account_key(item: Dict) -> str:
+    """계정 식별자 (표준계정코드, 없으면 계정명 / 자본변동표는 구성요소까지)"""
+    account_id = item.get('account_id') or ''
+    key = account_id if account_id and account_id != NON_STANDARD_ACCOUNT_ID else item.get('account_nm', '')
+    detail = item.get('account_detail') or ''
+    if detail and detail != '-':
+        key = f"{key}|{detail}"
+    return key
+
+
+def normalize_statement(items: Iterable[Dict]) -> List[Dict]:
+    """fnlttSinglAcntAll 응답 항목을 저장 행으로 변환 (같은 재무제표에서 겹치는 계정 식별자에는 순번을 붙임)"""
+    rows = []
+    seen: Dict[tuple, int] = {}
+    for position, item in enumerate(items):
+        try:
+            ord_value = int(item.get('ord') or position)
+        except ValueError:
+            ord_value = position
+        key = account_key(item)
+        count = seen[(item.get('sj_div', ''), key)] = seen.get((item.get('sj_div', ''), key), 0) + 1
+        if count > 1:
+            key = f"{key}#{count}"
+        row = {
+            'sj_div': item.get('sj_div', ''),
+            'account_key': key,
+            'account_id': item.get('account_id') or '',
+            'account_nm': item.get('account_nm', ''),
+            'account_detail': item.get('account_detail') or '',
+            'ord': ord_value,
+            'currency': item.get('currency') or '',
+        }
+        for source, column in AMOUNT_COLUMNS:
+            row[column] = parse_amount(item.get(source))
+        rows.append(row)
+    return rows
+
+
+class StatementStore:
+    """SQLite 기반 전체 재무제표 저장소"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite 파일 경로
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS statement_filings (
+                corp_code TEXT NOT NULL,
+                bsns_year TEXT NOT NULL,
+                reprt_code TEXT NOT NULL,
+                fs_div TEXT NOT NULL,
+                rcept_no TEXT NOT NULL,
+                lines INTEGER NOT NULL,
+                loaded_at REAL NOT NULL,
+                PRIMARY KEY (corp_code, bsns_year, reprt_code, fs_div)
+            )
+        ''')
+        amount_columns = ', '.join(f'{column} REAL' for _, column in AMOUNT_COLUMNS)
+        self._conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS statement_lines (
+                corp_code TEXT NOT NULL,
+                bsns_year TEXT NOT NULL,
+                reprt_code TEXT NOT NULL,
+                fs_div TEXT NOT NULL,
+                sj_div TEXT NOT NULL,
+                account_key TEXT NOT NULL,
+                account_id TEXT NOT NULL,
+                account_nm TEXT NOT NULL,
+                account_detail TEXT NOT NULL,
+                ord INTEGER NOT NULL,
+                currency TEXT NOT NULL,
+                {amount_columns},
+                PRIMARY KEY (corp_code, bsns_year, reprt_code, fs_div, sj_div, account_key)
+            )
+        ''')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_statement_lines_account '
+            'ON statement_lines (corp_code, account_key, bsns_year)'
+        )
+
+    def filing(self, corp_code: str, bsns_year: str, reprt_code: str, fs_div: str) -> Optional[StatementFiling]:
+        """적재된 보고서 정보 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT rcept_no, lines, loaded_at FROM statement_filings '
+                'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ? AND fs_div = ?',
+                (corp_code, bsns_year, reprt_code, fs_div)
+            ).fetchone()
+        return StatementFiling(*row) if row else None
+
+    def replace_filing(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        reprt_code: str,
+        fs_div: str,
+        rcept_no: str,
+        rows: List[Dict]
+    ):
+        """보고서 하나의 계정 행을 통째로 교체"""
+        key = (corp_code, bsns_year, reprt_code, fs_div)
+        columns = ['sj_div', 'account_key', 'account_id', 'account_nm', 'account_detail', 'ord', 'currency']
+        columns += [column for _, column in AMOUNT_COLUMNS]
+        insert = (
+            f"INSERT OR REPLACE INTO statement_lines "
+            f"(corp_code, bsns_year, reprt_code, fs_div, {', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * (len(columns) + 4))})"
+        )
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.execute(
+                    'DELETE FROM statement_lines '
+                    'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ? AND fs_div = ?',
+                    key
+                )
+                self._conn.executemany(insert, [(*key, *(row[c] for c in columns)) for row in rows])
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO statement_filings '
+                    '(corp_code, bsns_year, reprt_code, fs_div, rcept_no, lines, loaded_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (*key, rcept_no, len(rows), time.time())
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def lines(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        reprt_code: str,
+        fs_div: str,
+        sj_divs: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """보고서의 계정 행 (재무제표 종류, 표시 순서대로)"""
+        sql = (
+            'SELECT * FROM statement_lines '
+            'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ? AND fs_div = ?'
+        )
+        params: List = [corp_code, bsns_year, reprt_code, fs_div]
+        if sj_divs is not None:
+            sj_divs = list(sj_divs)
+            sql += f" AND sj_div IN ({', '.join('?' * len(sj_divs))})"
+            params += sj_divs
+        sql += ' ORDER BY rowid'
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+        order = {sj_div: index for index, sj_div in enumerate(SJ_DIV_ORDER)}
+        rows.sort(key=lambda row: (order.get(row['sj_div'], len(order)), row['ord']))
+        return rows
+
+    def stats(self) -> dict:
+        """적재된 보고서/계정 행 수와 파일 크기"""
+        with self._lock:
+            filings = self._conn.execute('SELECT COUNT(*) FROM statement_filings').fetchone()[0]
+            lines = self._conn.execute('SELECT COUNT(*) FROM statement_lines').fetchone()[0]
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {'filings': filings, 'lines': lines, 'file_bytes': size}
+
+
+_store: Optional[StatementStore] = None
+_store_lock = threading.Lock()
+
+
+def get_statement_store() -> StatementStore:
+    """프로세스 공유 재무제표 저장소 (파일을 열 수 없으면 메모리 저장소 사용)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = StatementStore(settings.statement_store_path)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"재무제표 저장소를 열 수 없어 메모리 저장소 사용: {e}")
+                    _store = StatementStore(':memory:')
+    return _store
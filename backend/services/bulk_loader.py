@@ -0,0 +1,333 @@
+"""
+재무제표 일괄 자료 적재
+DART 재무정보 일괄다운로드 TSV(.txt, 또는 이를 담은 .zip)를 한 줄씩 읽어 Parquet 저장소에 씁니다.
+파일 전체를 메모리에 올리지 않고 batch_rows 행마다 Parquet 행 그룹으로 내보내며,
+계정은 화면/비율 계산과 같은 매핑(ACCOUNT_ID_MAP)으로 기본 표시명을 붙여 두고,
+보고서 하나에 같은 기본 표시명이 여러 행이면 계정 ID 순위가 가장 높은 행에만 남깁니다.
+"""
+import csv
+import io
+import os
+import re
+import time
+import zipfile
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
+from backend.core.logger import get_backend_logger
+from backend.repositories.bulk_store import (
+    AMOUNT_FIELDS,
+    BULK_SCHEMA,
+    partition_dir,
+    read_manifest,
+    write_manifest,
+)
+from backend.repositories.dart_repository import REPORT_NAMES
+from backend.utils.accounts import account_rank, base_display_name, normalize_account_id
+from backend.utils.formatters import parse_amount
+
+logger = get_backend_logger("bulk_loader")
+
+# Parquet 행 그룹 크기 (메모리에 쌓아 두는 최대 행 수)
+BATCH_ROWS = 50000
+
+# 일괄 자료 파일 인코딩
+DEFAULT_ENCODING = 'cp949'
+
+# 일괄 자료 헤더
+COL_STATEMENT = '재무제표종류'
+COL_STOCK_CODE = '종목코드'
+COL_CORP_NAME = '회사명'
+COL_MARKET = '시장구분'
+COL_SETTLE_DATE = '결산기준일'
+COL_REPORT = '보고서종류'
+COL_CURRENCY = '통화'
+COL_ACCOUNT_ID = '항목코드'
+COL_ACCOUNT_NM = '항목명'
+
+# 재무제표종류 값의 앞부분 -> sj_div (포괄손익계산서를 손익계산서보다 먼저 확인)
+SJ_DIV_PREFIXES = (
+    ('재무상태표', 'BS'),
+    ('포괄손익계산서', 'CIS'),
+    ('손익계산서', 'IS'),
+    ('현금흐름표', 'CF'),
+    ('자본변동표', 'SCE'),
+)
+
+REPORT_CODES = {name: code for code, name in REPORT_NAMES.items()}
+
+SOURCE_SUFFIXES = ('.txt', '.tsv')
+
+# 원본 파일을 바이너리 스트림으로 여는 함수
+SourceOpener = Callable[[], ContextManager[BinaryIO]]
+
+
+def statement_kind(value: str) -> Tuple[Optional[str], str]:
+    """재무제표종류 값 -> (sj_div, fs_div)
+
+    예: '재무상태표, 유동/비유동법-연결재무제표' -> ('BS', 'CFS')
+    """
+    value = value.strip()
+    sj_div = next((code for prefix, code in SJ_DIV_PREFIXES if value.startswith(prefix)), None)
+    return sj_div, 'CFS' if '연결' in value else 'OFS'
+
+
+def amount_columns(headers: List[str]) -> Dict[int, str]:
+    """금액 컬럼 위치 -> 금액 필드
+
+    분기/반기 손익은 '당기 1분기 3개월'(thstrm)과 '당기 1분기 누적'(thstrm_add)이 함께 오고
+    '전기'(전년도 전체)도 따로 옵니다. fnlttSinglAcntAll과 같게 전기는 같은 분기 값을 우선합니다.
+    """
+    columns: Dict[int, str] = {}
+    plain_frmtrm = None
+    for index, header in enumerate(h.strip() for h in headers):
+        if header.startswith('전전기'):
+            columns[index] = 'bfefrmtrm'
+        elif header.startswith('당기'):
+            columns[index] = 'thstrm_add' if '누적' in header else 'thstrm'
+        elif header.startswith('전기'):
+            if '누적' in header:
+                columns[index] = 'frmtrm_add'
+            elif '3개월' in header:
+                columns[index] = 'frmtrm'
+            else:
+                plain_frmtrm = index
+    if plain_frmtrm is not None and 'frmtrm' not in columns.values():
+        columns[plain_frmtrm] = 'frmtrm'
+    return columns
+
+
+def report_code(value: str, source_name: str) -> Optional[str]:
+    """보고서종류 값(없으면 파일 이름)에서 보고서 코드"""
+    for text in (value.strip(), source_name):
+        for name, code in REPORT_CODES.items():
+            if name in text:
+                return code
+    return None
+
+
+def source_year(source_name: str) -> Optional[str]:
+    """파일 이름 앞의 사업연도 (예: 2023_사업보고서_01_재무상태표_20240612.txt)"""
+    match = re.match(r'(\d{4})', os.path.basename(source_name))
+    return match.group(1) if match else None
+
+
+def iter_sources(directory: str) -> Iterator[Tuple[str, str, SourceOpener]]:
+    """디렉토리의 원본 파일 (이름, 파일 경로, 스트림 열기), zip은 안의 TSV 파일마다"""
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        if not entry.is_file():
+            continue
+        name = entry.name.lower()
+        if name.endswith(SOURCE_SUFFIXES):
+            yield entry.name, entry.path, lambda path=entry.path: open(path, 'rb')
+        elif name.endswith('.zip'):
+            with zipfile.ZipFile(entry.path) as archive:
+                members = [m for m in archive.namelist() if m.lower().endswith(SOURCE_SUFFIXES)]
+            for member in members:
+                yield (
+                    f"{entry.name}/{member}",
+                    entry.path,
+                    lambda path=entry.path, member=member: _open_member(path, member)
+                )
+
+
+def resolve_base_names(rows: List[Dict]) -> List[Dict]:
+    """보고서 하나의 계정 행 기본 표시명 정리
+
+    같은 기본 표시명이 여러 행이면 계정 ID 순위(account_rank)가 가장 높은 행(같으면 나중 행)만
+    기본 표시명을 쓰고, 나머지는 화면의 중복 계정처럼 '기본 표시명 (계정 ID)'로 바꿉니다.
+    (예: 당기순이익은 지배기업 소유주 귀속분만 '당기순이익')
+    """
+    best: Dict[str, Dict] = {}
+    for row in rows:
+        current = best.get(row['base_name'])
+        if current is None or account_rank(row['account_id']) <= account_rank(current['account_id']):
+            best[row['base_name']] = row
+    for row in rows:
+        if best[row['base_name']] is not row:
+            row['base_name'] = f"{row['base_name']} ({row['account_id']})"
+    return rows
+
+
+@contextmanager
+def _open_member(path: str, member: str):
+    with zipfile.ZipFile(path) as archive, archive.open(member) as stream:
+        yield stream
+
+
+class _PartitionWriter:
+    """파티션 하나의 Parquet 쓰기 (임시 파일에 쓰고 끝나면 교체)"""
+
+    def __init__(self, path: str, batch_rows: int):
+        self.path = path
+        self.tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._buffer: Dict[str, List] = {field.name: [] for field in BULK_SCHEMA}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._writer = pq.ParquetWriter(self.tmp_path, BULK_SCHEMA, compression='zstd')
+
+    def append(self, row: Dict):
+        for name, values in self._buffer.items():
+            values.append(row[name])
+        self.rows += 1
+        if len(self._buffer['stock_code']) >= self.batch_rows:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._writer.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def _flush(self):
+        if not self._buffer['stock_code']:
+            return
+        self._writer.write_table(pa.Table.from_pydict(self._buffer, schema=BULK_SCHEMA))
+        for values in self._buffer.values():
+            values.clear()
+
+
+class BulkLoader:
+    """일괄 자료 디렉토리를 Parquet 저장소로 적재"""
+
+    def __init__(self, root: str, batch_rows: int = BATCH_ROWS, encoding: str = DEFAULT_ENCODING):
+        """
+        Args:
+            root: 저장소 루트 디렉토리
+            batch_rows: Parquet 행 그룹 크기
+            encoding: 원본 파일 인코딩
+        """
+        self.root = root
+        self.batch_rows = batch_rows
+        self.encoding = encoding
+
+    def load_directory(self, source_dir: str, force: bool = False) -> Dict:
+        """디렉토리의 모든 원본 파일 적재 (크기/수정 시각이 같은 파일은 건너뜀)
+
+        Returns:
+            {'loaded': 적재한 파일 수, 'skipped': 건너뛴 파일 수, 'rows': 적재한 행 수}
+        """
+        os.makedirs(self.root, exist_ok=True)
+        manifest = read_manifest(self.root)
+        summary = {'loaded': 0, 'skipped': 0, 'rows': 0}
+
+        for name, path, opener in iter_sources(source_dir):
+            stat = os.stat(path)
+            previous = manifest.get(name)
+            if not force and previous and previous['size'] == stat.st_size and previous['mtime'] == stat.st_mtime:
+                summary['skipped'] += 1
+                continue
+
+            started = time.perf_counter()
+            rows, outputs = self.load_source(name, opener)
+            # 이번에 만들지 않은 이전 출력 파일 정리
+            for stale in set(previous.get('outputs', []) if previous else []) - set(outputs):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+            manifest[name] = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'rows': rows,
+                'outputs': outputs,
+                'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+            write_manifest(self.root, manifest)
+            summary['loaded'] += 1
+            summary['rows'] += rows
+            logger.info(f"일괄 자료 적재 {name}: {rows}행, {time.perf_counter() - started:.1f}초")
+
+        if not manifest:
+            write_manifest(self.root, manifest)
+        return summary
+
+    def load_source(self, name: str, opener: SourceOpener) -> Tuple[int, List[str]]:
+        """원본 파일 하나 적재
+
+        원본은 보고서(회사, 연결 구분, 연도, 보고서 종류)마다 행이 이어져 있으므로
+        이어진 행을 모아 기본 표시명을 정리한 뒤 씁니다.
+
+        Returns:
+            (적재한 행 수, 출력 Parquet 파일 경로 목록)
+        """
+        stem = re.sub(r'[^\w.-]+', '_', os.path.splitext(name)[0])
+        fallback_year = source_year(name)
+        writers: Dict[Tuple[str, str], _PartitionWriter] = {}
+        filing_key: Optional[Tuple[str, str, str, str]] = None
+        filing_rows: List[Dict] = []
+
+        def write_filing():
+            if not filing_rows:
+                return
+            key = filing_key[2:]
+            writer = writers.get(key)
+            if writer is None:
+                path = os.path.join(partition_dir(self.root, *key), f"{stem}.parquet")
+                writer = writers[key] = _PartitionWriter(path, self.batch_rows)
+            for row in resolve_base_names(filing_rows):
+                writer.append(row)
+            filing_rows.clear()
+
+        try:
+            with opener() as raw:
+                stream = io.TextIOWrapper(raw, encoding=self.encoding, errors='replace', newline='')
+                reader = csv.reader(stream, delimiter='\t', quoting=csv.QUOTE_NONE)
+                headers = next(reader, None)
+                if not headers:
+                    return 0, []
+                index = {header.strip(): i for i, header in enumerate(headers)}
+                amounts = amount_columns(headers)
+
+                def cell(values: List[str], column: str) -> str:
+                    i = index.get(column)
+                    return values[i].strip() if i is not None and i < len(values) else ''
+
+                for line_no, values in enumerate(reader, start=1):
+                    stock_code = cell(values, COL_STOCK_CODE).strip('[]')
+                    account_nm = cell(values, COL_ACCOUNT_NM)
+                    sj_div, fs_div = statement_kind(cell(values, COL_STATEMENT))
+                    reprt_code = report_code(cell(values, COL_REPORT), name)
+                    settle_date = cell(values, COL_SETTLE_DATE)
+                    bsns_year = fallback_year or settle_date[:4]
+                    if not (stock_code and account_nm and sj_div and reprt_code and bsns_year):
+                        continue
+
+                    account_id = normalize_account_id(cell(values, COL_ACCOUNT_ID))
+                    row = {
+                        'stock_code': stock_code,
+                        'corp_name': cell(values, COL_CORP_NAME),
+                        'market': cell(values, COL_MARKET),
+                        'settle_date': settle_date,
+                        'fs_div': fs_div,
+                        'sj_div': sj_div,
+                        'account_id': account_id,
+                        'account_nm': account_nm,
+                        'base_name': base_display_name(account_id, account_nm),
+                        'currency': cell(values, COL_CURRENCY),
+                        'ord': line_no,
+                        **dict.fromkeys(AMOUNT_FIELDS),
+                    }
+                    for i, field in amounts.items():
+                        if i < len(values):
+                            row[field] = parse_amount(values[i])
+
+                    key = (stock_code, fs_div, bsns_year, reprt_code)
+                    if key != filing_key:
+                        write_filing()
+                        filing_key = key
+                    filing_rows.append(row)
+                write_filing()
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+
+        for writer in writers.values():
+            writer.close()
+        return sum(w.rows for w in writers.values()), sorted(w.path for w in writers.values())
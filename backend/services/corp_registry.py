@@ -0,0 +1,550 @@
+"""
+회사 코드 레지스트리
+프로세스 전체에서 공유하는 DART 회사 목록입니다.
+시작 시 로컬 스냅샷 파일에서 로드하고, 백그라운드에서 주기적으로 갱신하며,
+새 목록은 스냅샷 객체 교체로 원자적으로 반영합니다.
+
+갱신 시 내용 해시가 같으면 아무것도 다시 만들지 않고, 바뀐 경우에도
+추가/삭제/변경된 회사만 테이블과 색인에 반영합니다.
+"""
+import asyncio
+import hashlib
+import heapq
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from backend.repositories.dart_repository import DARTRepository, CorpRecord
+from backend.repositories.corp_table import CorpTable
+from backend.repositories.dart_scheduler import background_priority
+from backend.services.corp_search_index import FuzzyMatcher, NgramIndex, PrefixIndex, HangulPattern
+from backend.utils.korean import compose, has_jamo, is_syllable
+from backend.core.config import settings
+from backend.core.logger import get_backend_logger
+
+logger = get_backend_logger("corp_registry")
+
+# 자동완성 캐시 (결과가 많은 짧은 접두어만)
+AUTOCOMPLETE_CACHE_TTL = 60
+AUTOCOMPLETE_CACHE_PREFIX_LEN = 2
+AUTOCOMPLETE_CACHE_SIZE = 4096
+
+# 부분 일치 결과가 없을 때 퍼지 매칭으로 돌려줄 최대 결과 수
+FUZZY_SEARCH_LIMIT = 50
+
+# 차분이 이 비율을 넘거나 삭제 행이 쌓이면 전체 재구성
+DELTA_MAX_RATIO = 0.05
+TOMBSTONE_MAX_RATIO = 0.1
+
+
+class CorpDelta(NamedTuple):
+    """이전 스냅샷 대비 회사 목록 차분 (행 번호 기준)"""
+    removed: List[int]
+    changed: Dict[int, CorpRecord]
+    added: List[CorpRecord]
+
+    @property
+    def size(self) -> int:
+        return len(self.removed) + len(self.changed) + len(self.added)
+
+
+def content_hash(records: Iterable[CorpRecord]) -> str:
+    """회사 목록 내용 해시 (다운로드 파일의 압축/시각 정보와 무관)"""
+    digest = hashlib.sha256()
+    for record in records:
+        digest.update(f"{record.corp_code}\t{record.corp_name}\t{record.stock_code}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def diff_records(table: CorpTable, records: List[CorpRecord]) -> CorpDelta:
+    """기존 테이블과 새 레코드의 고유번호 기준 차분"""
+    old_ids = table.live_ids()
+    changed: Dict[int, CorpRecord] = {}
+    added: List[CorpRecord] = []
+    seen = set()
+
+    for record in records:
+        if record.corp_code in seen:
+            continue
+        seen.add(record.corp_code)
+        doc_id = old_ids.get(record.corp_code)
+        if doc_id is None:
+            added.append(record)
+        elif table[doc_id] != record:
+            changed[doc_id] = record
+
+    removed = [doc_id for corp_code, doc_id in old_ids.items() if corp_code not in seen]
+    return CorpDelta(removed, changed, added)
+
+
+class CorpSnapshot:
+    """회사 목록 스냅샷 (불변, 통째로 교체됨)
+
+    회사 목록은 컬럼 테이블(CorpTable)에서 바로 읽습니다. 회사명 n-gram/접두어 색인은
+    테이블 파일에 저장된 posting list와 정렬 배열을 그대로 감싸므로 워커마다 다시 만들지 않고,
+    생성 시에는 종목코드 해시 색인만 만듭니다. 고유번호 조회는 테이블의 정렬 배열 이진 탐색을 사용합니다.
+    """
+
+    def __init__(self, table: CorpTable, loaded_at: float, previous: Optional['CorpSnapshot'] = None,
+                 delta: Optional[CorpDelta] = None):
+        """
+        Args:
+            table: 회사 목록 테이블
+            loaded_at: 마지막으로 DART 목록과 대조한 시각
+            previous: 색인을 물려받을 이전 스냅샷 (delta와 함께 지정)
+            delta: previous 대비 차분 (table은 previous.corp_list에 차분을 적용한 것)
+        """
+        self.corp_list = table
+        self.loaded_at = loaded_at
+
+        # 검색 순위 (상장회사 우선, 이름순)는 테이블에 미리 계산되어 있음
+        self.rank_order = table.rank_order
+        self.rank_of = table.rank_of
+        self.names_lower = table.names_lower
+        # 초성 문자열 (초성/자모 검색용)
+        self.chosung_names = table.chosung_names
+
+        if previous is None or delta is None:
+            self.by_stock_code: Dict[str, int] = {
+                stock_code: i for i, stock_code in enumerate(table.stock_codes) if stock_code
+            }
+        else:
+            self._apply_delta(previous, delta)
+
+        # 부분 문자열 검색 색인 (posting list는 테이블이 관리)
+        self.name_index = NgramIndex.from_postings(self.names_lower, table.gram_postings['name_lower'])
+        self.chosung_index = NgramIndex.from_postings(self.chosung_names, table.gram_postings['chosung_name'])
+
+        # 접두어 자동완성 색인 (정렬 배열은 테이블이 관리)
+        self.prefix_index = PrefixIndex(self.names_lower, table.name_lower_order)
+        self.chosung_prefix_index = PrefixIndex(self.chosung_names, table.chosung_order)
+
+        # 퍼지 매칭 색인 (검색 실패 시에만 필요하므로 처음 사용할 때 생성)
+        self._fuzzy_matcher: Optional[FuzzyMatcher] = None
+        self._fuzzy_lock = threading.Lock()
+
+    def _apply_delta(self, previous: 'CorpSnapshot', delta: CorpDelta):
+        """이전 스냅샷의 종목코드 색인에 바뀐 행만 반영 (이전 스냅샷 색인은 변경하지 않음)"""
+        old_table, table = previous.corp_list, self.corp_list
+        dropped = [*delta.removed, *delta.changed]
+        inserted = [*delta.changed, *range(old_table.count, table.count)]
+
+        self.by_stock_code = dict(previous.by_stock_code)
+        for doc_id in dropped:
+            self.by_stock_code.pop(old_table.stock_codes[doc_id], None)
+        for doc_id in inserted:
+            if table.stock_codes[doc_id]:
+                self.by_stock_code[table.stock_codes[doc_id]] = doc_id
+
+    def __len__(self) -> int:
+        return len(self.corp_list)
+
+    @property
+    def version(self) -> str:
+        """스냅샷 내용 버전 (페이지 커서 유효성 확인용)"""
+        content = self.corp_list.meta.get('content_hash')
+        return content[:16] if content else f"{self.loaded_at:.0f}"
+
+    @property
+    def listed_count(self) -> int:
+        """상장회사 수 (순위 순서의 앞부분이 상장회사)"""
+        count = getattr(self, '_listed_count', None)
+        if count is None:
+            stock_codes, order = self.corp_list.stock_codes, self.rank_order
+            lo, hi = 0, len(order)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if stock_codes[order[mid]]:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            count = self._listed_count = lo
+        return count
+
+    def rows(self, doc_ids: Sequence[int], fields: Sequence[str]) -> List[Dict[str, str]]:
+        """문서 ID의 선택 필드만 컬럼에서 바로 읽어 dict로 변환"""
+        columns = [
+            (field, self.corp_list.columns[field], field == 'stock_code')
+            for field in fields
+        ]
+        return [
+            {field: (column[i] or 'N/A') if is_stock else column[i] for field, column, is_stock in columns}
+            for i in doc_ids
+        ]
+
+    def find_by_corp_code(self, corp_code: str) -> Optional[CorpRecord]:
+        """고유번호로 조회"""
+        doc_id = self.corp_list.find_corp_code(corp_code)
+        return None if doc_id is None else self.corp_list[doc_id]
+
+    def find_by_stock_code(self, stock_code: str) -> Optional[CorpRecord]:
+        """종목코드로 조회"""
+        doc_id = self.by_stock_code.get(stock_code)
+        return None if doc_id is None else self.corp_list[doc_id]
+
+    @property
+    def fuzzy_matcher(self) -> FuzzyMatcher:
+        """정규화한 회사명의 퍼지 매칭 색인 (첫 검색 실패 때 생성, 이름과 posting list는 테이블 것을 사용)"""
+        if self._fuzzy_matcher is None:
+            with self._fuzzy_lock:
+                if self._fuzzy_matcher is None:
+                    names = self.corp_list.names_normalized
+                    index = NgramIndex.from_postings(names, self.corp_list.gram_postings['name_normalized'])
+                    self._fuzzy_matcher = FuzzyMatcher(names, rank_of=self.rank_of, index=index)
+        return self._fuzzy_matcher
+
+    def search(self, keyword: str) -> List[CorpRecord]:
+        """회사명 부분 일치 + 고유번호/종목코드 일치 검색 (순위 순서)
+
+        일치하는 회사가 없으면 편집 거리 기준 퍼지 매칭 결과를 돌려줍니다.
+        """
+        corp_list = self.corp_list
+        doc_ids, _ = self.search_ids_with_fuzzy(keyword)
+        return [corp_list[i] for i in doc_ids]
+
+    def search_ids_with_fuzzy(self, keyword: str) -> Tuple[List[int], bool]:
+        """search_ids() 후 결과가 없으면 퍼지 매칭
+
+        Returns:
+            (문서 ID 목록, 퍼지 매칭 결과 여부)
+        """
+        doc_ids = self.search_ids(keyword)
+        if doc_ids:
+            return doc_ids, False
+        matches = self.fuzzy_matcher.search(keyword, limit=FUZZY_SEARCH_LIMIT)
+        return [doc_id for doc_id, _ in matches], bool(matches)
+
+    def search_ids(self, keyword: str) -> List[int]:
+        """search()의 문서 ID 버전
+
+        단독 자모가 섞인 검색어("ㅅㅅㅈㅈ", "삼성ㅈ")는 초성/자모 패턴으로 찾고,
+        부분 일치 결과가 없으면 마지막 음절을 입력 중인 글자로 보고 다시 찾습니다.
+        """
+        query = compose(keyword.lower())
+
+        if has_jamo(query):
+            doc_ids = self._search_pattern(query)
+        else:
+            doc_ids = self.name_index.search(query)
+            if not doc_ids and is_syllable(query[-1]):
+                doc_ids = self._search_pattern(query)
+
+        # 회사명에 없는 고유번호/종목코드 일치는 순위 위치에 끼워 넣음
+        exact = {self.corp_list.find_corp_code(keyword), self.by_stock_code.get(keyword)} - {None}
+        exact -= set(doc_ids)
+        if exact:
+            doc_ids = sorted([*doc_ids, *exact], key=self.rank_of.__getitem__)
+        return doc_ids
+
+    def autocomplete(self, prefix: str, k: int, popularity: Mapping[str, int]) -> List[CorpRecord]:
+        """접두어 자동완성 상위 k개 (상장회사 우선, 인기도 내림차순, 이름순)
+
+        Args:
+            prefix: 입력 중인 접두어 (초성/자모 혼합 가능)
+            k: 최대 결과 수
+            popularity: 고유번호별 인기도 점수
+        """
+        corp_list = self.corp_list
+        query = compose(prefix.lower())
+        stock_codes, corp_codes, rank_of = corp_list.stock_codes, corp_list.corp_codes, self.rank_of
+
+        def score(doc_id: int) -> tuple:
+            return (not stock_codes[doc_id], -popularity.get(corp_codes[doc_id], 0), rank_of[doc_id])
+
+        if not has_jamo(query):
+            doc_ids = self.prefix_index.top_k(query, k, score)
+        else:
+            pattern = HangulPattern(query)
+            names = self.names_lower
+            candidates = [
+                i for i in self.chosung_prefix_index.range(pattern.chosung)
+                if pattern.matches_prefix(names[i])
+            ]
+            doc_ids = heapq.nsmallest(k, candidates, key=score)
+
+        return [corp_list[i] for i in doc_ids]
+
+    def _search_pattern(self, query: str) -> List[int]:
+        """초성/자모 혼합 패턴 검색 (순위 순서)"""
+        pattern = HangulPattern(query)
+
+        # 완전 일치 구간과 초성 문자열 중 후보가 적은 쪽 색인 사용
+        candidates = self.chosung_index.candidates(pattern.chosung)
+        if pattern.exact_run:
+            name_candidates = self.name_index.candidates(pattern.exact_run)
+            if len(name_candidates) < len(candidates):
+                candidates = name_candidates
+
+        names, chosung_names = self.names_lower, self.chosung_names
+        return [i for i in candidates if pattern.matches(names[i], chosung_names[i])]
+
+
+class CorpRegistry:
+    """프로세스 공유 회사 목록 레지스트리"""
+
+    def __init__(self, snapshot_path: str, refresh_interval_hours: float = 24):
+        """
+        Args:
+            snapshot_path: 스냅샷 파일 경로
+            refresh_interval_hours: 갱신 주기 (시간)
+        """
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval_hours * 3600
+        self._snapshot: Optional[CorpSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._last_refresh: Optional[Dict[str, Any]] = None
+
+        # 자동완성 순위용 조회 빈도 및 짧은 접두어 결과 캐시
+        self._popularity: Counter = Counter()
+        self._autocomplete_cache: Dict[tuple, tuple] = {}
+
+    @property
+    def snapshot(self) -> Optional[CorpSnapshot]:
+        """현재 스냅샷 (없으면 None)"""
+        return self._snapshot
+
+    def is_stale(self) -> bool:
+        """스냅샷이 없거나 갱신 주기가 지났는지 여부"""
+        snapshot = self._snapshot
+        return snapshot is None or time.time() - snapshot.loaded_at >= self.refresh_interval
+
+    def status(self) -> Dict[str, Any]:
+        """레지스트리 상태 (마지막 갱신 시각, 차분 크기 등)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {'loaded': False, 'last_refresh': self._last_refresh}
+
+        table = snapshot.corp_list
+        return {
+            'loaded': True,
+            'record_count': len(table),
+            'tombstones': table.tombstones,
+            'content_hash': table.meta.get('content_hash'),
+            'table_bytes': table.nbytes,
+            'loaded_at': snapshot.loaded_at,
+            'is_stale': self.is_stale(),
+            'last_refresh': self._last_refresh,
+        }
+
+    def load_from_file(self) -> bool:
+        """스냅샷 파일에서 회사 목록 로드
+
+        Returns:
+            로드 성공 여부
+        """
+        if not os.path.exists(self.snapshot_path):
+            logger.info(f"회사 목록 스냅샷 없음: {self.snapshot_path}")
+            return False
+
+        try:
+            table = CorpTable.open(self.snapshot_path)
+            loaded_at = os.path.getmtime(self.snapshot_path)
+            self._swap(CorpSnapshot(table, loaded_at))
+            logger.info(f"회사 목록 스냅샷 로드: {len(table)}개, {table.nbytes:,} bytes ({self.snapshot_path})")
+            return True
+        except Exception as e:
+            logger.warning(f"회사 목록 스냅샷 로드 실패: {e}")
+            return False
+
+    def refresh(self, dart_repo: DARTRepository) -> CorpSnapshot:
+        """DART에서 회사 목록을 새로 받아 스냅샷 교체
+
+        Args:
+            dart_repo: 다운로드에 사용할 DART 저장소
+
+        Returns:
+            새 스냅샷
+        """
+        with self._refresh_lock:
+            return self._refresh_locked(dart_repo)
+
+    def get_snapshot(self, dart_repo: DARTRepository, force_refresh: bool = False) -> CorpSnapshot:
+        """현재 스냅샷 조회 (스냅샷이 없을 때만 다운로드)
+
+        Args:
+            dart_repo: 스냅샷이 없을 때 사용할 DART 저장소
+            force_refresh: True면 즉시 새로 다운로드
+
+        Returns:
+            회사 목록 스냅샷
+        """
+        if force_refresh:
+            return self.refresh(dart_repo)
+
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._refresh_lock:
+            # 대기 중 다른 요청이 이미 로드했을 수 있음
+            if self._snapshot is None:
+                self._refresh_locked(dart_repo)
+            return self._snapshot
+
+    def get_corp_list(self, dart_repo: DARTRepository, force_refresh: bool = False) -> CorpTable:
+        """회사 목록 조회 (스냅샷이 없을 때만 다운로드)"""
+        return self.get_snapshot(dart_repo, force_refresh).corp_list
+
+    def record_hit(self, corp_code: str):
+        """회사 조회 빈도 기록 (자동완성 인기도)"""
+        self._popularity[corp_code] += 1
+
+    def autocomplete(self, dart_repo: DARTRepository, prefix: str, k: int) -> List[CorpRecord]:
+        """접두어 자동완성 상위 k개
+
+        결과가 많은 짧은 접두어는 AUTOCOMPLETE_CACHE_TTL 동안 캐시합니다.
+        """
+        snapshot = self.get_snapshot(dart_repo)
+        cache_key = (id(snapshot), prefix, k)
+        now = time.time()
+
+        cached = self._autocomplete_cache.get(cache_key)
+        if cached is not None and now - cached[0] < AUTOCOMPLETE_CACHE_TTL:
+            return cached[1]
+
+        results = snapshot.autocomplete(prefix, k, self._popularity)
+
+        if len(prefix) <= AUTOCOMPLETE_CACHE_PREFIX_LEN:
+            if len(self._autocomplete_cache) >= AUTOCOMPLETE_CACHE_SIZE:
+                self._autocomplete_cache.clear()
+            self._autocomplete_cache[cache_key] = (now, results)
+        return results
+
+    def find_by_stock_code(self, stock_code: str) -> Optional[CorpRecord]:
+        """종목코드로 회사 조회 (로드된 스냅샷만 사용, 다운로드하지 않음)"""
+        snapshot = self._snapshot
+        if snapshot is None or not stock_code:
+            return None
+        return snapshot.find_by_stock_code(stock_code)
+
+    async def run_refresh_loop(self, check_interval: float = 600):
+        """주기적 백그라운드 갱신 루프
+
+        서버에 설정된 DART_API_KEY로만 갱신하고, 설정이 없으면 백그라운드 갱신을 하지 않습니다
+        (사용자 요청의 API 키는 쓰지 않음).
+
+        Args:
+            check_interval: 갱신 필요 여부 확인 주기 (초)
+        """
+        api_key = settings.dart_api_key
+        if not api_key:
+            logger.info("DART_API_KEY 설정이 없어 회사 목록 백그라운드 갱신을 하지 않음")
+            return
+
+        while True:
+            try:
+                if self.is_stale():
+                    logger.info("회사 목록 백그라운드 갱신 시작")
+                    with background_priority():
+                        await asyncio.to_thread(self.refresh, DARTRepository(api_key))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"회사 목록 백그라운드 갱신 실패: {e}")
+
+            await asyncio.sleep(check_interval)
+
+    def _refresh_locked(self, dart_repo: DARTRepository) -> CorpSnapshot:
+        """다운로드 → 차분 계산 → 파일 저장 → 교체 (락 보유 상태에서 호출)
+
+        내용 해시가 같으면 기존 스냅샷을 유지하고, 차분이 작으면 바뀐 행만 반영하며,
+        그 외에는 전체를 다시 만듭니다.
+        """
+        start_time = time.time()
+        records = list(dart_repo.iter_corp_codes())
+        new_hash = content_hash(records)
+        meta = {'content_hash': new_hash, 'record_count': len(records)}
+        previous = self._snapshot
+
+        if previous is not None and previous.corp_list.meta.get('content_hash') == new_hash:
+            previous.loaded_at = time.time()
+            self._touch_snapshot_file()
+            self._record_refresh('unchanged', new_hash, len(records), None, start_time)
+            logger.info(f"회사 목록 변경 없음: {len(records)}개 ({time.time() - start_time:.2f}s)")
+            return previous
+
+        delta = None
+        if previous is not None:
+            old_table = previous.corp_list
+            delta = diff_records(old_table, records)
+            tombstones = old_table.tombstones + len(delta.removed)
+            if (delta.size > DELTA_MAX_RATIO * max(len(old_table), 1)
+                    or tombstones > TOMBSTONE_MAX_RATIO * (old_table.count + len(delta.added))):
+                delta = None
+
+        if delta is not None:
+            table = self._store_table(CorpTable.build_delta(
+                previous.corp_list, delta.removed, delta.changed, delta.added, meta
+            ))
+            snapshot = CorpSnapshot(table, time.time(), previous, delta)
+            mode = 'delta'
+        else:
+            table = self._store_table(CorpTable.build(records, meta))
+            snapshot = CorpSnapshot(table, time.time())
+            mode = 'full'
+        self._swap(snapshot)
+
+        self._record_refresh(mode, new_hash, len(records), delta, start_time)
+        diff_text = (
+            f", 추가 {len(delta.added)} / 삭제 {len(delta.removed)} / 변경 {len(delta.changed)}"
+            if delta is not None else ""
+        )
+        logger.info(
+            f"회사 목록 갱신 완료 ({mode}): {len(records)}개{diff_text} ({time.time() - start_time:.2f}s)"
+        )
+        return snapshot
+
+    def _record_refresh(self, mode: str, new_hash: str, count: int, delta: Optional[CorpDelta],
+                        start_time: float):
+        """마지막 갱신 결과 기록"""
+        self._last_refresh = {
+            'mode': mode,
+            'refreshed_at': time.time(),
+            'duration_seconds': round(time.time() - start_time, 3),
+            'content_hash': new_hash,
+            'record_count': count,
+            'diff': None if delta is None else {
+                'added': len(delta.added),
+                'removed': len(delta.removed),
+                'changed': len(delta.changed),
+                'size': delta.size,
+            },
+        }
+
+    def _touch_snapshot_file(self):
+        """변경 없는 갱신도 파일 시각에 반영 (재시작 시 갱신 주기 계산용)"""
+        try:
+            os.utime(self.snapshot_path)
+        except OSError:
+            pass
+
+    def _store_table(self, data: bytes) -> CorpTable:
+        """스냅샷 파일 저장 후 mmap으로 열기 (저장 실패 시 메모리 테이블 사용)"""
+        try:
+            CorpTable.write(self.snapshot_path, data)
+            return CorpTable.open(self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"회사 목록 스냅샷 저장 실패, 메모리 테이블 사용: {e}")
+            return CorpTable(data)
+
+    def _swap(self, snapshot: CorpSnapshot):
+        """스냅샷 교체 (참조 대입 한 번으로 원자적)"""
+        self._snapshot = snapshot
+
+
+_registry: Optional[CorpRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_corp_registry() -> CorpRegistry:
+    """프로세스 공유 레지스트리 반환"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CorpRegistry(
+                    settings.corp_snapshot_path,
+                    settings.corp_refresh_interval_hours
+                )
+    return _registry
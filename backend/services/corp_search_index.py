@@ -0,0 +1,261 @@
+"""
+회사명 검색 색인
+요청마다 전체 목록을 훑지 않도록 합니다. 레지스트리 스냅샷의 n-gram 역색인은
+회사 목록 테이블 파일에 저장된 것을 그대로 쓰고, 그 외 목록은 생성 시 한 번 만듭니다.
+"""
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+from backend.repositories.corp_table import SortedView, index_grams
+from backend.utils.korean import decompose, is_consonant, is_syllable, normalize_name, to_chosung
+
+# 퍼지 매칭 후보 수 상한 (posting list별), 최소 검색어 길이
+FUZZY_MAX_POSTINGS = 2000
+FUZZY_MIN_QUERY_LEN = 2
+
+
+def _ngrams(text: str, n: int) -> Set[str]:
+    """문자열의 n-gram 집합"""
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NgramIndex:
+    """부분 문자열 검색용 n-gram 역색인
+
+    문서마다 1-gram과 2-gram(한글 음절/영문 문자 단위)을 색인합니다.
+    posting list는 순위 순서로 쌓이므로, 가장 짧은 posting list의 후보를
+    차례로 검증하기만 해도 결과가 이미 순위대로 정렬되어 나옵니다.
+    """
+
+    def __init__(self, texts: Sequence[str], order: Iterable[int]):
+        """
+        Args:
+            texts: 문서 ID별 정규화된 문자열
+            order: 순위 순서로 나열한 문서 ID
+        """
+        self._texts = texts
+        self._postings: Dict[str, array] = {}
+
+        for doc_id in order:
+            for gram in index_grams(texts[doc_id]):
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = array('I')
+                postings.append(doc_id)
+
+    @classmethod
+    def from_postings(cls, texts: Sequence[str], postings: Mapping[str, Sequence[int]]) -> 'NgramIndex':
+        """이미 만든 posting list로 색인 생성 (예: 테이블 파일의 GramPostings, 복사하지 않음)
+
+        Args:
+            texts: 문서 ID별 정규화된 문자열
+            postings: gram → 순위 순서 문서 ID (get()으로 조회)
+        """
+        index = cls.__new__(cls)
+        index._texts = texts
+        index._postings = postings
+        return index
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def postings(self, gram: str) -> Sequence[int]:
+        """gram의 posting list (순위 순서)"""
+        return self._postings.get(gram, ())
+
+    def candidates(self, query: str) -> Sequence[int]:
+        """query를 포함할 수 있는 후보 (가장 짧은 posting list, 순위 순서)"""
+        if not query:
+            return ()
+
+        grams = _ngrams(query, 2) if len(query) >= 2 else {query}
+        shortest = None
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                return ()
+            if shortest is None or len(postings) < len(shortest):
+                shortest = postings
+        return shortest
+
+    def search(self, query: str) -> List[int]:
+        """query를 포함하는 문서 ID 목록 (순위 순서)"""
+        candidates = self.candidates(query)
+
+        # 2글자 이하는 posting list 자체가 정답, 그 이상은 실제 부분 문자열 여부로 검증
+        if len(query) <= 2:
+            return list(candidates)
+        texts = self._texts
+        return [doc_id for doc_id in candidates if query in texts[doc_id]]
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """편집 거리 (max_distance를 넘으면 계산을 멈추고 max_distance + 1 반환)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(cost)
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[-1], max_distance + 1)
+
+
+class FuzzyMatcher:
+    """편집 거리를 허용하는 회사명 매칭
+
+    정규화한 이름의 n-gram 색인으로 후보를 고른 뒤 편집 거리로 검증합니다.
+    편집 한 번은 서로 다른 2-gram을 최대 2개(1-gram은 1개) 없애므로, 거리 k 이내의
+    이름은 검색어 gram 중 최소 len(grams) - 2k개를 공유해야 하고, posting list가
+    짧은 순으로 앞의 2k + 1개 중 하나에는 반드시 들어 있습니다.
+    후보는 그 목록들에서만 (목록별 FUZZY_MAX_POSTINGS개까지) 뽑으므로
+    전체 목록 크기와 무관하게 검증 횟수가 제한됩니다.
+    """
+
+    def __init__(self, texts: Sequence[str], order: Optional[Iterable[int]] = None,
+                 rank_of: Optional[Sequence[int]] = None, index: Optional[NgramIndex] = None):
+        """
+        Args:
+            texts: 문서 ID별 정규화한 회사명 (normalize_name 결과, 복사하지 않고 그대로 참조)
+            order: 색인할 문서 ID (순위 순서, 없으면 전체)
+            rank_of: 문서 ID → 순위 (같은 거리일 때 정렬용, 없으면 문서 ID 순)
+            index: 이미 만든 texts의 n-gram 색인 (있으면 order는 무시하고 그대로 사용)
+        """
+        self._texts = texts
+        self._rank_of = rank_of
+        if index is None:
+            index = NgramIndex(texts, range(len(texts)) if order is None else order)
+        self._index = index
+
+    @staticmethod
+    def default_distance(length: int) -> int:
+        """검색어 길이별 허용 편집 거리"""
+        return 1 if length < 6 else 2
+
+    def search(self, query: str, max_distance: Optional[int] = None, limit: int = 10) -> List[tuple]:
+        """편집 거리 이내의 이름 (거리, 순위 순서)
+
+        Args:
+            query: 검색어
+            max_distance: 허용 편집 거리 (없으면 검색어 길이로 결정)
+            limit: 최대 결과 수
+
+        Returns:
+            [(문서 ID, 편집 거리), ...]
+        """
+        q = normalize_name(query)
+        if len(q) < FUZZY_MIN_QUERY_LEN:
+            return []
+        k = self.default_distance(len(q)) if max_distance is None else max_distance
+
+        # 2-gram 필터가 성립하지 않을 만큼 짧으면 1-gram 사용
+        grams = _ngrams(q, 2)
+        need = len(grams) - 2 * k
+        if need <= 0:
+            grams = _ngrams(q, 1)
+            need = len(grams) - k
+            if need <= 0:
+                return []
+
+        lists = sorted((self._index.postings(gram) for gram in grams), key=len)
+        candidates: Set[int] = set()
+        for postings in lists[:len(lists) - need + 1]:
+            candidates.update(postings[:FUZZY_MAX_POSTINGS])
+
+        texts, rank_of = self._texts, self._rank_of
+        matches = []
+        for doc_id in candidates:
+            text = texts[doc_id]
+            if abs(len(text) - len(q)) > k or sum(gram in text for gram in grams) < need:
+                continue
+            distance = bounded_levenshtein(q, text, k)
+            if distance <= k:
+                matches.append((distance, rank_of[doc_id] if rank_of is not None else doc_id, doc_id))
+
+        matches.sort()
+        return [(doc_id, distance) for distance, _, doc_id in matches[:limit]]
+
+
+class PrefixIndex:
+    """정렬 배열 기반 접두어 색인 (자동완성용)
+
+    문자열을 정렬해 두고 이진 탐색으로 접두어 구간을 찾은 뒤,
+    구간 안에서 점수가 가장 좋은 k개만 힙으로 골라냅니다.
+    """
+
+    def __init__(self, texts: Sequence[str], order: Optional[Sequence[int]] = None):
+        """
+        Args:
+            texts: 문서 ID별 정규화된 문자열
+            order: texts 기준 정렬 순서 (없으면 새로 정렬)
+        """
+        if order is None:
+            order = array('I', sorted(range(len(texts)), key=texts.__getitem__))
+        self._keys = SortedView(texts, order)
+        self._ids = order
+
+    def range(self, prefix: str) -> Sequence[int]:
+        """prefix로 시작하는 문서 ID 구간"""
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + '\U0010ffff', lo)
+        return self._ids[lo:hi]
+
+    def top_k(self, prefix: str, k: int, key: Callable[[int], tuple]) -> List[int]:
+        """prefix로 시작하는 문서 중 key가 가장 작은 k개 (key 순서)"""
+        return heapq.nsmallest(k, self.range(prefix), key=key)
+
+
+class HangulPattern:
+    """음절/초성 혼합 검색 패턴 ("ㅅㅅ전ㅈ", "삼성저" 등)
+
+    - 단독 자음은 해당 위치 음절의 초성과 비교
+    - 마지막 음절은 입력 중인 글자로 보고 자모 접두어로 비교 ("저" → "전", "젅" → "전자")
+    - 그 외 문자는 그대로 비교
+    """
+
+    def __init__(self, query: str):
+        self.query = query
+        self.chosung = to_chosung(query)
+        self.partial_last = is_syllable(query[-1])
+        self._last_jamo = decompose(query[-1]) if self.partial_last else ''
+
+        # 후보 추출에 쓸 가장 긴 완전 일치 구간 (단독 자음, 입력 중인 마지막 음절 제외)
+        exact_end = len(query) - 1 if self.partial_last else len(query)
+        runs = ''.join(' ' if is_consonant(ch) else ch for ch in query[:exact_end]).split(' ')
+        self.exact_run = max(runs, key=len)
+
+    def matches(self, name: str, name_chosung: str) -> bool:
+        """회사명(소문자)과 그 초성 문자열이 패턴과 일치하는지 여부"""
+        start = name_chosung.find(self.chosung)
+        while start != -1:
+            if self._matches_at(name, start):
+                return True
+            start = name_chosung.find(self.chosung, start + 1)
+        return False
+
+    def matches_prefix(self, name: str) -> bool:
+        """회사명이 패턴으로 시작하는지 여부 (초성 접두어는 이미 확인된 상태)"""
+        return self._matches_at(name, 0)
+
+    def _matches_at(self, name: str, start: int) -> bool:
+        last = len(self.query) - 1
+        for k, q in enumerate(self.query):
+            if is_consonant(q):
+                continue  # 초성은 name_chosung.find()로 이미 확인됨
+            if k == last and self.partial_last:
+                if not decompose(name[start + k:start + k + 2]).startswith(self._last_jamo):
+                    return False
+            elif name[start + k] != q:
+                return False
+        return True
@@ -1,33 +1,45 @@
-from typing import List, Dict, Optional
-from backend.repositories.dart_repository import DARTRepository
+import asyncio
+from functools import partial
+from typing import List, Dict, Optional, Tuple
+from backend.repositories.dart_repository import DARTRepository, REPRT_ANNUAL
+from backend.repositories.async_dart_repository import AsyncDARTRepository
 from backend.repositories.krx_repository import KRXRepository
+from backend.repositories.bulk_store import get_bulk_store
 from backend.core.exceptions import CompanyNotFoundException
 from backend.services.unlisted_financial_service import UnlistedFinancialService
+from backend.services.ratio_engine import calc_ratios
+from backend.services.statement_service import StatementService
+from backend.services.timeseries_service import PERIODS_PER_FILING, plan_filing_years, stitch_filings
+from backend.services.ttm_service import TTMService
+from backend.services.corp_registry import get_corp_registry
+from backend.utils.accounts import base_display_name
+from backend.utils.concurrency import gather_bounded
+from backend.utils.pagination import DEFAULT_PAGE_SIZE, page_slice, parse_fields, query_key
 from backend.core.llm.upstage import UpstageProvider
 from backend.core.config import settings
+from backend.core.logger import get_backend_logger
 from collections import Counter
 
+logger = get_backend_logger("dart_service")
 
-# 계정 ID 매핑
-ACCOUNT_ID_MAP = {
-    'ifrs-full_Assets': '자산총계',
-    'ifrs-full_Liabilities': '부채총계',
-    'ifrs-full_Equity': '자본총계',
-    'ifrs-full_Revenue': '매출액',
-    'dart_OperatingIncomeLoss': '영업이익',
-    'ifrs-full_ProfitLoss': '당기순이익',
-    'dart_ProfitLossAttributableToOwnersOfParent': '당기순이익',
-    'ifrs-full_ProfitLossAttributableToOwnersOfParent': '당기순이익',
-}
+
+# 목록/검색 응답에서 선택 가능한 필드
+COMPANY_FIELDS = ('corp_code', 'corp_name', 'stock_code')
+
+# 재무제표 구분 (연결, 별도) 및 둘 다 반환하는 모드
+FS_DIVS = ('CFS', 'OFS')
+FS_DIV_ALL = 'ALL'
 
 
 class DARTService:
     """DART 비즈니스 로직"""
 
     def __init__(self, api_key: Optional[str] = None):
-        self.dart_repo = DARTRepository(api_key)
+        self.dart_repo = AsyncDARTRepository(api_key)
+        # 회사 목록 레지스트리 다운로드용 (백그라운드 스레드에서 동기 호출)
+        self.corp_repo = DARTRepository(api_key)
         self.krx_repo = KRXRepository()
-        self._corp_list_cache = None
+        self.corp_registry = get_corp_registry()
 
         # 비상장 기업 처리를 위한 서비스
         if settings.upstage_api_key:
@@ -36,11 +48,79 @@ class DARTService:
         else:
             self.unlisted_service = None
     
+    async def ensure_corp_snapshot(self, force_refresh: bool = False):
+        """회사 목록 스냅샷 준비 (다운로드가 필요하면 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+        if force_refresh or self.corp_registry.snapshot is None:
+            await asyncio.to_thread(self.corp_registry.get_snapshot, self.corp_repo, force_refresh)
+    
     def get_corp_list(self, force_refresh: bool = False) -> List[Dict]:
-        """회사 목록 조회 (캐시 사용)"""
-        if self._corp_list_cache is None or force_refresh:
-            self._corp_list_cache = self.dart_repo.download_corp_codes()
-        return self._corp_list_cache
+        """회사 목록 조회 (프로세스 공유 레지스트리 사용)"""
+        records = self.corp_registry.get_corp_list(self.corp_repo, force_refresh=force_refresh)
+        return [record._asdict() for record in records]
+    
+    def list_companies_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[str] = None,
+        listed_only: bool = False,
+        force_refresh: bool = False
+    ) -> Dict:
+        """회사 목록 한 페이지 조회 (상장회사 우선, 이름순)
+        
+        Args:
+            cursor: 이전 페이지의 next_cursor
+            limit: 페이지 크기 (최대 MAX_PAGE_SIZE)
+            fields: 쉼표로 구분한 반환 필드 (없으면 전체)
+            listed_only: 상장회사만
+            force_refresh: 캐시 무시하고 새로 다운로드
+            
+        Returns:
+            {'companies', 'total', 'limit', 'next_cursor'}
+        """
+        selected = parse_fields(fields, COMPANY_FIELDS)
+        snapshot = self.corp_registry.get_snapshot(self.corp_repo, force_refresh=force_refresh)
+        
+        # 순위 순서는 상장회사가 앞에 모여 있으므로 상장회사 필터는 앞부분 구간
+        doc_ids = snapshot.rank_order
+        total = snapshot.listed_count if listed_only else len(doc_ids)
+        start, end, next_cursor = page_slice(
+            total, cursor, limit, snapshot.version, query_key('list', listed_only)
+        )
+        return {
+            'companies': snapshot.rows(doc_ids[start:end], selected),
+            'total': total,
+            'limit': end - start,
+            'next_cursor': next_cursor
+        }
+    
+    def search_companies_page(
+        self,
+        keyword: str,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[str] = None,
+        listed_only: bool = False
+    ) -> Dict:
+        """회사 검색 결과 한 페이지 조회 (인자는 list_companies_page()와 동일)"""
+        selected = parse_fields(fields, COMPANY_FIELDS)
+        snapshot = self.corp_registry.get_snapshot(self.corp_repo)
+        
+        doc_ids, fuzzy = snapshot.search_ids_with_fuzzy(keyword) if keyword else ([], False)
+        if listed_only:
+            stock_codes = snapshot.corp_list.stock_codes
+            doc_ids = [i for i in doc_ids if stock_codes[i]]
+        
+        start, end, next_cursor = page_slice(
+            len(doc_ids), cursor, limit, snapshot.version, query_key('search', keyword, listed_only)
+        )
+        return {
+            'companies': snapshot.rows(doc_ids[start:end], selected),
+            'total': len(doc_ids),
+            'limit': end - start,
+            'next_cursor': next_cursor,
+            'fuzzy': fuzzy
+        }
     
     def search_companies(self, keyword: str) -> List[Dict]:
         """회사 검색
@@ -54,87 +134,91 @@ class DARTService:
         if not keyword:
             return []
         
-        corp_list = self.get_corp_list()
-        
-        results = [
-            c for c in corp_list
-            if keyword.lower() in c['corp_name'].lower()
-            or keyword == c['corp_code']
-            or (c['stock_code'] != 'N/A' and keyword == c['stock_code'])
-        ]
+        # 색인 검색 결과는 이미 상장회사 우선, 이름순으로 정렬되어 있음 (일치가 없으면 퍼지 매칭)
+        snapshot = self.corp_registry.get_snapshot(self.corp_repo)
+        return [c._asdict() for c in snapshot.search(keyword)]
+    
+    def autocomplete_companies(self, prefix: str, k: int = 10) -> List[Dict]:
+        """회사명 접두어 자동완성
         
-        # 상장회사 우선, 이름순 정렬
-        results.sort(key=lambda c: (0 if c['stock_code'] != 'N/A' else 1, c['corp_name']))
+        Args:
+            prefix: 입력 중인 회사명 접두어
+            k: 최대 결과 수
+            
+        Returns:
+            상위 k개 회사 (상장회사 우선, 조회 빈도순)
+        """
+        if not prefix:
+            return []
         
-        return results
+        return [c._asdict() for c in self.corp_registry.autocomplete(self.corp_repo, prefix, k)]
     
     def get_company_by_code(self, corp_code: str) -> Dict:
         """고유번호로 회사 정보 조회"""
-        corp_list = self.get_corp_list()
+        snapshot = self.corp_registry.get_snapshot(self.corp_repo)
+        corp = snapshot.find_by_corp_code(corp_code)
+        
+        if corp is None:
+            raise CompanyNotFoundException(f"회사를 찾을 수 없습니다: {corp_code}")
+        
+        self.corp_registry.record_hit(corp_code)
+        return corp._asdict()
+    
+    def get_company_by_stock_code(self, stock_code: str) -> Dict:
+        """종목코드로 회사 정보 조회"""
+        snapshot = self.corp_registry.get_snapshot(self.corp_repo)
+        corp = snapshot.find_by_stock_code(stock_code)
         
-        for corp in corp_list:
-            if corp['corp_code'] == corp_code:
-                return corp
+        if corp is None:
+            raise CompanyNotFoundException(f"회사를 찾을 수 없습니다: {stock_code}")
         
-        raise CompanyNotFoundException(f"회사를 찾을 수 없습니다: {corp_code}")
+        return corp._asdict()
     
     async def get_financial_data(
         self,
         corp_code: str,
         bsns_year: str,
-        fs_div: str = 'CFS'
+        fs_div: str = 'CFS',
+        reprt_code: str = REPRT_ANNUAL
     ) -> Dict:
         """재무정보 조회 및 가공
 
         Args:
             corp_code: 기업 고유번호
             bsns_year: 사업연도
-            fs_div: 재무제표 구분
+            fs_div: 재무제표 구분 (CFS, OFS, ALL: 연결/별도 모두)
+            reprt_code: 보고서 코드 (11011: 사업, 11012: 반기, 11013: 1분기, 11014: 3분기)
 
         Returns:
-            가공된 재무 데이터
+            가공된 재무 데이터 (ALL이면 statements에 구분별 items/ratios 포함)
         """
         # 회사 정보 조회
         company = self.get_company_by_code(corp_code)
         is_listed = company['stock_code'] != 'N/A'
 
-        # 상장 기업: 기존 로직
+        # 상장 기업: 연결/별도를 한 번에 받아 요청한 구분만 가공
         if is_listed:
-            # 재무 데이터 조회
-            raw_data = self.dart_repo.get_financial_data(corp_code, bsns_year, fs_div)
+            stored = await self._bulk_statements([company['stock_code']], bsns_year, reprt_code)
+            statements = stored.get(company['stock_code'])
+            if not statements:
+                statements = await self.dart_repo.get_financial_statements(corp_code, bsns_year, reprt_code)
+            return self._listed_result(company, bsns_year, fs_div, statements, reprt_code)
 
-            if not raw_data:
-                # 빈 결과 반환 (데이터 없음)
+        # 비상장 기업: 문서 파싱 (fs_div 무시)
+        else:
+            if reprt_code != REPRT_ANNUAL:
                 return {
                     'corp_code': corp_code,
                     'corp_name': company['corp_name'],
                     'stock_code': company['stock_code'],
                     'bsns_year': bsns_year,
-                    'fs_div': fs_div,
+                    'fs_div': 'N/A',
                     'items': [],
                     'ratios': {},
-                    'is_listed': True
+                    'is_listed': False,
+                    'error': '비상장 기업은 사업연도(감사보고서) 재무정보만 조회할 수 있습니다.'
                 }
 
-            # 데이터 가공
-            processed = self._prepare_data(raw_data)
-
-            # 재무비율 계산
-            ratios = self._calc_ratios(processed)
-
-            return {
-                'corp_code': corp_code,
-                'corp_name': company['corp_name'],
-                'stock_code': company['stock_code'],
-                'bsns_year': bsns_year,
-                'fs_div': fs_div,
-                'items': processed,
-                'ratios': ratios,
-                'is_listed': True
-            }
-
-        # 비상장 기업: 문서 파싱 (fs_div 무시)
-        else:
             if not self.unlisted_service:
                 return {
                     'corp_code': corp_code,
@@ -173,7 +257,7 @@ class DARTService:
                 processed = self._prepare_data(raw_data)
 
                 # 재무비율 계산
-                ratios = self._calc_ratios(processed)
+                ratios = calc_ratios(processed)
 
                 return {
                     'corp_code': corp_code,
@@ -200,72 +284,230 @@ class DARTService:
                     'error': f'비상장 기업 재무정보 조회 실패: {str(e)}'
                 }
     
+    async def get_ttm_financial_data(self, corp_code: str, fs_div: str = 'CFS') -> Dict:
+        """최근 4분기 합산(TTM) 재무정보 (상장 기업 전용)
+
+        items는 최근 기간 TTM을 당기, 1년/2년 전 같은 분기 TTM을 전기/전전기 금액으로 담아
+        사업보고서 재무정보와 같은 방식으로 비율을 계산합니다.
+        """
+        company = self.get_company_by_code(corp_code)
+        ttm = await TTMService(self.dart_repo).get_ttm(corp_code, fs_div)
+        statement = self._build_statement(ttm['items'])
+        return {
+            **ttm,
+            'corp_name': company['corp_name'],
+            'stock_code': company['stock_code'],
+            'items': statement['items'],
+            'ratios': statement['ratios'],
+            'is_listed': True
+        }
+    
+    async def get_full_statements(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        fs_div: str = 'CFS',
+        reprt_code: str = REPRT_ANNUAL
+    ) -> Dict:
+        """전체 재무제표 (저장소 기준, 모든 계정/재무제표 종류)와 재무비율"""
+        company = self.get_company_by_code(corp_code)
+        statement = await StatementService(self.dart_repo).get_statements(corp_code, bsns_year, fs_div, reprt_code)
+        ratios = self._build_statement(statement['items'])['ratios']
+        return {
+            **statement,
+            'corp_name': company['corp_name'],
+            'stock_code': company['stock_code'],
+            'financial_statements': {**statement['financial_statements'], 'ratios': ratios},
+            'ratios': ratios
+        }
+    
+    async def get_financial_data_matrix(
+        self,
+        corp_codes: List[str],
+        years: List[str],
+        fs_div: str = 'CFS',
+        reprt_code: str = REPRT_ANNUAL
+    ) -> Tuple[Dict[str, Dict[str, Dict]], List[Dict]]:
+        """여러 회사 x 여러 연도 재무정보 동시 조회
+
+        상장 기업은 연도별 묶음 요청 하나로, 비상장 기업은 (회사, 연도)마다 하나의 작업으로 나눠
+        최대 comparison_max_concurrency개를 동시에 실행하고 작업마다 comparison_task_timeout초
+        제한을 둡니다. 실패하거나 시간을 넘긴 작업은 건너뛰고 나머지 결과를 반환합니다.
+
+        Returns:
+            ({corp_code: {연도: get_financial_data()와 같은 형식의 결과}},
+             [{'corp_code', 'bsns_year', 'error'}, ...] 실패 목록)
+        """
+        companies = {corp_code: self.get_company_by_code(corp_code) for corp_code in corp_codes}
+        listed = [code for code, company in companies.items() if company['stock_code'] != 'N/A']
+        unlisted = [code for code in companies if code not in listed]
+
+        async def fetch_listed(year: str) -> Dict[str, Dict]:
+            stored = await self._bulk_statements([companies[code]['stock_code'] for code in listed], year, reprt_code)
+            batch = {code: stored[companies[code]['stock_code']] for code in listed if companies[code]['stock_code'] in stored}
+            missing = [code for code in listed if code not in batch]
+            if missing:
+                batch.update(await self.dart_repo.get_financial_statements_batch(missing, year, reprt_code))
+            return {
+                corp_code: self._listed_result(
+                    companies[corp_code], year, fs_div, batch.get(corp_code, {}), reprt_code
+                )
+                for corp_code in listed
+            }
+
+        async def fetch_one(corp_code: str, year: str) -> Dict[str, Dict]:
+            return {corp_code: await self.get_financial_data(corp_code, year, fs_div, reprt_code)}
+
+        # (대상 회사, 연도, 작업)
+        jobs = []
+        for year in years:
+            if listed:
+                jobs.append((listed, year, partial(fetch_listed, year)))
+            jobs.extend(([corp_code], year, partial(fetch_one, corp_code, year)) for corp_code in unlisted)
+
+        outcomes = await gather_bounded(
+            [job for _, _, job in jobs],
+            settings.comparison_max_concurrency,
+            settings.comparison_task_timeout
+        )
+
+        results: Dict[str, Dict[str, Dict]] = {corp_code: {} for corp_code in companies}
+        failures: List[Dict] = []
+        for (targets, year, _), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, BaseException):
+                error = '제한 시간 초과' if isinstance(outcome, asyncio.TimeoutError) else str(outcome)
+                failures.extend({'corp_code': code, 'bsns_year': year, 'error': error} for code in targets)
+                continue
+            for corp_code, result in outcome.items():
+                results[corp_code][year] = result
+                if result.get('error'):
+                    failures.append({'corp_code': corp_code, 'bsns_year': year, 'error': result['error']})
+        return results, failures
+
+    async def get_comparison_filings(
+        self,
+        corp_codes: List[str],
+        bsns_year: str,
+        fs_div: str = 'CFS',
+        reprt_code: str = REPRT_ANNUAL,
+        window: int = PERIODS_PER_FILING
+    ) -> Tuple[Dict[str, Dict[str, Dict]], List[Dict]]:
+        """여러 회사 비교용 재무정보 (bsns_year부터 window개 연도)
+
+        보고서 하나에 당기/전기/전전기 금액이 함께 오므로 plan_filing_years로 필요한 사업연도만
+        조회합니다 (보통 bsns_year 보고서 하나). 아직 제출되지 않은 보고서 등으로 빈 연도가 남은
+        회사만 stitch_filings로 채워진 연도를 확인해 다음 사업연도를 다시 계획합니다.
+
+        Returns:
+            get_financial_data_matrix()와 같은 형식 ({corp_code: {사업연도: 결과}}, 실패 목록)
+        """
+        end_year = int(bsns_year)
+        start_year = end_year - window + 1
+        results: Dict[str, Dict[str, Dict]] = {corp_code: {} for corp_code in corp_codes}
+        fetched: Dict[str, set] = {corp_code: set() for corp_code in corp_codes}
+        failures: List[Dict] = []
+        plans = {corp_code: plan_filing_years(start_year, end_year) for corp_code in corp_codes}
+        while plans:
+            groups: Dict[Tuple[int, ...], List[str]] = {}
+            for corp_code, plan in plans.items():
+                groups.setdefault(tuple(plan), []).append(corp_code)
+            for plan, codes in groups.items():
+                matrix, failed = await self.get_financial_data_matrix(
+                    codes, [str(year) for year in plan], fs_div, reprt_code
+                )
+                failures.extend(failed)
+                for corp_code in codes:
+                    results[corp_code].update(matrix.get(corp_code, {}))
+                    fetched[corp_code].update(plan)
+
+            plans = {}
+            for corp_code in corp_codes:
+                filings = {int(year): result.get('items', []) for year, result in results[corp_code].items()}
+                _, sources = stitch_filings(filings, start_year, end_year)
+                plan = plan_filing_years(start_year, end_year, fetched=fetched[corp_code], covered=set(sources))
+                if plan:
+                    plans[corp_code] = plan
+        return results, failures
+
+    async def _bulk_statements(
+        self,
+        stock_codes: List[str],
+        bsns_year: str,
+        reprt_code: str
+    ) -> Dict[str, Dict[str, List[Dict]]]:
+        """일괄 자료(run_bulk_loader.py)에 있는 재무정보, 네트워크 호출 없음
+
+        Returns:
+            {stock_code: {fs_div: 재무 데이터 리스트}} (적재된 자료가 없거나 읽지 못하면 빈 dict)
+        """
+        bulk_store = get_bulk_store()
+        if bulk_store is None:
+            return {}
+        try:
+            return await asyncio.to_thread(
+                bulk_store.get_financial_statements_batch, stock_codes, bsns_year, reprt_code
+            )
+        except Exception as e:
+            logger.warning(f"일괄 자료 조회 실패, DART 조회로 대체: {e}")
+            return {}
+
+    def _listed_result(
+        self,
+        company: Dict,
+        bsns_year: str,
+        fs_div: str,
+        statements: Dict[str, List[Dict]],
+        reprt_code: str = REPRT_ANNUAL
+    ) -> Dict:
+        """상장 기업 재무정보 결과 (statements: {fs_div: 재무 데이터 리스트})"""
+        result = {
+            'corp_code': company['corp_code'],
+            'corp_name': company['corp_name'],
+            'stock_code': company['stock_code'],
+            'bsns_year': bsns_year,
+            'fs_div': fs_div,
+            'reprt_code': reprt_code,
+            'is_listed': True
+        }
+
+        if fs_div == FS_DIV_ALL:
+            by_div = {div: self._build_statement(statements.get(div, [])) for div in FS_DIVS}
+            # 단일 구분 화면 호환용: 연결이 없으면 별도를 대표로
+            primary = next((div for div in FS_DIVS if by_div[div]['items']), FS_DIVS[0])
+            result.update(by_div[primary], statements=by_div)
+        else:
+            result.update(self._build_statement(statements.get(fs_div, [])))
+        return result
+
+    def _build_statement(self, raw_data: List[Dict]) -> Dict:
+        """재무 데이터 가공 및 비율 계산 (데이터가 없으면 빈 결과)"""
+        if not raw_data:
+            return {'items': [], 'ratios': {}}
+        processed = self._prepare_data(raw_data)
+        return {'items': processed, 'ratios': calc_ratios(processed)}
+    
     def _prepare_data(self, data: List[Dict]) -> List[Dict]:
-        """재무 데이터 전처리"""
-        for item in data:
-            account_id = item.get('account_id', '')
-            account_nm = item.get('account_nm', '')
-            
-            # 기본 표시명 설정
-            if account_id in ACCOUNT_ID_MAP:
-                item['base_display_name'] = ACCOUNT_ID_MAP[account_id]
-            elif '당기순이익' in account_nm:
-                item['base_display_name'] = '당기순이익'
-            else:
-                item['base_display_name'] = account_nm
+        """재무 데이터 전처리 (새 dict로 만듦, 원본은 SingleFlight/캐시가 여러 요청에 같이 넘기므로 고치지 않음)"""
+        # 기본 표시명 설정
+        prepared = [
+            {**item, 'base_display_name': base_display_name(item.get('account_id', ''), item.get('account_nm', ''))}
+            for item in data
+        ]
         
         # 중복 계정 처리
-        counts = Counter(i['base_display_name'] for i in data)
-        for item in data:
+        counts = Counter(i['base_display_name'] for i in prepared)
+        for item in prepared:
             if counts[item['base_display_name']] > 1:
                 item['display_name'] = f"{item['base_display_name']} ({item.get('account_id', '')})"
             else:
                 item['display_name'] = item['base_display_name']
         
-        return data
-    
-    def _calc_ratios(self, data: List[Dict]) -> Dict[str, Dict[str, float]]:
-        """재무비율 계산"""
-        from backend.utils.formatters import safe_float
-        
-        # 계정별 금액 추출
-        accts = {
-            i.get('base_display_name'): {
-                'thstrm': safe_float(i.get('thstrm_amount')),
-                'frmtrm': safe_float(i.get('frmtrm_amount')),
-                'bfefrmtrm': safe_float(i.get('bfefrmtrm_amount'))
-            }
-            for i in data
-        }
-        
-        def ratio(numerator: str, denominator: str, percentage: bool = True) -> Dict[str, float]:
-            """비율 계산 헬퍼"""
-            result = {}
-            for period in ['thstrm', 'frmtrm', 'bfefrmtrm']:
-                num = accts.get(numerator, {}).get(period, 0)
-                den = accts.get(denominator, {}).get(period, 1)
-                
-                if den != 0:
-                    value = (num / den) * (100 if percentage else 1)
-                    result[period] = round(value, 2)
-                else:
-                    result[period] = 0.0
-            
-            return result
-        
-        return {
-            '영업이익률': ratio('영업이익', '매출액', True),
-            '순이익률': ratio('당기순이익', '매출액', True),
-            'ROE': ratio('당기순이익', '자본총계', True),
-            'ROA': ratio('당기순이익', '자산총계', True),
-            '부채비율': ratio('부채총계', '자본총계', True),
-            '자기자본비율': ratio('자본총계', '자산총계', True),
-        }
+        return prepared
     
-    def get_disclosure_list(self, corp_code: str, bsns_year: str) -> Dict:
+    async def get_disclosure_list(self, corp_code: str, bsns_year: str) -> Dict:
         """공시 목록 조회"""
         company = self.get_company_by_code(corp_code)
-        disclosures = self.dart_repo.get_disclosure_list(corp_code, bsns_year)
+        disclosures = await self.dart_repo.get_disclosure_list(corp_code, bsns_year)
         
         return {
             'corp_code': corp_code,
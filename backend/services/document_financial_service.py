@@ -4,19 +4,24 @@
 """
 import os
 import tempfile
-from typing import Dict, List, Optional
-from backend.repositories.dart_repository import DARTRepository
+from typing import Dict, Optional
+from backend.repositories.async_dart_repository import AsyncDARTRepository
+from backend.repositories.dart_scheduler import interactive_context
 from backend.core.llm.upstage import UpstageProvider
 from backend.core.exceptions import DARTAPIException, LLMException
 from backend.core.logger import get_backend_logger
+from backend.services.ratio_engine import calc_ratios
+from backend.utils.singleflight import single_flight
 
 logger = get_backend_logger("document_financial_service")
 
+_flights = single_flight('document_extraction')
+
 
 class DocumentFinancialService:
     """문서 기반 재무정보 추출 서비스 (상장/비상장 통합)"""
 
-    def __init__(self, dart_repo: DARTRepository, upstage_provider: Optional[UpstageProvider] = None):
+    def __init__(self, dart_repo: AsyncDARTRepository, upstage_provider: Optional[UpstageProvider] = None):
         self.dart_repo = dart_repo
         self.upstage = upstage_provider
 
@@ -40,6 +45,22 @@ class DocumentFinancialService:
         Returns:
             추출된 재무정보 및 메타데이터
         """
+        # 같은 문서의 동시 요청은 PDF 다운로드(같은 임시 파일)와 파싱을 한 번만 실행
+        return await _flights.do(
+            (self.dart_repo.key_id, rcept_no, is_listed),
+            lambda: self._extract_financial_from_document(rcept_no, corp_code, corp_name, report_nm, is_listed),
+            interactive_context()
+        )
+
+    async def _extract_financial_from_document(
+        self,
+        rcept_no: str,
+        corp_code: str,
+        corp_name: str,
+        report_nm: str,
+        is_listed: bool
+    ) -> Dict:
+        """PDF 다운로드 → 문서 파싱 → 재무정보 추출"""
         try:
             logger.info(f"Extracting financial data from document: {report_nm} ({rcept_no})")
 
@@ -48,7 +69,7 @@ class DocumentFinancialService:
             pdf_path = os.path.join(temp_dir, f"{corp_code}_{rcept_no}.pdf")
 
             logger.info(f"Downloading PDF document to {pdf_path}")
-            self.dart_repo.download_document_pdf(rcept_no, pdf_path)
+            await self.dart_repo.download_document_pdf(rcept_no, pdf_path)
 
             try:
                 # 2. Upstage Document Parse API로 PDF 파싱
@@ -196,47 +217,9 @@ class DocumentFinancialService:
             result_items.append(standard_item)
 
         # 재무비율 계산
-        ratios = self._calc_ratios(result_items)
+        ratios = calc_ratios(result_items, name_key='account_nm')
 
         return {
             'items': result_items,
             'ratios': ratios
         }
-
-    def _calc_ratios(self, data: List[Dict]) -> Dict[str, Dict[str, float]]:
-        """재무비율 계산"""
-        from backend.utils.formatters import safe_float
-
-        # 계정별 금액 추출
-        accts = {}
-        for item in data:
-            base_name = item.get('account_nm', '')
-            accts[base_name] = {
-                'thstrm': safe_float(item.get('thstrm_amount')),
-                'frmtrm': safe_float(item.get('frmtrm_amount')),
-                'bfefrmtrm': safe_float(item.get('bfefrmtrm_amount'))
-            }
-
-        def ratio(numerator: str, denominator: str, percentage: bool = True) -> Dict[str, float]:
-            """비율 계산 헬퍼"""
-            result = {}
-            for period in ['thstrm', 'frmtrm', 'bfefrmtrm']:
-                num = accts.get(numerator, {}).get(period, 0)
-                den = accts.get(denominator, {}).get(period, 1)
-
-                if den != 0:
-                    value = (num / den) * (100 if percentage else 1)
-                    result[period] = round(value, 2)
-                else:
-                    result[period] = 0.0
-
-            return result
-
-        return {
-            '영업이익률': ratio('영업이익', '매출액', True),
-            '순이익률': ratio('당기순이익', '매출액', True),
-            'ROE': ratio('당기순이익', '자본총계', True),
-            'ROA': ratio('당기순이익', '자산총계', True),
-            '부채비율': ratio('부채총계', '자본총계', True),
-            '자기자본비율': ratio('자본총계', '자산총계', True),
-        }
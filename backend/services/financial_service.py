@@ -1,78 +1,32 @@
 from typing import Dict, List
 from collections import Counter
+from backend.services.ratio_engine import calc_per_pbr, calc_ratios, calc_ratios_batch
+from backend.utils.accounts import base_display_name
 
 class FinancialService:
     """Financial calculation service"""
     
-    ACCOUNT_ID_MAP = {
-        'ifrs-full_Assets': '자산총계',
-        'ifrs-full_Liabilities': '부채총계',
-        'ifrs-full_Equity': '자본총계',
-        'ifrs-full_Revenue': '매출액',
-        'dart_OperatingIncomeLoss': '영업이익',
-        'ifrs-full_ProfitLoss': '당기순이익',
-        'dart_ProfitLossAttributableToOwnersOfParent': '당기순이익',
-        'ifrs-full_ProfitLossAttributableToOwnersOfParent': '당기순이익',
-    }
-    
     def prepare_data(self, data: List[dict]) -> List[dict]:
-        """Financial data preprocessing"""
-        for item in data:
-            account_id = item.get('account_id', '')
-            account_nm = item.get('account_nm', '')
-            
-            if account_id in self.ACCOUNT_ID_MAP:
-                item['base_display_name'] = self.ACCOUNT_ID_MAP[account_id]
-            elif '당기순이익' in account_nm:
-                item['base_display_name'] = '당기순이익'
-            else:
-                item['base_display_name'] = account_nm
+        """Financial data preprocessing (returns new dicts; the input may be shared between requests)"""
+        prepared = [
+            {**item, 'base_display_name': base_display_name(item.get('account_id', ''), item.get('account_nm', ''))}
+            for item in data
+        ]
         
         # Handle duplicate account names
-        counts = Counter(i['base_display_name'] for i in data)
-        for item in data:
+        counts = Counter(i['base_display_name'] for i in prepared)
+        for item in prepared:
             base_name = item['base_display_name']
             if counts[base_name] > 1:
                 item['display_name'] = base_name + ' (' + item.get('account_id', '') + ')'
             else:
                 item['display_name'] = base_name
         
-        return data
+        return prepared
     
     def calculate_ratios(self, data: List[dict]) -> Dict[str, Dict[str, float]]:
-        """Calculate financial ratios"""
-        # Extract accounts by amount
-        accounts = {}
-        for item in data:
-            base_name = item.get('base_display_name')
-            accounts[base_name] = {
-                'thstrm': self._safe_float(item.get('thstrm_amount')),
-                'frmtrm': self._safe_float(item.get('frmtrm_amount')),
-                'bfefrmtrm': self._safe_float(item.get('bfefrmtrm_amount'))
-            }
-        
-        def calc_ratio(numerator: str, denominator: str, percentage: bool = True):
-            """Ratio calculation helper"""
-            result = {}
-            for period in ['thstrm', 'frmtrm', 'bfefrmtrm']:
-                num = accounts.get(numerator, {}).get(period, 0)
-                den = accounts.get(denominator, {}).get(period, 1)
-                
-                if den != 0:
-                    value = (num / den) * (100 if percentage else 1)
-                    result[period] = value
-                else:
-                    result[period] = 0
-            return result
-        
-        return {
-            '영업이익률': calc_ratio('영업이익', '매출액'),
-            '순이익률': calc_ratio('당기순이익', '매출액'),
-            'ROE': calc_ratio('당기순이익', '자본총계'),
-            'ROA': calc_ratio('당기순이익', '자산총계'),
-            '부채비율': calc_ratio('부채총계', '자본총계'),
-            '자기자본비율': calc_ratio('자본총계', '자산총계'),
-        }
+        """Calculate financial ratios (0.0 where the denominator is zero or missing)"""
+        return calc_ratios(data)
     
     def calculate_per_pbr(
         self,
@@ -88,37 +42,8 @@ class FinancialService:
                 'note': '주가 또는 주식수 정보 없음'
             }
         
-        # Extract accounts
-        accounts = {}
-        for item in data:
-            base_name = item.get('base_display_name')
-            accounts[base_name] = {
-                'thstrm': self._safe_float(item.get('thstrm_amount')),
-                'frmtrm': self._safe_float(item.get('frmtrm_amount')),
-                'bfefrmtrm': self._safe_float(item.get('bfefrmtrm_amount'))
-            }
-        
-        per = {}
-        pbr = {}
-        
-        for period in ['thstrm', 'frmtrm', 'bfefrmtrm']:
-            # EPS = net profit / shares
-            net_profit = accounts.get('당기순이익', {}).get(period, 0)
-            eps = net_profit / shares if shares > 0 else 0
-            
-            # BPS = equity / shares
-            equity = accounts.get('자본총계', {}).get(period, 0)
-            bps = equity / shares if shares > 0 else 0
-            
-            # PER = stock price / EPS
-            per[period] = '{:.2f}'.format(stock_price / eps) if eps > 0 else 'N/A'
-            
-            # PBR = stock price / BPS
-            pbr[period] = '{:.2f}'.format(stock_price / bps) if bps > 0 else 'N/A'
-        
         return {
-            'PER': per,
-            'PBR': pbr,
+            **calc_per_pbr(data, stock_price, shares),
             'note': None
         }
     
@@ -144,21 +69,22 @@ class FinancialService:
             "00066570": {...}
         }
         """
-        result = {}
+        # Preprocess data
+        prepared = {
+            corp_code: self.prepare_data(financial_data)
+            for corp_code, financial_data in companies_financial_data.items()
+        }
         
-        for corp_code, financial_data in companies_financial_data.items():
-            # Preprocess data
-            prepared = self.prepare_data(financial_data)
-            
-            # Calculate ratios
-            ratios = self.calculate_ratios(prepared)
-            
-            result[corp_code] = {
-                'prepared_data': prepared,
-                'ratios': ratios
-            }
+        # Calculate ratios for all companies in one batch
+        ratios = calc_ratios_batch(list(prepared.values()))
         
-        return result
+        return {
+            corp_code: {
+                'prepared_data': prepared_data,
+                'ratios': company_ratios
+            }
+            for (corp_code, prepared_data), company_ratios in zip(prepared.items(), ratios)
+        }
     
     def format_comparison_by_year(
         self,
@@ -208,11 +134,12 @@ class FinancialService:
         for corp_code, comparison_data in companies_comparison_data.items():
             prepared_data = comparison_data['prepared_data']
             for item in prepared_data:
-                # Extract year from thstrm_dt (e.g. "20240331" -> "2024")
-                thstrm_dt = item.get('thstrm_dt', '')
-                if thstrm_dt and len(thstrm_dt) >= 4:
-                    year = thstrm_dt[:4]
-                    all_years.add(year)
+                # Extract years from the period dates (e.g. "20240331" -> "2024");
+                # one report covers the current, previous and the year before
+                for field in ('thstrm_dt', 'frmtrm_dt', 'bfefrmtrm_dt'):
+                    period_dt = item.get(field) or ''
+                    if len(period_dt) >= 4 and period_dt[:4].isdigit():
+                        all_years.add(period_dt[:4])
         
         # Group by year
         result = {}
@@ -0,0 +1,150 @@
+"""
+재무비율 계산 엔진
+(회사 x 기간 x 계정) 금액 배열 하나로 모든 재무비율과 PER/PBR을 NumPy 연산으로 계산합니다.
+단일 회사 조회, 여러 회사 비교, 스크리너가 모두 이 엔진을 써서 같은 값을 냅니다.
+분모가 0이거나 값이 없으면 NaN이며, 기존 응답 형식으로 바꿀 때만 0.0 / 'N/A'로 채웁니다.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.utils.accounts import account_rank
+from backend.utils.formatters import parse_amount
+
+# 재무 데이터 기간 (fnlttMultiAcnt 금액 컬럼 앞부분)
+PERIODS = ('thstrm', 'frmtrm', 'bfefrmtrm')
+
+# 비율 계산에 쓰는 계정 (배열의 계정 축 순서)
+RATIO_ACCOUNTS = ('매출액', '영업이익', '당기순이익', '자산총계', '부채총계', '자본총계')
+
+# 재무비율 (분자, 분모), 모두 백분율
+RATIO_DEFINITIONS = {
+    '영업이익률': ('영업이익', '매출액'),
+    '순이익률': ('당기순이익', '매출액'),
+    'ROE': ('당기순이익', '자본총계'),
+    'ROA': ('당기순이익', '자산총계'),
+    '부채비율': ('부채총계', '자본총계'),
+    '자기자본비율': ('자본총계', '자산총계'),
+}
+RATIO_NAMES = tuple(RATIO_DEFINITIONS)
+
+# 응답에 싣는 소수점 자리수
+RATIO_DECIMALS = 2
+
+_ACCOUNT_INDEX = {name: i for i, name in enumerate(RATIO_ACCOUNTS)}
+_NUMERATORS = np.array([_ACCOUNT_INDEX[num] for num, _ in RATIO_DEFINITIONS.values()])
+_DENOMINATORS = np.array([_ACCOUNT_INDEX[den] for _, den in RATIO_DEFINITIONS.values()])
+
+
+def account_index(name: str) -> int:
+    """계정 축에서 계정 위치"""
+    return _ACCOUNT_INDEX[name]
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """나눗셈 (분모가 0이거나 분자/분모에 값이 없으면 NaN)"""
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+    )
+    result = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def build_account_array(
+    entities: Sequence[List[Dict]],
+    name_key: str = 'base_display_name'
+) -> np.ndarray:
+    """재무 데이터 리스트 여러 개를 (회사 x 기간 x 계정) 배열로 (값이 없으면 NaN)
+
+    같은 계정이 여러 번 나오면 계정 ID 순위(account_rank, 당기순이익은 지배기업 소유주 귀속분 우선)가
+    가장 높은 항목을, 순위가 같으면(계정 ID가 없는 요약 재무정보 등) 기존 계산과 같게 나중 항목을 씁니다.
+
+    Args:
+        entities: 회사별 재무 데이터 리스트 (fnlttMultiAcnt 형식)
+        name_key: 계정 이름 필드 (표시명을 붙이지 않은 자료는 'account_nm')
+    """
+    values = np.full((len(entities), len(PERIODS), len(RATIO_ACCOUNTS)), np.nan)
+    for entity, items in enumerate(entities):
+        ranks: Dict[int, int] = {}
+        for item in items:
+            account = _ACCOUNT_INDEX.get(item.get(name_key))
+            if account is None:
+                continue
+            rank = account_rank(item.get('account_id') or '')
+            if rank > ranks.get(account, rank):
+                continue
+            ranks[account] = rank
+            for period, prefix in enumerate(PERIODS):
+                amount = parse_amount(item.get(f'{prefix}_amount'))
+                values[entity, period, account] = np.nan if amount is None else amount
+    return values
+
+
+def compute_ratios(values: np.ndarray) -> np.ndarray:
+    """재무비율 배열
+
+    Args:
+        values: 마지막 축이 RATIO_ACCOUNTS 순서인 금액 배열 (예: 회사 x 기간 x 계정)
+
+    Returns:
+        마지막 축이 RATIO_NAMES 순서인 백분율 배열 (분모가 0이거나 값이 없으면 NaN)
+    """
+    return safe_divide(values[..., _NUMERATORS], values[..., _DENOMINATORS]) * 100
+
+
+def compute_valuation(values: np.ndarray, price: float, shares: float) -> Tuple[np.ndarray, np.ndarray]:
+    """PER, PBR 배열 (EPS/BPS가 양수가 아니면 NaN)
+
+    Args:
+        values: 마지막 축이 RATIO_ACCOUNTS 순서인 금액 배열
+        price: 주가
+        shares: 발행주식수
+    """
+    eps = safe_divide(values[..., _ACCOUNT_INDEX['당기순이익']], shares)
+    bps = safe_divide(values[..., _ACCOUNT_INDEX['자본총계']], shares)
+    per = safe_divide(price, np.where(eps > 0, eps, np.nan))
+    pbr = safe_divide(price, np.where(bps > 0, bps, np.nan))
+    return per, pbr
+
+
+def ratio_dict(ratios: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """회사 하나의 (기간 x 비율) 배열을 기존 응답 형식으로 (NaN은 0.0)
+
+    Returns:
+        {비율명: {'thstrm': 값, 'frmtrm': 값, 'bfefrmtrm': 값}}
+    """
+    rounded = np.round(np.nan_to_num(ratios, nan=0.0), RATIO_DECIMALS)
+    return {
+        name: {prefix: float(rounded[period, r]) for period, prefix in enumerate(PERIODS)}
+        for r, name in enumerate(RATIO_NAMES)
+    }
+
+
+def calc_ratios_batch(
+    entities: Sequence[List[Dict]],
+    name_key: str = 'base_display_name'
+) -> List[Dict[str, Dict[str, float]]]:
+    """여러 회사 재무비율 (배열 하나로 한 번에 계산)"""
+    ratios = compute_ratios(build_account_array(entities, name_key))
+    return [ratio_dict(entity) for entity in ratios]
+
+
+def calc_ratios(items: List[Dict], name_key: str = 'base_display_name') -> Dict[str, Dict[str, float]]:
+    """회사 하나의 재무비율 (기존 응답 형식)"""
+    return calc_ratios_batch([items], name_key)[0]
+
+
+def calc_per_pbr(items: List[Dict], price: Optional[float], shares: Optional[float]) -> Dict[str, Dict[str, str]]:
+    """회사 하나의 PER, PBR (기존 응답 형식, 계산할 수 없으면 'N/A')
+
+    Returns:
+        {'PER': {'thstrm': '12.34', ...}, 'PBR': {...}}
+    """
+    per, pbr = compute_valuation(build_account_array([items])[0], price or 0.0, shares or 0.0)
+
+    def formatted(values: np.ndarray) -> Dict[str, str]:
+        return {
+            prefix: 'N/A' if np.isnan(value) or value == 0 else f"{value:.2f}"
+            for prefix, value in zip(PERIODS, values)
+        }
+
+    return {'PER': formatted(per), 'PBR': formatted(pbr)}
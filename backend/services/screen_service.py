@@ -0,0 +1,476 @@
+"""
+시장 전체 스크리너
+일괄 자료 저장소의 사업보고서 값을 (회사 x 연도 x 계정) 행렬로 한 번 만들어 두고
+'ROE > 15 and 부채비율 < 100 and 매출액 CAGR3 > 10%' 같은 조건식을 행렬 열 연산으로 평가합니다.
+조건식은 한 번 컴파일해 캐시하므로 같은 식을 다시 파싱하지 않습니다.
+"""
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+from backend.core.logger import get_backend_logger
+from backend.repositories.bulk_store import SERVED_SJ_DIVS, BulkFinancialStore
+from backend.repositories.dart_repository import REPRT_ANNUAL
+from backend.services.ratio_engine import (
+    RATIO_ACCOUNTS,
+    RATIO_DECIMALS,
+    RATIO_NAMES,
+    account_index,
+    compute_ratios,
+    safe_divide,
+)
+from backend.utils.accounts import account_rank, base_display_name
+
+logger = get_backend_logger("screen_service")
+
+# 일괄 자료 금액 컬럼 -> 사업연도에서 뺄 햇수
+PERIOD_OFFSETS = (('thstrm', 0), ('frmtrm', 1), ('bfefrmtrm', 2))
+
+# 숫자 뒤 단위 (%는 비율 값이 이미 백분율이라 그대로)
+NUMBER_UNITS = {'%': 1.0, '억': 1e8, '조': 1e12}
+
+# 기본 연도: 자산총계가 있는 회사가 이 비율 이상인 가장 최근 연도
+DEFAULT_YEAR_COVERAGE = 0.5
+
+MAX_LIMIT = 1000
+
+
+class ScreenMatrix(NamedTuple):
+    """회사 x 연도 x 계정 금액 행렬과 같은 모양의 재무비율 행렬 (값이 없으면 NaN)"""
+    stock_codes: np.ndarray
+    corp_names: np.ndarray
+    markets: np.ndarray
+    years: np.ndarray
+    values: np.ndarray
+    ratios: np.ndarray
+
+    def column(self, name: str, year: int) -> np.ndarray:
+        """연도 하나의 계정 또는 재무비율 열 (행렬에 없는 연도면 전부 NaN)"""
+        index = np.searchsorted(self.years, year)
+        if index >= len(self.years) or self.years[index] != year:
+            return np.full(len(self.stock_codes), np.nan)
+        if name in RATIO_NAMES:
+            return self.ratios[:, index, RATIO_NAMES.index(name)]
+        return self.values[:, index, account_index(name)]
+
+    def default_year(self) -> Optional[int]:
+        assets = self.values[:, :, account_index('자산총계')]
+        coverage = np.count_nonzero(~np.isnan(assets), axis=0)
+        covered = np.nonzero(coverage >= len(self.stock_codes) * DEFAULT_YEAR_COVERAGE)[0]
+        return int(self.years[covered[-1]]) if len(covered) else None
+
+
+def build_screen_matrix(table) -> ScreenMatrix:
+    """일괄 자료 계정 행으로 행렬 생성
+
+    사업보고서마다 당기/전기/전전기 금액이 오므로 같은 (회사, 연도, 계정)이 여러 번 나오면
+    가장 최근 보고서 값을 씁니다. 한 보고서에 같은 계정이 여러 행이면 계정 ID 순위
+    (당기순이익은 지배기업 소유주 귀속분, 전체 당기순이익, 이름으로만 맞춘 행 순)로 고르고,
+    순위가 같으면 회사별 조회의 비율 계산과 같게 재무제표 종류/표시 순서로 마지막 행을 씁니다.
+    """
+    df = table.to_pandas()
+    # 적재 시점 기본 표시명 대신 계정 ID/이름으로 다시 정함 (비지배지분 귀속분, 주당이익 제외)
+    pairs = {pair: base_display_name(*pair) for pair in set(zip(df['account_id'], df['account_nm']))}
+    df['base_name'] = [pairs[pair] for pair in zip(df['account_id'], df['account_nm'])]
+    df = df[df['base_name'].isin(RATIO_ACCOUNTS)].copy()
+    df['sj_rank'] = df['sj_div'].map({sj_div: i for i, sj_div in enumerate(SERVED_SJ_DIVS)})
+    df['id_rank'] = df['account_id'].map({i: account_rank(i) for i in df['account_id'].unique()})
+    frames = []
+    for column, offset in PERIOD_OFFSETS:
+        part = df[['stock_code', 'bsns_year', 'id_rank', 'sj_rank', 'ord', 'base_name', column]]
+        part = part.rename(columns={column: 'amount'})
+        part = part.assign(report_year=part['bsns_year'].astype(int))
+        frames.append(part.assign(year=part['report_year'] - offset))
+    long = pd.concat(frames, ignore_index=True)
+    long = long.sort_values(
+        ['report_year', 'id_rank', 'sj_rank', 'ord'], ascending=[False, True, False, False], kind='stable'
+    )
+    long = long.drop_duplicates(['stock_code', 'year', 'base_name'])
+    # 빈 금액은 중복을 고른 뒤에 지움 (회사별 조회처럼 값이 없는 것으로 둠)
+    long = long.dropna(subset=['amount'])
+
+    # 회사 정보는 가장 최근 보고서 기준
+    companies = df.sort_values('bsns_year', ascending=False, kind='stable').drop_duplicates('stock_code')
+    companies = companies.sort_values('stock_code')
+    stock_codes = companies['stock_code'].to_numpy()
+    years = np.sort(long['year'].unique())
+
+    values = np.full((len(stock_codes), len(years), len(RATIO_ACCOUNTS)), np.nan)
+    rows = np.searchsorted(stock_codes, long['stock_code'].to_numpy())
+    cols = np.searchsorted(years, long['year'].to_numpy())
+    accounts = long['base_name'].map(account_index).to_numpy()
+    values[rows, cols, accounts] = long['amount'].to_numpy()
+
+    return ScreenMatrix(
+        stock_codes=stock_codes,
+        corp_names=companies['corp_name'].to_numpy(),
+        markets=companies['market'].to_numpy(),
+        years=years,
+        values=values,
+        ratios=compute_ratios(values),
+    )
+
+
+def cagr_values(current: np.ndarray, base: np.ndarray, years: int) -> np.ndarray:
+    """연평균 성장률 % (두 값이 모두 양수일 때만)"""
+    result = np.full(current.shape, np.nan)
+    valid = (current > 0) & (base > 0)
+    result[valid] = (np.power(current[valid] / base[valid], 1.0 / years) - 1) * 100
+    return result
+
+
+def yoy_values(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """전년 대비 증감률 % (전년 값이 0이거나 없으면 NaN)"""
+    return safe_divide(current - previous, np.abs(previous)) * 100
+
+
+class _Evaluation:
+    """조건식 평가 상태 (같은 지표는 한 번만 계산)"""
+
+    def __init__(self, matrix: ScreenMatrix, year: int):
+        self.matrix = matrix
+        self.year = year
+        self.values: Dict[str, np.ndarray] = {}
+
+    def metric(self, label: str, name: str, modifier: Optional[str], span: int) -> np.ndarray:
+        if label not in self.values:
+            current = self.matrix.column(name, self.year)
+            if modifier == 'CAGR':
+                current = cagr_values(current, self.matrix.column(name, self.year - span), span)
+            elif modifier == 'YOY':
+                current = yoy_values(current, self.matrix.column(name, self.year - 1))
+            self.values[label] = current
+        return self.values[label]
+
+
+# 컴파일된 식 노드: 평가 상태 -> 열(또는 상수)
+Node = Callable[[_Evaluation], np.ndarray]
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """컴파일된 조건식"""
+    text: str
+    evaluate: Node
+    metrics: Tuple[str, ...]
+    is_condition: bool
+
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[%억조])?
+      | (?P<op>>=|<=|==|!=|[<>=+\-*/()])
+      | (?P<word>[^\s<>=!+\-*/()]+)
+    )
+''', re.VERBOSE)
+
+METRIC_MODIFIER = re.compile(r'^(?:CAGR(\d+)|YOY)$', re.IGNORECASE)
+
+COMPARISONS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '=': np.equal,
+    '!=': np.not_equal,
+}
+
+ARITHMETIC = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': safe_divide,
+}
+
+KEYWORDS = ('and', 'or', 'not')
+
+
+def _tokenize(text: str) -> List[Tuple[str, object]]:
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"해석할 수 없는 문자: {text[position:]!r}")
+        position = match.end()
+        if match.group('number') is not None:
+            tokens.append(('number', float(match.group('number')) * NUMBER_UNITS.get(match.group('unit'), 1.0)))
+        elif match.group('op') is not None:
+            tokens.append(('op', match.group('op')))
+        else:
+            word = match.group('word')
+            tokens.append(('keyword', word.lower()) if word.lower() in KEYWORDS else ('word', word))
+    tokens.append(('end', None))
+    return tokens
+
+
+def _binary(op: Callable, left_node: Node, right_node: Node) -> Node:
+    """두 노드 값에 연산을 적용하는 노드"""
+    def evaluate(env: _Evaluation) -> np.ndarray:
+        return op(left_node(env), right_node(env))
+    return evaluate
+
+
+class _Parser:
+    """조건식 파서 (or < and < not < 비교 < 덧셈 < 곱셈 < 단항 음수 순으로 묶음)"""
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.metrics: List[str] = []
+
+    def parse(self) -> Tuple[Node, bool]:
+        node, is_condition = self._or()
+        if self._peek()[0] != 'end':
+            raise ValueError(f"식이 끝나야 할 곳에 {self._peek()[1]!r}")
+        return node, is_condition
+
+    def _peek(self) -> Tuple[str, object]:
+        return self.tokens[self.position]
+
+    def _take(self) -> Tuple[str, object]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _accept(self, kind: str, value: object) -> bool:
+        if self._peek() == (kind, value):
+            self.position += 1
+            return True
+        return False
+
+    def _condition(self, parsed: Tuple[Node, bool], keyword: str) -> Node:
+        node, is_condition = parsed
+        if not is_condition:
+            raise ValueError(f"'{keyword}' 양쪽은 비교식이어야 합니다")
+        return node
+
+    def _or(self) -> Tuple[Node, bool]:
+        parsed = self._and()
+        while self._accept('keyword', 'or'):
+            left = self._condition(parsed, 'or')
+            right = self._condition(self._and(), 'or')
+            parsed = (_binary(np.logical_or, left, right), True)
+        return parsed
+
+    def _and(self) -> Tuple[Node, bool]:
+        parsed = self._not()
+        while self._accept('keyword', 'and'):
+            left = self._condition(parsed, 'and')
+            right = self._condition(self._not(), 'and')
+            parsed = (_binary(np.logical_and, left, right), True)
+        return parsed
+
+    def _not(self) -> Tuple[Node, bool]:
+        if self._accept('keyword', 'not'):
+            operand = self._condition(self._not(), 'not')
+            return (lambda env: np.logical_not(operand(env))), True
+        return self._comparison()
+
+    def _comparison(self) -> Tuple[Node, bool]:
+        left, is_condition = self._sum()
+        token = self._peek()
+        if token[0] == 'op' and token[1] in COMPARISONS:
+            self._take()
+            right, right_condition = self._sum()
+            if is_condition or right_condition:
+                raise ValueError("비교식끼리는 비교할 수 없습니다")
+            # NaN과의 비교는 numpy에서 False이므로 값이 없는 회사는 걸러짐
+            return _binary(COMPARISONS[token[1]], left, right), True
+        return left, is_condition
+
+    def _sum(self) -> Tuple[Node, bool]:
+        node, is_condition = self._product()
+        while self._peek()[0] == 'op' and self._peek()[1] in ('+', '-'):
+            op = ARITHMETIC[self._take()[1]]
+            right, right_condition = self._product()
+            if is_condition or right_condition:
+                raise ValueError("비교식에는 산술 연산을 쓸 수 없습니다")
+            node = _binary(op, node, right)
+        return node, is_condition
+
+    def _product(self) -> Tuple[Node, bool]:
+        node, is_condition = self._unary()
+        while self._peek()[0] == 'op' and self._peek()[1] in ('*', '/'):
+            op = ARITHMETIC[self._take()[1]]
+            right, right_condition = self._unary()
+            if is_condition or right_condition:
+                raise ValueError("비교식에는 산술 연산을 쓸 수 없습니다")
+            node = _binary(op, node, right)
+        return node, is_condition
+
+    def _unary(self) -> Tuple[Node, bool]:
+        if self._accept('op', '-'):
+            operand, is_condition = self._unary()
+            if is_condition:
+                raise ValueError("비교식에는 산술 연산을 쓸 수 없습니다")
+            return (lambda env: np.negative(operand(env))), False
+        return self._primary()
+
+    def _primary(self) -> Tuple[Node, bool]:
+        kind, value = self._take()
+        if kind == 'number':
+            return (lambda env: value), False
+        if (kind, value) == ('op', '('):
+            parsed = self._or()
+            if not self._accept('op', ')'):
+                raise ValueError("닫는 괄호가 없습니다")
+            return parsed
+        if kind == 'word':
+            return self._metric(value), False
+        raise ValueError(f"값이 와야 할 곳에 {value!r}" if value is not None else "식이 끝났습니다")
+
+    def _metric(self, name: str) -> Node:
+        if name not in RATIO_NAMES and name not in RATIO_ACCOUNTS:
+            known = ', '.join([*RATIO_NAMES, *RATIO_ACCOUNTS])
+            raise ValueError(f"알 수 없는 지표: {name} (사용 가능: {known})")
+
+        modifier, span, label = None, 0, name
+        kind, word = self._peek()
+        match = METRIC_MODIFIER.match(word) if kind == 'word' else None
+        if match:
+            self._take()
+            modifier = 'CAGR' if match.group(1) else 'YOY'
+            span = int(match.group(1) or 1)
+            if modifier == 'CAGR' and span < 1:
+                raise ValueError("CAGR 기간은 1년 이상이어야 합니다")
+            label = f"{name} {modifier}{span if modifier == 'CAGR' else ''}"
+
+        if label not in self.metrics:
+            self.metrics.append(label)
+        return lambda env: env.metric(label, name, modifier, span)
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text: str) -> CompiledExpression:
+    """조건식 컴파일 (같은 식은 캐시된 결과 사용)
+
+    Raises:
+        ValueError: 식을 해석할 수 없음
+    """
+    parser = _Parser(text)
+    node, is_condition = parser.parse()
+    return CompiledExpression(text=text, evaluate=node, metrics=tuple(parser.metrics), is_condition=is_condition)
+
+
+_matrices: Dict[str, Tuple[Optional[float], ScreenMatrix]] = {}
+_matrices_lock = threading.Lock()
+
+
+def get_screen_matrix(store: BulkFinancialStore, fs_div: str) -> Optional[ScreenMatrix]:
+    """재무제표 구분별 행렬 (일괄 자료가 다시 적재되면 새로 만듦)"""
+    version = store.version()
+    with _matrices_lock:
+        cached = _matrices.get(fs_div)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        started = time.perf_counter()
+        table = store.read_accounts(REPRT_ANNUAL, fs_div, list(RATIO_ACCOUNTS))
+        if table is None or table.num_rows == 0:
+            return None
+        matrix = build_screen_matrix(table)
+        _matrices[fs_div] = (version, matrix)
+        logger.info(
+            f"스크리너 행렬 생성 ({fs_div}): {len(matrix.stock_codes)}개 회사 x {len(matrix.years)}개 연도, "
+            f"{time.perf_counter() - started:.2f}초"
+        )
+        return matrix
+
+
+def _json_value(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), RATIO_DECIMALS)
+
+
+class ScreenService:
+    """일괄 자료 기반 시장 전체 조건 검색"""
+
+    def __init__(self, bulk_store: BulkFinancialStore):
+        self.bulk_store = bulk_store
+
+    def screen(
+        self,
+        expression: str,
+        year: Optional[int] = None,
+        fs_div: str = 'CFS',
+        sort: Optional[str] = None,
+        descending: bool = True,
+        limit: int = 100
+    ) -> Dict:
+        """조건식에 맞는 회사 목록
+
+        Args:
+            expression: 조건식 (예: 'ROE > 15 and 부채비율 < 100 and 매출액 CAGR3 > 10%')
+            year: 기준 사업연도 (없으면 자료가 충분한 가장 최근 연도)
+            fs_div: CFS(연결) 또는 OFS(별도)
+            sort: 정렬 식 (없으면 종목코드 순)
+            descending: 내림차순 정렬 여부
+            limit: 최대 결과 수
+
+        Raises:
+            ValueError: 조건식/정렬 식을 해석할 수 없음
+        """
+        started = time.perf_counter()
+        condition = compile_expression(expression.strip())
+        if not condition.is_condition:
+            raise ValueError("조건식에는 비교 연산자가 있어야 합니다 (예: ROE > 15)")
+        order = compile_expression(sort.strip()) if sort else None
+        if order is not None and order.is_condition:
+            raise ValueError("정렬 식은 값이어야 합니다 (예: ROE)")
+
+        matrix = get_screen_matrix(self.bulk_store, fs_div)
+        if matrix is None:
+            return self._result(condition, year, fs_div, 0, [], [], started)
+        if year is None:
+            year = matrix.default_year()
+        if year is None:
+            return self._result(condition, year, fs_div, len(matrix.stock_codes), [], [], started)
+
+        evaluation = _Evaluation(matrix, year)
+        mask = np.broadcast_to(condition.evaluate(evaluation), matrix.stock_codes.shape)
+        matched = np.nonzero(mask)[0]
+
+        if order is not None:
+            keys = np.broadcast_to(order.evaluate(evaluation), matrix.stock_codes.shape)[matched]
+            keys = -keys if descending else keys
+            # 값이 없는 회사는 뒤로
+            matched = matched[np.lexsort((keys, np.isnan(keys)))]
+
+        labels = list(dict.fromkeys([*condition.metrics, *(order.metrics if order else ())]))
+        columns = {label: evaluation.values[label] for label in labels}
+        rows = [
+            {
+                'stock_code': matrix.stock_codes[i],
+                'corp_name': matrix.corp_names[i],
+                'market': matrix.markets[i],
+                **{label: _json_value(values[i]) for label, values in columns.items()},
+            }
+            for i in matched[:min(limit, MAX_LIMIT)]
+        ]
+        return self._result(condition, year, fs_div, len(matrix.stock_codes), matched, rows, started)
+
+    @staticmethod
+    def _result(
+        condition: CompiledExpression,
+        year: Optional[int],
+        fs_div: str,
+        universe: int,
+        matched,
+        rows: List[Dict],
+        started: float
+    ) -> Dict:
+        return {
+            'expression': condition.text,
+            'year': year,
+            'fs_div': fs_div,
+            'universe': universe,
+            'matched': len(matched),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            'results': rows,
+        }
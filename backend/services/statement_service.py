@@ -0,0 +1,170 @@
+"""
+전체 재무제표 서비스
+fnlttSinglAcntAll 응답을 저장소에 한 번 적재하고, 엑셀/차트/비율 계산이 쓰는 형식으로 꺼냅니다.
+저장소에 적재된 보고서는 유효기간 동안 DART를 다시 호출하지 않습니다.
+저장소(SQLite) 호출은 이벤트 루프를 막지 않도록 asyncio.to_thread로 실행합니다.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+from backend.core.config import settings
+from backend.core.exceptions import DARTAPIException
+from backend.core.logger import get_backend_logger
+from backend.repositories.async_dart_repository import AsyncDARTRepository
+from backend.repositories.dart_repository import DART_STATUS_OK, REPRT_ANNUAL
+from backend.repositories.financial_cache import is_settled_year
+from backend.repositories.statement_store import (
+    NON_STANDARD_ACCOUNT_ID,
+    StatementFiling,
+    StatementStore,
+    get_statement_store,
+    normalize_statement,
+)
+from backend.services.timeseries_service import PERIOD_COLUMNS
+
+logger = get_backend_logger("statement_service")
+
+# 엑셀 시트 구분별 재무제표 종류 (손익계산서는 포괄손익계산서만 내는 회사를 위해 함께 씀)
+SECTION_SJ_DIVS = (
+    ('balance_sheet', ('BS',)),
+    ('income_statement', ('IS', 'CIS')),
+    ('cash_flow', ('CF',)),
+)
+
+# 비율 계산에 쓰는 재무제표 (현금흐름표/자본변동표의 당기순이익 행 제외)
+RATIO_SJ_DIVS = ('BS', 'IS', 'CIS')
+
+
+def build_financial_statements(rows: List[Dict], bsns_year: str) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """계정 행을 엑셀/차트 형식으로 변환
+
+    Returns:
+        {'balance_sheet' | 'income_statement' | 'cash_flow': {계정명: {연도: 금액}}}
+    """
+    year = int(bsns_year)
+    statements = {}
+    for section, sj_divs in SECTION_SJ_DIVS:
+        accounts: Dict[str, Dict[str, float]] = {}
+        seen = set()
+        for row in rows:
+            if row['sj_div'] not in sj_divs or row['account_key'] in seen:
+                continue
+            seen.add(row['account_key'])
+
+            values = {
+                str(year - offset): row[prefix]
+                for prefix, offset in PERIOD_COLUMNS
+                if row[prefix] is not None
+            }
+            if not values:
+                continue
+            name = row['account_nm']
+            if name in accounts:
+                suffix = row['account_id'] if row['account_id'] != NON_STANDARD_ACCOUNT_ID else row['ord']
+                name = f"{name} ({suffix})"
+            accounts[name] = values
+        statements[section] = accounts
+    return statements
+
+
+def statement_items(rows: List[Dict]) -> List[Dict]:
+    """비율 계산용 재무 데이터 (fnlttMultiAcnt 형식, 같은 계정은 처음 행만)"""
+    items = []
+    seen = set()
+    for row in rows:
+        if row['sj_div'] not in RATIO_SJ_DIVS or row['account_key'] in seen:
+            continue
+        seen.add(row['account_key'])
+        item = {'sj_div': row['sj_div'], 'account_id': row['account_id'], 'account_nm': row['account_nm']}
+        for prefix, _ in PERIOD_COLUMNS:
+            value = row[prefix]
+            item[f'{prefix}_amount'] = f"{round(value):,}" if value is not None else ''
+        items.append(item)
+    return items
+
+
+class StatementService:
+    """전체 재무제표 적재 및 조회"""
+
+    def __init__(self, dart_repo: AsyncDARTRepository, store: Optional[StatementStore] = None):
+        self.dart_repo = dart_repo
+        self._store = store
+
+    async def load(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        reprt_code: str = REPRT_ANNUAL,
+        fs_div: str = 'CFS'
+    ) -> Optional[StatementFiling]:
+        """보고서가 저장소에 없거나 오래되었으면 DART에서 받아 적재
+
+        DART 호출이 실패하면 이미 적재된 값을 그대로 씁니다.
+
+        Returns:
+            적재된 보고서 정보 (DART에 데이터가 없으면 None)
+        """
+        key = (corp_code, bsns_year, reprt_code, fs_div)
+        store = await self._get_store()
+        filing = await asyncio.to_thread(store.filing, *key)
+        if filing is not None and time.time() - filing.loaded_at < self._ttl_seconds(bsns_year):
+            return filing
+
+        try:
+            status, items = await self.dart_repo.get_full_statement(corp_code, bsns_year, reprt_code, fs_div)
+        except DARTAPIException as e:
+            if filing is None:
+                raise
+            logger.warning(f"전체 재무제표 조회 실패, 저장된 값 사용 {key}: {e}")
+            return filing
+
+        if status == DART_STATUS_OK and items:
+            rows = normalize_statement(items)
+            await asyncio.to_thread(store.replace_filing, *key, items[0].get('rcept_no', ''), rows)
+            logger.info(f"전체 재무제표 적재 {key}: {len(rows)}개 계정")
+            return await asyncio.to_thread(store.filing, *key)
+
+        if filing is not None:
+            logger.warning(f"전체 재무제표 응답({status}), 저장된 값 사용 {key}")
+        return filing
+
+    async def get_statements(
+        self,
+        corp_code: str,
+        bsns_year: str,
+        fs_div: str = 'CFS',
+        reprt_code: str = REPRT_ANNUAL
+    ) -> Dict:
+        """저장소 기준 전체 재무제표
+
+        Returns:
+            {'rcept_no', 'lines': 계정 행, 'financial_statements': 엑셀/차트 형식,
+             'items': 비율 계산용 재무 데이터}
+        """
+        filing = await self.load(corp_code, bsns_year, reprt_code, fs_div)
+        rows = []
+        if filing:
+            store = await self._get_store()
+            rows = await asyncio.to_thread(store.lines, corp_code, bsns_year, reprt_code, fs_div)
+        return {
+            'corp_code': corp_code,
+            'bsns_year': bsns_year,
+            'reprt_code': reprt_code,
+            'fs_div': fs_div,
+            'rcept_no': filing.rcept_no if filing else None,
+            'lines': rows,
+            'financial_statements': build_financial_statements(rows, bsns_year),
+            'items': statement_items(rows)
+        }
+
+    async def _get_store(self) -> StatementStore:
+        """저장소 (처음 열 때 파일 생성/스키마 확인도 스레드에서)"""
+        if self._store is None:
+            self._store = await asyncio.to_thread(get_statement_store)
+        return self._store
+
+    @staticmethod
+    def _ttl_seconds(bsns_year: str) -> float:
+        if is_settled_year(bsns_year):
+            return settings.statement_store_ttl_past_days * 86400
+        return settings.statement_store_ttl_current_hours * 3600
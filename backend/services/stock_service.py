@@ -1,7 +1,11 @@
+import asyncio
 from typing import Dict, Optional
 from backend.repositories.stock_repository import StockRepository
 from backend.repositories.krx_repository import KRXRepository
-from backend.utils.formatters import safe_float
+from backend.services.ratio_engine import calc_per_pbr
+from backend.utils.singleflight import single_flight
+
+_flights = single_flight('stock')
 
 
 class StockService:
@@ -66,6 +70,18 @@ class StockService:
 
         return stock_info
 
+    async def get_stock_info_shared(
+        self,
+        stock_code: str,
+        corp_name: Optional[str] = None,
+        bsns_year: Optional[int] = None
+    ) -> Dict:
+        """get_stock_info()를 스레드에서 실행 (같은 조건의 동시 요청은 한 번만 조회)"""
+        return await _flights.do(
+            (stock_code, corp_name, bsns_year),
+            lambda: asyncio.to_thread(self.get_stock_info, stock_code, corp_name, bsns_year)
+        )
+
     def format_stock_display(self, stock_info: Dict) -> Dict:
         """프론트엔드 표시용 포맷팅
 
@@ -249,43 +265,8 @@ class StockService:
             }
         
         try:
-            # 계정별 금액 추출
-            items = financial_data.get('items', [])
-            accts = {
-                i.get('base_display_name'): {
-                    'thstrm': safe_float(i.get('thstrm_amount')),
-                    'frmtrm': safe_float(i.get('frmtrm_amount')),
-                    'bfefrmtrm': safe_float(i.get('bfefrmtrm_amount'))
-                }
-                for i in items
-            }
-            
-            # 당기순이익과 자본총계
-            net_profit = accts.get('당기순이익', {})
-            equity = accts.get('자본총계', {})
-            
-            # EPS, BPS 계산
-            per_data = {}
-            pbr_data = {}
-            
-            for period in ['thstrm', 'frmtrm', 'bfefrmtrm']:
-                # EPS = 당기순이익 / 주식수
-                eps = net_profit.get(period, 0) / shares if shares > 0 else 0
-                
-                # BPS = 자본총계 / 주식수
-                bps = equity.get(period, 0) / shares if shares > 0 else 0
-                
-                # PER = 주가 / EPS
-                per = stock_price / eps if eps > 0 else None
-                per_data[period] = f"{per:.2f}" if per else 'N/A'
-                
-                # PBR = 주가 / BPS
-                pbr = stock_price / bps if bps > 0 else None
-                pbr_data[period] = f"{pbr:.2f}" if pbr else 'N/A'
-            
             return {
-                'PER': per_data,
-                'PBR': pbr_data,
+                **calc_per_pbr(financial_data.get('items', []), stock_price, shares),
                 'note': None
             }
             
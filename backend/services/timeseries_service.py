@@ -0,0 +1,148 @@
+"""
+재무 시계열 서비스
+fnlttMultiAcnt 응답 하나에는 당기/전기/전전기 3개 연도가 들어 있으므로, 요청 구간을 덮는
+최소한의 사업연도(Y, Y-3, Y-6, ...)만 조회해 계정별 연도 시계열로 이어 붙입니다.
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from backend.repositories.async_dart_repository import AsyncDARTRepository
+from backend.core.logger import get_backend_logger
+from backend.utils.formatters import parse_amount
+
+logger = get_backend_logger("timeseries_service")
+
+# 사업보고서 한 건이 담는 연도 컬럼 (접두어, 사업연도 기준 경과 연수)
+PERIOD_COLUMNS = (('thstrm', 0), ('frmtrm', 1), ('bfefrmtrm', 2))
+PERIODS_PER_FILING = len(PERIOD_COLUMNS)
+
+# 한 번에 조회할 수 있는 최대 연도 수
+MAX_SERIES_YEARS = 20
+
+
+def plan_filing_years(start_year: int, end_year: int, fetched: Optional[set] = None,
+                      covered: Optional[set] = None) -> List[int]:
+    """[start_year, end_year]를 덮는 데 필요한 사업연도 (최근 연도부터)
+
+    아직 덮이지 않은 가장 최근 연도부터 3년씩 건너뛰며 고릅니다.
+    이미 조회한 사업연도(fetched)는 다시 고르지 않습니다.
+
+    Args:
+        start_year: 시작 연도
+        end_year: 종료 연도
+        fetched: 이미 조회한 사업연도
+        covered: 이미 값이 있는 연도
+    """
+    fetched = fetched or set()
+    covered = covered or set()
+    plan = []
+    year = end_year
+    while year >= start_year:
+        if year in covered or year in fetched:
+            year -= 1
+            continue
+        plan.append(year)
+        year -= PERIODS_PER_FILING
+    return plan
+
+
+def stitch_filings(filings: Dict[int, List[Dict]], start_year: int, end_year: int) -> Tuple[Dict, Dict[int, int]]:
+    """사업연도별 재무 데이터를 계정별 연도 시계열로 합침
+
+    같은 연도 값이 여러 보고서에 있으면 가장 최근 보고서(재작성된 값)를 우선합니다.
+
+    Args:
+        filings: {사업연도: 재무 데이터 리스트}
+        start_year: 시작 연도
+        end_year: 종료 연도
+
+    Returns:
+        ({(sj_div, account_nm): {'sj_div', 'account_nm', 'values': {연도: 금액}}},
+         {연도: 값을 가져온 사업연도})
+    """
+    series: Dict[Tuple[str, str], Dict] = {}
+    sources: Dict[int, int] = {}
+
+    for bsns_year in sorted(filings, reverse=True):
+        for item in filings[bsns_year]:
+            key = (item.get('sj_div', ''), item.get('account_nm', ''))
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = {'sj_div': key[0], 'account_nm': key[1], 'values': {}}
+
+            for prefix, offset in PERIOD_COLUMNS:
+                year = bsns_year - offset
+                if not start_year <= year <= end_year or year in entry['values']:
+                    continue
+                amount = parse_amount(item.get(f'{prefix}_amount'))
+                if amount is None:
+                    continue
+                entry['values'][year] = amount
+                sources.setdefault(year, bsns_year)
+
+    return series, sources
+
+
+class TimeSeriesService:
+    """계정별 연도 시계열 조회"""
+
+    def __init__(self, dart_repo: AsyncDARTRepository):
+        self.dart_repo = dart_repo
+
+    async def get_account_series(
+        self,
+        corp_code: str,
+        start_year: int,
+        end_year: int,
+        fs_div: str = 'CFS'
+    ) -> Dict:
+        """계정별 연도 시계열
+
+        3년 간격으로 계획한 사업연도를 동시에 조회하고, 아직 제출되지 않은 보고서 등으로
+        중간에 빈 연도가 남으면 그 연도부터 다시 계획해 보충합니다.
+
+        Args:
+            corp_code: 기업 고유번호
+            start_year: 시작 연도
+            end_year: 종료 연도
+            fs_div: 재무제표 구분 (CFS: 연결, OFS: 별도)
+
+        Returns:
+            {'years': [...], 'series': [{'sj_div', 'account_nm', 'values': {연도: 금액}}],
+             'sources': {연도: 사업연도}, 'requests': 조회한 사업연도 수}
+        """
+        if start_year > end_year:
+            raise ValueError("시작 연도가 종료 연도보다 늦습니다")
+        if end_year - start_year + 1 > MAX_SERIES_YEARS:
+            raise ValueError(f"최대 {MAX_SERIES_YEARS}년까지 조회할 수 있습니다")
+
+        filings: Dict[int, List[Dict]] = {}
+        sources: Dict[int, int] = {}
+        plan = plan_filing_years(start_year, end_year)
+        while plan:
+            results = await asyncio.gather(*(
+                self.dart_repo.get_financial_data(corp_code, str(year), fs_div) for year in plan
+            ))
+            filings.update(zip(plan, results))
+            series, sources = stitch_filings(filings, start_year, end_year)
+            if not sources:
+                break
+            # 가장 오래된 값보다 최근의 빈 연도만 보충 (그 이전은 공시 이전으로 간주)
+            plan = plan_filing_years(min(sources), end_year, fetched=set(filings), covered=set(sources))
+
+        logger.info(f"시계열 조회 {corp_code} {start_year}~{end_year}: 사업연도 {sorted(filings)}")
+        years = list(range(start_year, end_year + 1))
+        return {
+            'corp_code': corp_code,
+            'fs_div': fs_div,
+            'years': [str(year) for year in years],
+            'series': [
+                {
+                    'sj_div': entry['sj_div'],
+                    'account_nm': entry['account_nm'],
+                    'values': {str(year): entry['values'].get(year) for year in years}
+                }
+                for entry in series.values()
+            ],
+            'sources': {str(year): str(bsns_year) for year, bsns_year in sorted(sources.items())},
+            'requests': len(filings)
+        }
@@ -0,0 +1,287 @@
+"""
+최근 4분기 합산(TTM) 서비스
+분기/반기/사업보고서의 누적(YTD) 금액을 기간별로 모아 두고 최근 12개월 금액을 계산합니다.
+
+    TTM(Y, 4) = YTD(Y, 4)
+    TTM(Y, q) = YTD(Y, q) + YTD(Y-1, 4) - YTD(Y-1, q)   (q = 1, 2, 3)
+
+새 보고서가 들어오면 값이 바뀐 누적 기간에 걸친 TTM 구간만 다시 계산합니다.
+재무상태표 계정은 합산하지 않고 기말 잔액을 그대로 씁니다.
+
+누적 금액이 빠진 반기/3분기 손익은 3개월 금액을 누적으로 쓰지 않고
+YTD(Y, q) = YTD(Y, q-1) + 3개월(Y, q)로 복원하며, 직전 누적이 없으면 비워 둡니다.
+1분기는 3개월 금액이 곧 누적 금액입니다.
+"""
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from backend.repositories.async_dart_repository import AsyncDARTRepository
+from backend.repositories.dart_repository import REPORT_QUARTERS
+from backend.core.logger import get_backend_logger
+from backend.utils.formatters import parse_amount
+
+logger = get_backend_logger("ttm_service")
+
+Period = Tuple[int, int]  # (연도, 분기)
+AccountKey = Tuple[str, str]  # (sj_div, account_nm)
+
+# 잔액 계정 (기말 시점 값)
+BALANCE_SJ_DIVS = ('BS',)
+
+# 조회할 연도 수 (최근 기간과 1년 전, 2년 전 TTM 계산용)
+TTM_LOOKBACK_YEARS = 3
+
+# 메모리에 유지할 엔진 수 (기업/재무제표 구분별)
+MAX_ENGINES = 256
+
+
+def period_label(period: Period) -> str:
+    """기간 표시 (예: 2025Q2)"""
+    return f"{period[0]}Q{period[1]}"
+
+
+def affected_windows(period: Period) -> List[Period]:
+    """누적 기간 값이 바뀌었을 때 다시 계산할 TTM 구간"""
+    year, quarter = period
+    if quarter == 4:
+        return [period] + [(year + 1, q) for q in (1, 2, 3)]
+    return [period, (year + 1, quarter)]
+
+
+class TTMEngine:
+    """한 기업/재무제표 구분의 누적 금액과 TTM
+
+    같은 기간 값이 여러 보고서에 있으면 가장 최근 보고서(정정/재작성 값)를 우선합니다.
+    """
+
+    def __init__(self):
+        self._ytd: Dict[AccountKey, Dict[Period, Tuple[float, Period]]] = {}
+        # 누적 금액 없이 3개월 금액만 온 반기/3분기 값
+        self._three_month: Dict[AccountKey, Dict[Period, Tuple[float, Period]]] = {}
+        self._balance: Dict[AccountKey, Dict[Period, Tuple[float, Period]]] = {}
+        self._ttm: Dict[AccountKey, Dict[Period, float]] = {}
+        self._account_ids: Dict[AccountKey, str] = {}
+        self._applied: Set[Tuple[str, str, str]] = set()
+
+    def has_report(self, bsns_year: str, reprt_code: str, rcept_no: str) -> bool:
+        """이미 반영한 보고서인지"""
+        return (bsns_year, reprt_code, rcept_no) in self._applied
+
+    def add_report(self, bsns_year: str, reprt_code: str, items: List[Dict]) -> Set[Period]:
+        """보고서 반영 후 다시 계산한 TTM 구간 반환 (이미 반영한 보고서는 건너뜀)
+
+        Args:
+            bsns_year: 사업연도
+            reprt_code: 보고서 코드
+            items: 한 재무제표 구분의 재무 데이터 리스트
+        """
+        rcept_no = next((item.get('rcept_no', '') for item in items), '')
+        if not items or self.has_report(bsns_year, reprt_code, rcept_no):
+            return set()
+        self._applied.add((bsns_year, reprt_code, rcept_no))
+
+        year = int(bsns_year)
+        quarter = REPORT_QUARTERS[reprt_code]
+        source = (year, quarter)
+        dirty: Dict[AccountKey, Set[Period]] = {}
+
+        for item in items:
+            key = (item.get('sj_div', ''), item.get('account_nm', ''))
+            if item.get('account_id'):
+                self._account_ids[key] = item['account_id']
+
+            if key[0] in BALANCE_SJ_DIVS:
+                # 분기보고서의 전기 잔액은 전년도 기말 값
+                values = [(source, item.get('thstrm_amount')), ((year - 1, 4), item.get('frmtrm_amount'))]
+                if quarter == 4:
+                    values.append(((year - 2, 4), item.get('bfefrmtrm_amount')))
+                for period, value in values:
+                    self._put(self._balance, key, period, parse_amount(value), source)
+                continue
+
+            if quarter == 4:
+                values = [
+                    (source, item.get('thstrm_amount')),
+                    ((year - 1, 4), item.get('frmtrm_amount')),
+                    ((year - 2, 4), item.get('bfefrmtrm_amount')),
+                ]
+            else:
+                # 분기/반기 손익은 3개월 금액(thstrm)과 누적 금액(thstrm_add)이 함께 옴
+                values = []
+                for period, cumulative, three_month in (
+                    (source, 'thstrm_add_amount', 'thstrm_amount'),
+                    ((year - 1, quarter), 'frmtrm_add_amount', 'frmtrm_amount'),
+                ):
+                    if parse_amount(item.get(cumulative)) is not None or quarter == 1:
+                        values.append((period, item.get(cumulative) or item.get(three_month)))
+                    elif self._put(self._three_month, key, period, parse_amount(item.get(three_month)), source):
+                        dirty.setdefault(key, set()).add(period)
+            for period, value in values:
+                if self._put(self._ytd, key, period, parse_amount(value), source):
+                    dirty.setdefault(key, set()).add(period)
+
+        recomputed: Set[Period] = set()
+        for key, periods in dirty.items():
+            # 같은 해 뒤 분기의 복원 누적 금액도 바뀜
+            periods = periods | {(y, later) for y, q in periods if q < 3 for later in range(q + 1, 4)}
+            for window in {w for period in periods for w in affected_windows(period)}:
+                self._recompute(key, window)
+                recomputed.add(window)
+        return recomputed
+
+    def periods(self) -> List[Period]:
+        """TTM 또는 잔액이 있는 기간 (오래된 순)"""
+        found = {p for values in self._ttm.values() for p in values}
+        found |= {p for values in self._balance.values() for p in values}
+        return sorted(found)
+
+    def latest_period(self) -> Optional[Period]:
+        """TTM을 계산할 수 있는 가장 최근 기간"""
+        found = {p for values in self._ttm.values() for p in values}
+        return max(found) if found else None
+
+    def series(self, periods: List[Period]) -> List[Dict]:
+        """계정별 기간 시계열 (손익은 TTM, 재무상태표는 기말 잔액)"""
+        rows = []
+        for key, values in self._ttm.items():
+            rows.append(self._series_row(key, 'flow', {p: values.get(p) for p in periods}))
+        for key, values in self._balance.items():
+            rows.append(self._series_row(key, 'balance', {p: values[p][0] if p in values else None for p in periods}))
+        return rows
+
+    def items(self, period: Period) -> List[Dict]:
+        """period 기준 재무 데이터 (fnlttMultiAcnt 형식, 전기/전전기는 1년/2년 전 같은 분기)"""
+        year, quarter = period
+        columns = (('thstrm', period), ('frmtrm', (year - 1, quarter)), ('bfefrmtrm', (year - 2, quarter)))
+        rows = []
+        for key, values in list(self._ttm.items()) + [
+            (key, {p: v[0] for p, v in balance.items()}) for key, balance in self._balance.items()
+        ]:
+            if period not in values:
+                continue
+            row = {'sj_div': key[0], 'account_nm': key[1], 'account_id': self._account_ids.get(key, '')}
+            for prefix, column_period in columns:
+                value = values.get(column_period)
+                row[f'{prefix}_amount'] = f"{round(value):,}" if value is not None else ''
+            rows.append(row)
+        return rows
+
+    def _put(self, store: Dict, key: AccountKey, period: Period, value: Optional[float], source: Period) -> bool:
+        """값 기록 (더 최근 보고서의 값이 이미 있으면 무시), 값이 바뀌었으면 True"""
+        if value is None:
+            return False
+        values = store.setdefault(key, {})
+        current = values.get(period)
+        if current is not None and (current[1] > source or current[0] == value):
+            return False
+        values[period] = (value, source)
+        return True
+
+    def _ytd_value(self, key: AccountKey, period: Period) -> Optional[float]:
+        """누적 금액 (보고된 값, 없으면 직전 누적 + 3개월 금액으로 복원)"""
+        entry = self._ytd.get(key, {}).get(period)
+        if entry is not None:
+            return entry[0]
+        three_month = self._three_month.get(key, {}).get(period)
+        if three_month is None:
+            return None
+        previous = self._ytd_value(key, (period[0], period[1] - 1))
+        return previous + three_month[0] if previous is not None else None
+
+    def _recompute(self, key: AccountKey, window: Period):
+        year, quarter = window
+
+        def value(period: Period) -> Optional[float]:
+            return self._ytd_value(key, period)
+
+        if quarter == 4:
+            parts = [value(window)]
+            ttm = parts[0]
+        else:
+            parts = [value(window), value((year - 1, 4)), value((year - 1, quarter))]
+            ttm = parts[0] + parts[1] - parts[2] if None not in parts else None
+
+        values = self._ttm.setdefault(key, {})
+        if ttm is None:
+            values.pop(window, None)
+        else:
+            values[window] = ttm
+
+    def _series_row(self, key: AccountKey, kind: str, values: Dict[Period, Optional[float]]) -> Dict:
+        return {
+            'sj_div': key[0],
+            'account_nm': key[1],
+            'kind': kind,
+            'values': {period_label(p): v for p, v in values.items()}
+        }
+
+
+# (corp_code, fs_div) -> TTMEngine, 최근 사용 순
+_engines: 'OrderedDict[Tuple[str, str], TTMEngine]' = OrderedDict()
+
+
+def _get_engine(corp_code: str, fs_div: str) -> TTMEngine:
+    key = (corp_code, fs_div)
+    engine = _engines.get(key)
+    if engine is None:
+        engine = _engines[key] = TTMEngine()
+        while len(_engines) > MAX_ENGINES:
+            _engines.popitem(last=False)
+    else:
+        _engines.move_to_end(key)
+    return engine
+
+
+class TTMService:
+    """분기/반기/사업보고서 기반 TTM 조회"""
+
+    def __init__(self, dart_repo: AsyncDARTRepository):
+        self.dart_repo = dart_repo
+
+    async def get_ttm(self, corp_code: str, fs_div: str = 'CFS', end_year: Optional[int] = None) -> Dict:
+        """최근 TTM과 기간별 시계열
+
+        최근 연도들의 모든 정기보고서를 동시에 조회해 엔진에 반영합니다.
+        보고서는 응답 캐시와 엔진의 반영 기록을 거치므로 새로 제출된 보고서만 다시 계산됩니다.
+
+        Args:
+            corp_code: 기업 고유번호
+            fs_div: 재무제표 구분 (CFS: 연결, OFS: 별도)
+            end_year: 마지막 사업연도 (기본: 올해)
+
+        Returns:
+            {'period', 'periods', 'items', 'series', 'recomputed'}
+        """
+        end_year = end_year or datetime.now().year
+        requests = [
+            (str(year), reprt_code)
+            for year in range(end_year - TTM_LOOKBACK_YEARS + 1, end_year + 1)
+            for reprt_code in REPORT_QUARTERS
+        ]
+        results = await asyncio.gather(*(
+            self.dart_repo.get_financial_statements(corp_code, year, reprt_code) for year, reprt_code in requests
+        ), return_exceptions=True)
+
+        engine = _get_engine(corp_code, fs_div)
+        recomputed: Set[Period] = set()
+        # 오래된 보고서부터 반영해야 같은 기간은 최근 보고서 값이 남음
+        ordered = sorted(zip(requests, results), key=lambda r: (r[0][0], REPORT_QUARTERS[r[0][1]]))
+        for (year, reprt_code), statements in ordered:
+            if isinstance(statements, Exception):
+                logger.warning(f"TTM 보고서 조회 실패 {corp_code} {year}/{reprt_code}: {statements}")
+                continue
+            recomputed |= engine.add_report(year, reprt_code, statements.get(fs_div, []))
+
+        latest = engine.latest_period()
+        periods = [p for p in engine.periods() if latest is None or p <= latest]
+        logger.info(f"TTM {corp_code} {fs_div}: 최근 {latest}, 다시 계산한 구간 {len(recomputed)}개")
+        return {
+            'corp_code': corp_code,
+            'fs_div': fs_div,
+            'period': period_label(latest) if latest else None,
+            'periods': [period_label(p) for p in periods],
+            'items': engine.items(latest) if latest else [],
+            'series': engine.series(periods),
+            'recomputed': len(recomputed)
+        }
@@ -2,19 +2,23 @@ import os
 import tempfile
 from typing import Dict, List, Optional
 from bs4 import BeautifulSoup
-from backend.repositories.dart_repository import DARTRepository
+from backend.repositories.async_dart_repository import AsyncDARTRepository
+from backend.repositories.dart_scheduler import interactive_context
 from backend.core.llm.upstage import UpstageProvider
 from backend.core.exceptions import DARTAPIException, LLMException
 from backend.core.config import settings
 from backend.core.logger import get_backend_logger
+from backend.utils.singleflight import single_flight
 
 logger = get_backend_logger("unlisted_financial_service")
 
+_flights = single_flight('unlisted_financial')
+
 
 class UnlistedFinancialService:
     """비상장 기업 재무정보 파싱 서비스"""
 
-    def __init__(self, dart_repo: DARTRepository, upstage_provider: UpstageProvider):
+    def __init__(self, dart_repo: AsyncDARTRepository, upstage_provider: UpstageProvider):
         self.dart_repo = dart_repo
         self.upstage = upstage_provider
 
@@ -34,11 +38,25 @@ class UnlistedFinancialService:
         Returns:
             재무 데이터 리스트 (상장 기업 형식과 동일)
         """
+        # 문서 다운로드와 LLM 파싱은 비용이 크므로 같은 회사/연도 동시 요청은 한 번만 실행
+        return await _flights.do(
+            (self.dart_repo.key_id, corp_code, bsns_year),
+            lambda: self._extract_unlisted_financial_data(corp_code, corp_name, bsns_year),
+            interactive_context()
+        )
+
+    async def _extract_unlisted_financial_data(
+        self,
+        corp_code: str,
+        corp_name: str,
+        bsns_year: str
+    ) -> List[Dict]:
+        """보고서 검색 → 문서 다운로드 → 재무제표 추출"""
         try:
             logger.info(f"Getting unlisted financial data for {corp_name} ({bsns_year})")
 
             # 1. 사업보고서/감사보고서 검색
-            reports = self.dart_repo.search_report_documents(corp_code, bsns_year)
+            reports = await self.dart_repo.search_report_documents(corp_code, bsns_year)
 
             if not reports:
                 logger.warning(f"No reports found for {corp_name} ({bsns_year})")
@@ -64,7 +82,7 @@ class UnlistedFinancialService:
             html_path = os.path.join(temp_dir, f"{corp_code}_{bsns_year}_{rcept_no}.html")
 
             logger.info(f"Downloading document to {html_path}")
-            self.dart_repo.download_document(rcept_no, html_path)
+            await self.dart_repo.download_document(rcept_no, html_path)
 
             try:
                 # 4. HTML 파싱하여 재무제표 테이블 추출
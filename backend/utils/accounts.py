@@ -0,0 +1,58 @@
+"""
+계정 표준화
+DART 표준계정코드를 화면/비율 계산에 쓰는 기본 표시명으로 바꿉니다.
+"""
+
+# 계정 ID 매핑
+ACCOUNT_ID_MAP = {
+    'ifrs-full_Assets': '자산총계',
+    'ifrs-full_Liabilities': '부채총계',
+    'ifrs-full_Equity': '자본총계',
+    'ifrs-full_Revenue': '매출액',
+    'dart_OperatingIncomeLoss': '영업이익',
+    'ifrs-full_ProfitLoss': '당기순이익',
+    'dart_ProfitLossAttributableToOwnersOfParent': '당기순이익',
+    'ifrs-full_ProfitLossAttributableToOwnersOfParent': '당기순이익',
+}
+
+# 같은 기본 표시명의 줄이 여러 개일 때 먼저 쓸 계정 ID (당기순이익은 지배기업 소유주 귀속분 우선)
+ACCOUNT_ID_PRIORITY = (
+    'ifrs-full_ProfitLossAttributableToOwnersOfParent',
+    'dart_ProfitLossAttributableToOwnersOfParent',
+)
+
+# 이름에 '당기순이익'이 있어도 당기순이익이 아닌 계정 (비지배지분 귀속분, 주당이익)
+NET_INCOME_EXCLUDED_WORDS = ('비지배', '주당')
+
+# 이전 IFRS 택소노미 접두어 (일괄 다운로드 자료의 과거 연도에 남아 있음)
+LEGACY_IFRS_PREFIX = 'ifrs_'
+IFRS_PREFIX = 'ifrs-full_'
+
+
+def normalize_account_id(account_id: str) -> str:
+    """표준계정코드 정리 (이전 IFRS 접두어를 현재 접두어로)"""
+    account_id = (account_id or '').strip()
+    if account_id.startswith(LEGACY_IFRS_PREFIX):
+        return IFRS_PREFIX + account_id[len(LEGACY_IFRS_PREFIX):]
+    return account_id
+
+
+def base_display_name(account_id: str, account_nm: str) -> str:
+    """기본 표시명 (매핑된 계정은 표준 이름, 그 외는 계정명)"""
+    if account_id in ACCOUNT_ID_MAP:
+        return ACCOUNT_ID_MAP[account_id]
+    if '당기순이익' in account_nm and not any(word in account_nm for word in NET_INCOME_EXCLUDED_WORDS):
+        return '당기순이익'
+    return account_nm
+
+
+def account_rank(account_id: str) -> int:
+    """같은 기본 표시명의 줄 중 비율 계산에 쓸 줄을 고르는 순위 (작을수록 우선)
+
+    우선순위 계정 ID, 그 외 매핑된 계정 ID, 계정명으로만 맞춘 줄 순입니다.
+    """
+    if account_id in ACCOUNT_ID_PRIORITY:
+        return ACCOUNT_ID_PRIORITY.index(account_id)
+    if account_id in ACCOUNT_ID_MAP:
+        return len(ACCOUNT_ID_PRIORITY)
+    return len(ACCOUNT_ID_PRIORITY) + 1
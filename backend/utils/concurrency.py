@@ -0,0 +1,32 @@
+"""비동기 작업 동시 실행 유틸리티"""
+import asyncio
+from typing import Awaitable, Callable, List, Optional, TypeVar, Union
+
+T = TypeVar('T')
+
+
+async def gather_bounded(
+    factories: List[Callable[[], Awaitable[T]]],
+    limit: int,
+    timeout: Optional[float] = None
+) -> List[Union[T, BaseException]]:
+    """작업을 최대 limit개씩 동시에 실행 (작업별 제한 시간 적용)
+
+    작업 하나가 실패하거나 시간을 넘겨도 나머지는 계속 진행하고,
+    실패한 자리에는 예외 객체를 돌려줍니다 (시간 초과는 asyncio.TimeoutError).
+
+    Args:
+        factories: 호출하면 코루틴을 만드는 함수 (세마포어를 얻은 뒤에 호출)
+        limit: 최대 동시 실행 수
+        timeout: 작업 하나의 제한 시간 (초, 없으면 무제한)
+
+    Returns:
+        factories 순서의 결과 또는 예외
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await asyncio.wait_for(factory(), timeout)
+
+    return await asyncio.gather(*(run(factory) for factory in factories), return_exceptions=True)
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 def format_number(value) -> str:
     """숫자 포맷팅 (쉼표 추가)"""
     try:
@@ -24,3 +27,14 @@ def safe_int(value) -> int:
         return int(float(value)) if value else 0
     except:
         return 0
+
+
+def parse_amount(value) -> Optional[float]:
+    """금액 문자열 변환 (비어 있거나 숫자가 아니면 None)"""
+    if value is None:
+        return None
+    try:
+        value = str(value).replace(',', '').strip()
+        return float(value) if value and value != '-' else None
+    except ValueError:
+        return None
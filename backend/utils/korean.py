@@ -0,0 +1,126 @@
+"""한글 자모 처리 유틸리티 (초성 추출, 자모 분해/조합, 회사명 정규화)"""
+from functools import lru_cache
+
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSUNG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSUNG = (
+    '', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+    'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'
+)
+
+# 겹모음/겹받침 → 기본 자모
+COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+_COMBINE_JAMO = {v: k for k, v in COMPOUND_JAMO.items()}
+
+# 회사명 비교 시 무시할 법인 형태 표기
+CORP_NAME_AFFIXES = ('주식회사', '유한회사', '(주)', '(유)', '㈜')
+
+_CHO_INDEX = {ch: i for i, ch in enumerate(CHOSUNG)}
+_JUNG_INDEX = {ch: i for i, ch in enumerate(JUNGSUNG)}
+_JONG_INDEX = {ch: i for i, ch in enumerate(JONGSUNG) if ch}
+
+
+def is_syllable(ch: str) -> bool:
+    """완성형 한글 음절 여부"""
+    return HANGUL_BASE <= ord(ch) <= HANGUL_END
+
+
+def is_consonant(ch: str) -> bool:
+    """단독 자음(호환용 자모) 여부"""
+    return 'ㄱ' <= ch <= 'ㅎ'
+
+
+def is_vowel(ch: str) -> bool:
+    """단독 모음(호환용 자모) 여부"""
+    return 'ㅏ' <= ch <= 'ㅣ'
+
+
+def has_jamo(text: str) -> bool:
+    """단독 자모 포함 여부"""
+    return any('ㄱ' <= ch <= 'ㅣ' for ch in text)
+
+
+def to_chosung(text: str) -> str:
+    """음절을 초성으로 바꾼 문자열 (길이와 위치는 원문과 동일)"""
+    return ''.join(
+        CHOSUNG[(ord(ch) - HANGUL_BASE) // 588] if HANGUL_BASE <= ord(ch) <= HANGUL_END else ch
+        for ch in text
+    )
+
+
+@lru_cache(maxsize=None)
+def _decompose_char(ch: str) -> str:
+    """한 글자 자모 분해 (음절 수가 한정되어 있으므로 캐시)"""
+    if HANGUL_BASE <= ord(ch) <= HANGUL_END:
+        offset = ord(ch) - HANGUL_BASE
+        jamo = CHOSUNG[offset // 588] + JUNGSUNG[(offset % 588) // 28] + JONGSUNG[offset % 28]
+        return ''.join(COMPOUND_JAMO.get(j, j) for j in jamo)
+    return COMPOUND_JAMO.get(ch, ch)
+
+
+def decompose(text: str) -> str:
+    """음절을 기본 자모 단위로 분해 (겹모음/겹받침도 분해)"""
+    return ''.join(_decompose_char(ch) for ch in text)
+
+
+def compose(text: str) -> str:
+    """풀어 쓴 자모를 음절로 조합 ("ㅅㅏㅁㅅㅓㅇ" → "삼성")
+
+    모음이 뒤따르지 않는 자음은 초성 검색어로 보고 그대로 둡니다.
+    이미 완성된 음절은 건드리지 않습니다.
+    """
+    if not has_jamo(text):
+        return text
+
+    result = []
+    i, n = 0, len(text)
+
+    def followed_by_vowel(pos: int) -> bool:
+        return pos + 1 < n and is_vowel(text[pos + 1])
+
+    while i < n:
+        ch = text[i]
+        if ch not in _CHO_INDEX or not followed_by_vowel(i):
+            result.append(ch)
+            i += 1
+            continue
+
+        cho = ch
+        jung = text[i + 1]
+        i += 2
+        if i < n and jung + text[i] in _COMBINE_JAMO:
+            jung = _COMBINE_JAMO[jung + text[i]]
+            i += 1
+
+        jong = ''
+        if i < n and text[i] in _JONG_INDEX and not followed_by_vowel(i):
+            jong = text[i]
+            i += 1
+            if i < n and jong + text[i] in _COMBINE_JAMO and not followed_by_vowel(i):
+                jong = _COMBINE_JAMO[jong + text[i]]
+                i += 1
+
+        result.append(chr(
+            HANGUL_BASE
+            + _CHO_INDEX[cho] * 588
+            + _JUNG_INDEX[jung] * 28
+            + (_JONG_INDEX[jong] if jong else 0)
+        ))
+
+    return ''.join(result)
+
+
+def normalize_name(text: str) -> str:
+    """회사명 비교용 정규화 (소문자, 법인 형태 표기/공백/기호 제거)"""
+    text = text.lower()
+    for affix in CORP_NAME_AFFIXES:
+        if affix in text:
+            text = text.replace(affix, '')
+    return ''.join(ch for ch in text if ch.isalnum())
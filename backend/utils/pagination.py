@@ -0,0 +1,81 @@
+"""커서 기반 페이지네이션 유틸리티"""
+import base64
+import hashlib
+import json
+from typing import Iterable, List, Optional, Tuple
+from backend.core.exceptions import InvalidCursorException
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def query_key(*parts) -> str:
+    """커서를 특정 조회 조건에 묶기 위한 짧은 키"""
+    return hashlib.sha1('\x1f'.join(str(p) for p in parts).encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(offset: int, version: str, key: str) -> str:
+    """불투명 커서 생성 (base64url, 패딩 없음)"""
+    payload = json.dumps({'o': offset, 'v': version, 'q': key}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: Optional[str], version: str, key: str) -> int:
+    """커서를 오프셋으로 해석
+
+    Args:
+        cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+        version: 현재 데이터 버전
+        key: 현재 조회 조건 키
+
+    Returns:
+        시작 오프셋
+
+    Raises:
+        InvalidCursorException: 형식 오류, 다른 조회 조건, 데이터 갱신으로 만료된 커서
+    """
+    if not cursor:
+        return 0
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        offset = int(payload['o'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorException(f"잘못된 커서입니다: {e}")
+
+    if offset < 0 or payload.get('q') != key:
+        raise InvalidCursorException("다른 조회 조건의 커서입니다")
+    if payload.get('v') != version:
+        raise InvalidCursorException("목록이 갱신되어 커서가 만료되었습니다. 첫 페이지부터 다시 조회하세요")
+    return offset
+
+
+def page_slice(total: int, cursor: Optional[str], limit: int, version: str, key: str) -> Tuple[int, int, Optional[str]]:
+    """페이지 구간과 다음 커서 계산
+
+    Returns:
+        (시작, 끝, 다음 커서 또는 None)
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    start = min(decode_cursor(cursor, version, key), total)
+    end = min(start + limit, total)
+    next_cursor = encode_cursor(end, version, key) if end < total else None
+    return start, end, next_cursor
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> List[str]:
+    """쉼표로 구분한 필드 선택 (없으면 전체)
+
+    Raises:
+        ValueError: 허용되지 않은 필드
+    """
+    allowed = list(allowed)
+    if not fields:
+        return allowed
+
+    selected = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in selected if f not in allowed]
+    if unknown:
+        raise ValueError(f"지원하지 않는 필드: {', '.join(unknown)} (가능: {', '.join(allowed)})")
+    return selected or allowed
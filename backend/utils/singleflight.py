@@ -0,0 +1,79 @@
+"""
+동시 요청 합치기 (single-flight)
+같은 키로 동시에 들어온 호출은 먼저 시작된 외부 호출 하나를 함께 기다리고 그 결과를 나눠 씁니다.
+결과는 호출이 끝나면 바로 버리므로 캐시가 아니라 진행 중인 호출의 공유입니다.
+"""
+import asyncio
+from contextvars import Context
+from typing import Callable, Coroutine, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """키별 진행 중 호출 공유
+
+    먼저 온 호출이 작업을 태스크로 띄우고, 나중에 온 호출은 같은 태스크를 기다립니다.
+    기다리던 요청이 취소되어도(클라이언트 연결 종료 등) 공유 작업은 계속 진행됩니다.
+    반환값은 모든 호출자가 같은 객체를 받으므로 호출자가 고쳐 쓰지 않아야 합니다.
+    공유 작업은 먼저 온 호출의 컨텍스트 변수를 물려받으므로, 호출자마다 달라지는 값(호출 등급 등)은
+    context로 정해 두어야 합니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0  # 실제로 실행한 작업 수
+        self.shared = 0  # 진행 중인 작업에 합류한 호출 수
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[], Coroutine[object, object, T]],
+        context: Optional[Context] = None
+    ) -> T:
+        """key로 진행 중인 작업이 있으면 그 결과를, 없으면 factory()를 실행한 결과를 반환
+
+        Args:
+            key: 작업 식별자 (결과가 달라질 수 있는 값은 모두 넣어야 함)
+            factory: 작업 코루틴을 만드는 함수
+            context: 공유 작업을 실행할 컨텍스트 (없으면 먼저 온 호출의 컨텍스트)
+        """
+        task = self._calls.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.shared += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.get_running_loop().create_task(factory(), context=context)
+        self._calls[key] = task
+        self.started += 1
+
+        def forget(done: asyncio.Task):
+            if self._calls.get(key) is done:
+                del self._calls[key]
+            # 모든 호출자가 취소된 경우에도 예외가 "retrieved"로 처리되도록
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict:
+        """실행/합류 횟수와 진행 중인 작업 수"""
+        return {'in_flight': len(self._calls), 'started': self.started, 'shared': self.shared}
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def single_flight(name: str) -> SingleFlight:
+    """이름별 프로세스 공유 SingleFlight"""
+    flight = _flights.get(name)
+    if flight is None:
+        flight = _flights[name] = SingleFlight(name)
+    return flight
+
+
+def single_flight_stats() -> Dict[str, Dict]:
+    """전체 SingleFlight 통계"""
+    return {name: flight.stats() for name, flight in _flights.items()}
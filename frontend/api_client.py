@@ -18,21 +18,58 @@ class APIClient:
         """API 요청 헤더"""
         return {"X-DART-API-Key": api_key}
     
-    def download_companies(self, api_key: str, force_refresh: bool = False) -> dict:
-        """전체 기업 목록 다운로드"""
+    def download_companies(
+        self,
+        api_key: str,
+        force_refresh: bool = False,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[str] = None,
+        listed_only: bool = False
+    ) -> dict:
+        """기업 목록 한 페이지 다운로드 (다음 페이지는 응답의 next_cursor로 조회)"""
+        params = {"force_refresh": force_refresh, "listed_only": listed_only}
+        if cursor:
+            params["cursor"] = cursor
+        if limit:
+            params["limit"] = limit
+        if fields:
+            params["fields"] = fields
         response = requests.get(
             f"{self.base_url}/api/companies/list",
-            params={"force_refresh": force_refresh},
+            params=params,
             headers=self._get_headers(api_key)
         )
         response.raise_for_status()
         return response.json()
     
-    def search_companies(self, keyword: str, api_key: str) -> List[Dict]:
-        """기업 검색"""
+    def search_companies(
+        self,
+        keyword: str,
+        api_key: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        listed_only: bool = False
+    ) -> Dict:
+        """기업 검색 (한 페이지, 다음 페이지는 응답의 next_cursor로 조회)"""
+        params = {"keyword": keyword, "listed_only": listed_only}
+        if cursor:
+            params["cursor"] = cursor
+        if limit:
+            params["limit"] = limit
         response = requests.get(
             f"{self.base_url}/api/companies/search",
-            params={"keyword": keyword},
+            params=params,
+            headers=self._get_headers(api_key)
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def autocomplete_companies(self, prefix: str, api_key: str, k: int = 10) -> Dict:
+        """기업명 자동완성 (상위 k개)"""
+        response = requests.get(
+            f"{self.base_url}/api/companies/autocomplete",
+            params={"prefix": prefix, "k": k},
             headers=self._get_headers(api_key)
         )
         response.raise_for_status()
@@ -43,17 +80,66 @@ class APIClient:
         corp_code: str,
         bsns_year: str,
         fs_div: str,
-        api_key: str
+        api_key: str,
+        reprt_code: str = "11011"
     ) -> dict:
-        """재무 데이터 조회"""
+        """재무 데이터 조회 (fs_div="ALL"이면 연결/별도를 statements에 함께 반환)
+
+        reprt_code: 11011 사업보고서, 11012 반기, 11013 1분기, 11014 3분기
+        """
         response = requests.get(
             f"{self.base_url}/api/financial/{corp_code}",
-            params={"bsns_year": bsns_year, "fs_div": fs_div},
+            params={"bsns_year": bsns_year, "fs_div": fs_div, "reprt_code": reprt_code},
             headers=self._get_headers(api_key)
         )
         response.raise_for_status()
         return response.json()
     
+    def get_financial_ttm(self, corp_code: str, fs_div: str, api_key: str) -> dict:
+        """최근 4분기 합산(TTM) 재무 데이터 조회"""
+        response = requests.get(
+            f"{self.base_url}/api/financial/{corp_code}/ttm",
+            params={"fs_div": fs_div},
+            headers=self._get_headers(api_key)
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def get_financial_timeseries(
+        self,
+        corp_code: str,
+        start_year: int,
+        end_year: int,
+        fs_div: str,
+        api_key: str
+    ) -> dict:
+        """계정별 연도 시계열 조회"""
+        response = requests.get(
+            f"{self.base_url}/api/financial/{corp_code}/timeseries",
+            params={"start_year": start_year, "end_year": end_year, "fs_div": fs_div},
+            headers=self._get_headers(api_key)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def screen_companies(
+        self,
+        expression: str,
+        year: int = None,
+        fs_div: str = "CFS",
+        sort: str = None,
+        limit: int = 100
+    ) -> dict:
+        """조건식으로 전체 상장사 검색 (일괄 자료 기준)"""
+        params = {"q": expression, "fs_div": fs_div, "limit": limit}
+        if year:
+            params["year"] = year
+        if sort:
+            params["sort"] = sort
+        response = requests.get(f"{self.base_url}/api/screen", params=params)
+        response.raise_for_status()
+        return response.json()
+    
     def get_stock_info(
         self,
         corp_code: str,
@@ -116,12 +202,13 @@ class APIClient:
         response.raise_for_status()
         return response.json()
     
-    def download_excel(self, companies: List[Dict]) -> bytes:
+    def download_excel(self, companies: List[Dict], api_key: Optional[str] = None) -> bytes:
         """
         재무 데이터를 엑셀 파일로 다운로드
         
         Args:
             companies: 회사 정보 및 재무 데이터 리스트
+            api_key: DART API 키 (있으면 상장 기업은 corp_code/bsns_year 기준 전체 재무제표 사용)
         
         Returns:
             bytes: 엑셀 파일 바이너리
@@ -130,7 +217,8 @@ class APIClient:
         
         response = requests.post(
             f"{self.base_url}/api/financial/download-excel",
-            json=payload
+            json=payload,
+            headers=self._get_headers(api_key) if api_key else None
         )
         response.raise_for_status()
         return response.content
@@ -41,8 +41,9 @@ def render_company_selector(api_client, dart_api_key: str):
     if search_btn and keyword:
         with st.spinner("검색 중..."):
             try:
-                results = api_client.search_companies(keyword, dart_api_key)
-                st.session_state.search_results = results
+                response = api_client.search_companies(keyword, dart_api_key, limit=50)
+                st.session_state.search_results = response.get('companies', [])
+                st.session_state.search_total = response.get('total', 0)
             except Exception as e:
                 st.error(f"검색 실패: {str(e)}")
                 st.session_state.search_results = []
@@ -50,9 +51,9 @@ def render_company_selector(api_client, dart_api_key: str):
     # 검색 결과 표시
     if 'search_results' in st.session_state and st.session_state.search_results:
         results = st.session_state.search_results
-        st.success(f"✅ {len(results)}개의 결과를 찾았습니다.")
+        st.success(f"✅ {st.session_state.get('search_total', len(results))}개의 결과를 찾았습니다.")
         
-        for idx, company in enumerate(results[:50]):  # 최대 50개
+        for idx, company in enumerate(results):  # 첫 페이지 최대 50개
             col1, col2, col3, col4 = st.columns([2.5, 1, 1, 1.2])
             
             is_listed = company.get('stock_code') != 'N/A'
@@ -647,6 +647,27 @@ if 'current_step' not in st.session_state:
     st.session_state.current_step = 1
 if 'search_page' not in st.session_state:
     st.session_state.search_page = 0
+if 'search_cursors' not in st.session_state:
+    st.session_state.search_cursors = [None]
+
+
+SEARCH_PAGE_SIZE = 20
+
+
+def load_search_page(page: int):
+    """검색 결과 한 페이지 조회 (페이지별 시작 커서는 세션에 보관)"""
+    cursors = st.session_state.search_cursors
+    response = api_client.search_companies(
+        st.session_state.search_keyword,
+        st.session_state.dart_api_key,
+        cursor=cursors[page],
+        limit=SEARCH_PAGE_SIZE
+    )
+    st.session_state.search_results = response.get('companies', [])
+    st.session_state.search_total = response.get('total', 0)
+    st.session_state.search_page = page
+    if response.get('next_cursor') and len(cursors) == page + 1:
+        cursors.append(response['next_cursor'])
 
 # API client
 @st.cache_resource
@@ -728,39 +749,38 @@ if st.session_state.current_step == 1:
     if search_btn and keyword:
         with st.spinner("검색 중..."):
             try:
-                response = api_client.search_companies(keyword, st.session_state.dart_api_key)
-                st.session_state.search_results = response.get('companies', [])
-                st.session_state.search_page = 0
+                st.session_state.search_keyword = keyword
+                st.session_state.search_cursors = [None]
+                load_search_page(0)
             except Exception as e:
                 st.error("검색 실패: {}".format(str(e)))
                 st.session_state.search_results = []
     
     if 'search_results' in st.session_state and st.session_state.search_results:
-        results = st.session_state.search_results
-        st.success("{}개의 결과를 찾았습니다.".format(len(results)))
+        page_results = st.session_state.search_results
+        total = st.session_state.get('search_total', len(page_results))
+        st.success("{}개의 결과를 찾았습니다.".format(total))
         
-        items_per_page = 20
-        total_pages = (len(results) - 1) // items_per_page + 1
+        total_pages = (total - 1) // SEARCH_PAGE_SIZE + 1
         current_page = st.session_state.search_page
         
-        start_idx = current_page * items_per_page
-        end_idx = min(start_idx + items_per_page, len(results))
-        page_results = results[start_idx:end_idx]
+        start_idx = current_page * SEARCH_PAGE_SIZE
+        end_idx = start_idx + len(page_results)
         
         if total_pages > 1:
             col1, col2, col3 = st.columns([1, 2, 1])
             with col1:
                 if current_page > 0:
                     if st.button("◀ 이전", key="prev_page"):
-                        st.session_state.search_page -= 1
+                        load_search_page(current_page - 1)
                         st.rerun()
             with col2:
-                st.markdown("<div style='text-align: center'>페이지 {} / {} ({}-{} / {}건)</div>".format(current_page + 1, total_pages, start_idx + 1, end_idx, len(results)), 
+                st.markdown("<div style='text-align: center'>페이지 {} / {} ({}-{} / {}건)</div>".format(current_page + 1, total_pages, start_idx + 1, end_idx, total), 
                           unsafe_allow_html=True)
             with col3:
                 if current_page < total_pages - 1:
                     if st.button("다음 ▶", key="next_page"):
-                        st.session_state.search_page += 1
+                        load_search_page(current_page + 1)
                         st.rerun()
             st.divider()
         
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+DART 재무정보 분석기 - 재무제표 일괄 자료 적재 스크립트
+DART 재무정보 일괄다운로드 파일(.txt/.zip)이 있는 디렉토리를 Parquet 저장소로 적재합니다.
+루트 디렉토리에서 실행: python run_bulk_loader.py <디렉토리> [--out data/bulk] [--force]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def main():
+    # 환경 변수 로드 (설정을 읽기 전에, 경로 설정 뒤에 import)
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    from backend.core.config import settings
+    from backend.services.bulk_loader import BATCH_ROWS, DEFAULT_ENCODING, BulkLoader
+
+    parser = argparse.ArgumentParser(description="DART 재무제표 일괄 자료를 Parquet 저장소로 적재")
+    parser.add_argument("source", help="일괄다운로드 파일(.txt/.zip) 디렉토리")
+    parser.add_argument("--out", default=settings.bulk_store_path, help="저장소 디렉토리 (기본: BULK_STORE_PATH)")
+    parser.add_argument("--force", action="store_true", help="이미 적재한 파일도 다시 적재")
+    parser.add_argument("--encoding", default=DEFAULT_ENCODING, help="원본 파일 인코딩")
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS, help="Parquet 행 그룹 크기")
+    args = parser.parse_args()
+
+    if not Path(args.source).is_dir():
+        parser.error(f"디렉토리가 아닙니다: {args.source}")
+
+    print("=" * 60)
+    print("DART 재무정보 분석기 - 재무제표 일괄 자료 적재")
+    print("=" * 60)
+    print(f"원본: {args.source}")
+    print(f"저장소: {args.out}")
+    print("=" * 60)
+
+    loader = BulkLoader(args.out, batch_rows=args.batch_rows, encoding=args.encoding)
+    summary = loader.load_directory(args.source, force=args.force)
+
+    print(f"적재: {summary['loaded']}개 파일, {summary['rows']:,}행")
+    print(f"건너뜀 (변경 없음): {summary['skipped']}개 파일")
+
+
+if __name__ == "__main__":
+    main()
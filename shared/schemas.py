@@ -17,6 +17,15 @@ class CompanySearchResponse(BaseModel):
     total: int
 
 
+class CompanyPageResponse(BaseModel):
+    """회사 목록/검색 페이지 응답 (fields로 선택한 필드만 포함)"""
+    companies: List[Dict[str, str]]
+    total: int = Field(..., description="필터 적용 후 전체 건수")
+    limit: int
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 None)")
+    fuzzy: bool = Field(False, description="일치 결과가 없어 편집 거리 기준 유사 회사명을 반환했는지 여부")
+
+
 # ==================== Financial Data ====================
 
 class FinancialItem(BaseModel):
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 프로젝트 루트의 backend 패키지를 import할 수 있도록
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
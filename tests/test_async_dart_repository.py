@@ -0,0 +1,95 @@
+"""비동기 DART 저장소의 재무정보 캐시 동작 테스트 (가짜 HTTP 클라이언트 사용)"""
+import asyncio
+import pytest
+from backend.repositories import async_dart_repository
+from backend.repositories.async_dart_repository import AsyncDARTRepository
+from backend.repositories.dart_repository import DART_STATUS_NO_DATA, DART_STATUS_OK
+from backend.repositories.financial_cache import FinancialCache
+
+YEAR, REPRT = '2020', '11011'
+
+
+class FakeScheduler:
+    async def acquire(self, api_key, priority=None):
+        pass
+
+    def observe(self, api_key, status):
+        pass
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeClient:
+    """요청마다 replies에서 응답을 꺼내 돌려줌"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    async def get(self, url, params=None, timeout=None):
+        self.requests.append(params)
+        return FakeResponse(self.replies.pop(0))
+
+
+def statement(corp_code, amount='100'):
+    return {'corp_code': corp_code, 'fs_div': 'CFS', 'account_nm': '매출액', 'thstrm_amount': amount}
+
+
+@pytest.fixture
+def make_repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(async_dart_repository, 'get_dart_scheduler', FakeScheduler)
+
+    def make(client, **cache_options):
+        repo = AsyncDARTRepository('test-key', client=client, use_cache=False)
+        repo.cache = FinancialCache(str(tmp_path / 'cache.sqlite3'), **cache_options)
+        return repo
+    return make
+
+
+def test_batch_keeps_stale_corp_revalidatable_when_missing_from_reply(make_repo):
+    client = FakeClient(
+        {'status': DART_STATUS_OK, 'list': [statement('00000002')]},
+        {'status': DART_STATUS_OK, 'list': [statement('00000001', '200')]},
+    )
+    # 유효기간/stale 구간이 0이라 저장한 항목은 곧바로 다시 조회 대상
+    repo = make_repo(client, ttl_past_days=0, ttl_current_hours=0, stale_hours=0)
+    repo.cache.put('00000001', YEAR, REPRT, {'CFS': [statement('00000001')]})
+
+    first = asyncio.run(repo.get_financial_statements_batch(['00000001', '00000002'], YEAR, REPRT))
+    assert first['00000001'] == {'CFS': [statement('00000001')]}
+
+    # 캐시 값이 있던 회사는 "데이터 없음"으로 기록되지 않아 다음 조회 때 DART에 다시 확인함
+    second = asyncio.run(repo.get_financial_statements('00000001', YEAR, REPRT))
+    assert second == {'CFS': [statement('00000001', '200')]}
+    assert len(client.requests) == 2
+
+
+def test_batch_remembers_no_data_for_uncached_corp(make_repo):
+    client = FakeClient({'status': DART_STATUS_OK, 'list': [statement('00000002')]})
+    repo = make_repo(client)
+
+    asyncio.run(repo.get_financial_statements_batch(['00000001', '00000002'], YEAR, REPRT))
+    again = asyncio.run(repo.get_financial_statements_batch(['00000001'], YEAR, REPRT))
+
+    assert again == {'00000001': {}}
+    assert len(client.requests) == 1
+
+
+def test_no_data_reply_keeps_cached_statements(make_repo):
+    client = FakeClient({'status': DART_STATUS_NO_DATA, 'message': '조회된 데이타가 없습니다.'})
+    repo = make_repo(client, ttl_past_days=0, ttl_current_hours=0, stale_hours=0)
+    repo.cache.put('00000001', YEAR, REPRT, {'CFS': [statement('00000001')]})
+    # 다른 경로(묶음 조회 등)에서 기억해 둔 "데이터 없음"도 캐시 값이 있으면 쓰지 않음
+    repo.cache.put_negative('fnlttMultiAcnt.json', 'bsns_year=2020&corp_code=00000001&reprt_code=11011',
+                            DART_STATUS_NO_DATA)
+
+    result = asyncio.run(repo.get_financial_statements('00000001', YEAR, REPRT))
+
+    assert result == {'CFS': [statement('00000001')]}
+    assert len(client.requests) == 1
@@ -0,0 +1,61 @@
+"""일괄 자료 적재 시 보고서별 기본 표시명 정리 테스트"""
+from backend.repositories.bulk_store import BulkFinancialStore
+from backend.services.bulk_loader import BulkLoader
+from backend.services.ratio_engine import calc_ratios
+from backend.utils.accounts import base_display_name
+
+HEADERS = ('재무제표종류', '종목코드', '회사명', '시장구분', '결산기준일', '보고서종류', '통화',
+           '항목코드', '항목명', '당기', '전기', '전전기')
+
+# (종목코드, 항목코드, 항목명, 금액)
+LINES = (
+    ('000001', 'ifrs-full_Revenue', '매출액', 400),
+    ('000001', 'ifrs-full_ProfitLoss', '당기순이익', 100),
+    ('000001', 'ifrs-full_ProfitLossAttributableToOwnersOfParent', '지배기업의 소유주에게 귀속되는 당기순이익', 90),
+    ('000001', 'ifrs-full_ProfitLossAttributableToNonControllingInterests', '비지배지분에 귀속되는 당기순이익', 10),
+    ('000001', '-표준계정코드 미사용-', '당기순이익', 10),
+    ('000001', 'ifrs-full_BasicEarningsPerShare', '기본주당이익', 5),
+    ('000002', 'ifrs-full_Revenue', '매출액', 200),
+    ('000002', 'ifrs-full_ProfitLoss', '당기순이익', 30),
+)
+
+
+def write_source(directory):
+    lines = ['\t'.join(HEADERS)]
+    for stock_code, account_id, account_nm, amount in LINES:
+        lines.append('\t'.join((
+            '손익계산서, 기능별 분류 - 연결재무제표', f'[{stock_code}]', f'회사{stock_code}', '유가증권시장상장법인',
+            '2023-12-31', '사업보고서', 'KRW', account_id, account_nm, str(amount), str(amount), str(amount),
+        )))
+    path = directory / '2023_사업보고서_02_손익계산서_20240612.txt'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def load(tmp_path):
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    write_source(source_dir)
+    root = str(tmp_path / 'bulk')
+    BulkLoader(root, encoding='utf-8').load_directory(str(source_dir))
+    return BulkFinancialStore(root)
+
+
+def test_only_best_ranked_row_keeps_base_name_per_filing(tmp_path):
+    store = load(tmp_path)
+
+    table = store.read_accounts('11011', 'CFS', ['당기순이익'])
+    rows = sorted(zip(table['stock_code'].to_pylist(), table['account_id'].to_pylist()))
+
+    assert rows == [
+        ('000001', 'ifrs-full_ProfitLossAttributableToOwnersOfParent'),
+        ('000002', 'ifrs-full_ProfitLoss'),
+    ]
+
+
+def test_bulk_statements_give_owners_net_income_ratio(tmp_path):
+    store = load(tmp_path)
+
+    items = store.get_financial_statements('000001', '2023', '11011')['CFS']
+    items = [{**item, 'base_display_name': base_display_name(item['account_id'], item['account_nm'])} for item in items]
+
+    assert calc_ratios(items)['순이익률']['thstrm'] == 22.5
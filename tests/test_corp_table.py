@@ -0,0 +1,84 @@
+"""회사 목록 테이블 차분 생성 테스트 (차분 결과가 전체 생성과 같아야 함)"""
+import random
+from backend.repositories.corp_table import GRAM_COLUMNS, ORDER_COLUMNS, STRING_COLUMNS, CorpTable
+from backend.repositories.dart_repository import CorpRecord
+from backend.services.corp_registry import diff_records
+
+SYLLABLES = '삼성전자현대모비스엘지화학카카오네이버한국금융지주'
+
+
+def make_record(rng: random.Random, n: int) -> CorpRecord:
+    name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 6)))
+    if n % 7 == 0:
+        name += '(주)'
+    return CorpRecord(f'{n:08d}', name, f'{n:06d}' if n % 3 == 0 else 'N/A')
+
+
+def rebuild(table: CorpTable) -> CorpTable:
+    """같은 행 번호로 전체 생성한 테이블"""
+    rows = [table[i] if table.is_live(i) else None for i in range(table.count)]
+    return CorpTable(CorpTable.build(rows))
+
+
+def assert_same_table(actual: CorpTable, expected: CorpTable):
+    assert actual.count == expected.count
+    for name in STRING_COLUMNS:
+        assert list(actual.columns[name]) == list(expected.columns[name]), name
+    for name in ORDER_COLUMNS:
+        assert list(getattr(actual, name)) == list(getattr(expected, name)), name
+    for name in GRAM_COLUMNS:
+        actual_postings = {gram: list(doc_ids) for gram, doc_ids in actual.gram_postings[name].items()}
+        expected_postings = {gram: list(doc_ids) for gram, doc_ids in expected.gram_postings[name].items()}
+        assert actual_postings == expected_postings, name
+
+
+def test_build_delta_matches_full_build():
+    rng = random.Random(7)
+    records = [make_record(rng, n) for n in range(500)]
+    base = CorpTable.from_records(records)
+
+    updated = [record for record in records if rng.random() > 0.05]
+    updated = [make_record(rng, int(r.corp_code)) if rng.random() < 0.05 else r for r in updated]
+    updated += [make_record(rng, n) for n in range(1000, 1030)]
+    delta = diff_records(base, updated)
+    assert delta.removed and delta.changed and delta.added
+
+    table = CorpTable(CorpTable.build_delta(base, delta.removed, delta.changed, delta.added))
+
+    assert_same_table(table, rebuild(table))
+    assert table.tombstones == len(delta.removed)
+    assert sorted(record.corp_code for record in table) == sorted({r.corp_code for r in updated})
+
+
+def test_build_delta_keeps_row_ids_and_finds_codes():
+    base = CorpTable.from_records([
+        CorpRecord('00000001', '삼성전자', '005930'),
+        CorpRecord('00000002', '현대모비스', '012330'),
+        CorpRecord('00000003', '카카오', 'N/A'),
+    ])
+    table = CorpTable(CorpTable.build_delta(
+        base,
+        removed=[1],
+        changed={2: CorpRecord('00000003', '카카오', '035720')},
+        added=[CorpRecord('00000004', '네이버', '035420')],
+    ))
+
+    assert_same_table(table, rebuild(table))
+    assert table.find_corp_code('00000001') == 0
+    assert table.find_corp_code('00000002') is None
+    assert table[2].stock_code == '035720'
+    assert table.find_corp_code('00000004') == 3
+    assert [record.corp_name for record in table] == ['네이버', '삼성전자', '카카오']
+    assert list(table.gram_postings['name_lower'].get('카')) == [2]
+
+
+def test_table_survives_file_round_trip(tmp_path):
+    path = str(tmp_path / 'corp_table.bin')
+    records = [CorpRecord('00000001', '삼성전자(주)', '005930'), CorpRecord('00000002', 'LG화학', 'N/A')]
+    CorpTable.write(path, CorpTable.build(records, {'content_hash': 'abc'}))
+
+    table = CorpTable.open(path)
+
+    assert table.meta == {'content_hash': 'abc'}
+    assert list(table) == records
+    assert table.names_normalized[0] == '삼성전자'
@@ -0,0 +1,57 @@
+"""DARTService 비교용 사업연도 계획과 재무 데이터 전처리 테스트"""
+import asyncio
+from backend.services.dart_service import DARTService
+
+# {corp_code: {사업연도: 보고서가 있는지}}
+FILED = {
+    'A': {2023: True, 2022: True, 2021: True},
+    'B': {2023: False, 2022: True, 2021: True},
+}
+
+
+def items(corp_code, year):
+    if not FILED[corp_code].get(year):
+        return []
+    return [{'sj_div': 'IS', 'account_nm': '매출액',
+             'thstrm_amount': '300', 'frmtrm_amount': '200', 'bfefrmtrm_amount': '100'}]
+
+
+class FakeDARTService(DARTService):
+    """get_financial_data_matrix()만 흉내 내는 서비스 (호출 기록)"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_financial_data_matrix(self, corp_codes, years, fs_div='CFS', reprt_code='11011'):
+        self.calls.append((sorted(corp_codes), years))
+        results = {
+            corp_code: {year: {'items': items(corp_code, int(year))} for year in years}
+            for corp_code in corp_codes
+        }
+        return results, []
+
+
+def test_comparison_fetches_one_report_and_falls_back_for_unfiled_years():
+    service = FakeDARTService()
+
+    results, failures = asyncio.run(service.get_comparison_filings(['A', 'B'], '2023'))
+
+    assert service.calls == [(['A', 'B'], ['2023']), (['B'], ['2022'])]
+    assert sorted(results['A']) == ['2023']
+    assert sorted(results['B']) == ['2022', '2023']
+    assert failures == []
+
+
+def test_prepare_data_leaves_shared_items_untouched():
+    shared = [
+        {'account_id': 'ifrs-full_ProfitLoss', 'account_nm': '당기순이익', 'thstrm_amount': '100'},
+        {'account_id': '-표준계정코드 미사용-', 'account_nm': '당기순이익', 'thstrm_amount': '90'},
+    ]
+    original = [dict(item) for item in shared]
+
+    prepared = FakeDARTService()._prepare_data(shared)
+
+    assert shared == original
+    assert [item['display_name'] for item in prepared] == [
+        '당기순이익 (ifrs-full_ProfitLoss)', '당기순이익 (-표준계정코드 미사용-)'
+    ]
@@ -0,0 +1,51 @@
+"""재무비율 계산에서 같은 이름 계정 선택 테스트"""
+from backend.repositories.statement_store import NON_STANDARD_ACCOUNT_ID
+from backend.services.ratio_engine import calc_ratios
+from backend.services.statement_service import statement_items
+from backend.utils.accounts import base_display_name
+
+
+def row(sj_div, account_id, account_nm, amount):
+    """저장소 계정 행 (당기/전기/전전기 같은 금액)"""
+    return {
+        'sj_div': sj_div, 'account_key': f'{sj_div}:{account_id}:{account_nm}',
+        'account_id': account_id, 'account_nm': account_nm,
+        'thstrm': amount, 'frmtrm': amount, 'bfefrmtrm': amount,
+    }
+
+
+def annotate(items):
+    """DARTService._prepare_data와 같은 기본 표시명"""
+    return [
+        {**item, 'base_display_name': base_display_name(item['account_id'], item['account_nm'])}
+        for item in items
+    ]
+
+
+def test_net_income_prefers_owners_line_over_later_same_named_rows():
+    rows = [
+        row('BS', 'ifrs-full_Assets', '자산총계', 1000),
+        row('BS', 'ifrs-full_Equity', '자본총계', 500),
+        row('IS', 'ifrs-full_Revenue', '매출액', 400),
+        row('IS', 'ifrs-full_ProfitLoss', '당기순이익', 100),
+        row('IS', 'ifrs-full_ProfitLossAttributableToOwnersOfParent', '지배기업의 소유주에게 귀속되는 당기순이익', 90),
+        row('IS', 'ifrs-full_ProfitLossAttributableToNonControllingInterests', '비지배지분에 귀속되는 당기순이익', 10),
+        row('IS', NON_STANDARD_ACCOUNT_ID, '당기순이익', 10),
+        row('IS', 'ifrs-full_BasicEarningsPerShare', '기본주당이익', 5),
+    ]
+
+    ratios = calc_ratios(annotate(statement_items(rows)))
+
+    assert ratios['ROE']['thstrm'] == 18.0
+    assert ratios['ROA']['thstrm'] == 9.0
+    assert ratios['순이익률']['frmtrm'] == 22.5
+
+
+def test_same_rank_rows_keep_last_item():
+    items = [
+        {'base_display_name': '자본총계', 'thstrm_amount': '100'},
+        {'base_display_name': '당기순이익', 'thstrm_amount': '10'},
+        {'base_display_name': '당기순이익', 'thstrm_amount': '20'},
+    ]
+
+    assert calc_ratios(items)['ROE']['thstrm'] == 20.0
@@ -0,0 +1,153 @@
+"""스크리너 조건식 컴파일과 작은 합성 행렬 검색 테스트"""
+import itertools
+import pandas as pd
+import pyarrow as pa
+import pytest
+from backend.services import screen_service
+from backend.services.screen_service import ScreenService, compile_expression
+
+# 회사별 사업보고서 (연도: {계정: 당기 금액}), 2021년 보고서의 전기/전전기로 2019~2020년도 채움
+COMPANIES = {
+    ('000001', '고성장'): {2021: (100, 20, 15, 1000, 400, 100), 2020: (80, 15, 10, 900, 300, 80)},
+    ('000002', '고부채'): {2021: (200, 10, 24, 2000, 1800, 200), 2020: (190, 9, 28, 1900, 1700, 190)},
+    ('000003', '적자'): {2021: (50, -5, -10, 500, 100, 400), 2020: (60, 2, 1, 520, 110, 410)},
+}
+ACCOUNTS = ('매출액', '영업이익', '당기순이익', '자산총계', '부채총계', '자본총계')
+ACCOUNT_IDS = (
+    'ifrs-full_Revenue', 'dart_OperatingIncomeLoss', 'ifrs-full_ProfitLoss',
+    'ifrs-full_Assets', 'ifrs-full_Liabilities', 'ifrs-full_Equity',
+)
+
+
+class FakeBulkStore:
+    """read_accounts()/version()만 있는 일괄 자료 저장소"""
+    _versions = itertools.count()
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+        self._version = next(self._versions)
+
+    def version(self):
+        return self._version
+
+    def read_accounts(self, reprt_code, fs_div, base_names):
+        return self.table
+
+
+def bulk_row(stock_code, corp_name, year, sj_div, ord_, account_id, account_nm, base_name, amount, frm=None):
+    return {
+        'stock_code': stock_code, 'corp_name': corp_name, 'market': 'KOSPI',
+        'bsns_year': str(year), 'sj_div': sj_div, 'ord': ord_,
+        'account_id': account_id, 'account_nm': account_nm, 'base_name': base_name,
+        'thstrm': float(amount), 'frmtrm': None if frm is None else float(frm), 'bfefrmtrm': None,
+    }
+
+
+def make_store(extra_rows=()) -> FakeBulkStore:
+    rows = []
+    for (stock_code, corp_name), reports in COMPANIES.items():
+        for year, amounts in reports.items():
+            previous = reports.get(year - 1, (None,) * len(ACCOUNTS))
+            for ord_, (base_name, account_id, amount, frm) in enumerate(zip(ACCOUNTS, ACCOUNT_IDS, amounts, previous)):
+                rows.append(bulk_row(stock_code, corp_name, year, 'BS' if ord_ >= 3 else 'IS', ord_,
+                                     account_id, base_name, base_name, amount, frm))
+    rows.extend(extra_rows)
+    return FakeBulkStore(pa.Table.from_pandas(pd.DataFrame(rows)))
+
+
+@pytest.fixture
+def service():
+    screen_service._matrices.clear()
+    yield ScreenService(make_store())
+    screen_service._matrices.clear()
+
+
+def codes(result):
+    return [row['stock_code'] for row in result['results']]
+
+
+def test_compile_expression_collects_metrics_and_caches():
+    compiled = compile_expression('ROE > 15 and 매출액 CAGR3 > 10% or 부채비율 < 1억')
+    assert compiled.is_condition
+    assert compiled.metrics == ('ROE', '매출액 CAGR3', '부채비율')
+    assert compile_expression('ROE > 15 and 매출액 CAGR3 > 10% or 부채비율 < 1억') is compiled
+    assert not compile_expression('영업이익 / 매출액 * 100').is_condition
+
+
+@pytest.mark.parametrize('expression', [
+    'ROE >',
+    '없는지표 > 1',
+    '(ROE > 1',
+    'ROE > 1 > 2',
+    'ROE and 부채비율 < 1',
+    '(ROE > 1) + 1',
+    'ROE @ 1',
+])
+def test_compile_expression_rejects_invalid(expression):
+    with pytest.raises(ValueError):
+        compile_expression(expression)
+
+
+def test_screen_filters_with_ratios(service):
+    result = service.screen('ROE > 10 and 부채비율 < 500')
+    assert result['year'] == 2021
+    assert result['universe'] == 3
+    assert codes(result) == ['000001']
+    assert result['results'][0]['ROE'] == 15.0
+    assert result['results'][0]['부채비율'] == 400.0
+
+
+def test_screen_growth_and_arithmetic(service):
+    assert codes(service.screen('매출액 YOY > 20')) == ['000001']
+    assert codes(service.screen('영업이익 / 매출액 * 100 >= 5')) == ['000001', '000002']
+    assert codes(service.screen('not 당기순이익 > 0')) == ['000003']
+    # 2019년 값이 없으므로 2년 성장률은 계산되지 않음
+    assert codes(service.screen('매출액 CAGR2 > -100')) == []
+
+
+def test_screen_sorts_and_limits(service):
+    result = service.screen('매출액 > 0', sort='ROE', descending=True, limit=2)
+    assert result['matched'] == 3
+    assert codes(result) == ['000001', '000002']
+
+    ascending = service.screen('매출액 > 0', sort='ROE', descending=False)
+    assert codes(ascending) == ['000003', '000002', '000001']
+
+
+def test_screen_matches_brute_force(service):
+    result = service.screen('자기자본비율 > 9 and 순이익률 > 0', year=2020)
+    expected = []
+    for (stock_code, _), reports in COMPANIES.items():
+        revenue, _, net_income, assets, _, equity = reports[2020]
+        if equity / assets * 100 > 9 and net_income / revenue * 100 > 0:
+            expected.append(stock_code)
+    assert codes(result) == expected
+    assert result['results'][0]['자기자본비율'] == round(190 / 1900 * 100, 2)
+
+
+def test_screen_rejects_value_expression(service):
+    with pytest.raises(ValueError):
+        service.screen('ROE')
+    with pytest.raises(ValueError):
+        service.screen('ROE > 1', sort='ROE > 2')
+
+
+def test_net_income_uses_owners_line_not_minority_interest():
+    # 당기순이익 100 = 지배기업 소유주 90 + 비지배지분 10, 적재 시점 기본 표시명은 모두 당기순이익
+    rows = [
+        bulk_row('000009', '지배', 2021, 'IS', 0, 'ifrs-full_Revenue', '매출액', '매출액', 1000),
+        bulk_row('000009', '지배', 2021, 'IS', 1, 'ifrs-full_ProfitLoss', '당기순이익', '당기순이익', 100),
+        bulk_row('000009', '지배', 2021, 'IS', 2, 'ifrs-full_ProfitLossAttributableToOwnersOfParent',
+                 '지배기업의 소유주에게 귀속되는 당기순이익', '당기순이익', 90),
+        bulk_row('000009', '지배', 2021, 'IS', 3, 'ifrs-full_ProfitLossAttributableToNoncontrollingInterests',
+                 '비지배지분에 귀속되는 당기순이익(손실)', '당기순이익', 10),
+        bulk_row('000009', '지배', 2021, 'IS', 4, '-표준계정코드 미사용-', '기본주당당기순이익', '당기순이익', 3),
+        bulk_row('000009', '지배', 2021, 'BS', 5, 'ifrs-full_Equity', '자본총계', '자본총계', 500),
+    ]
+    screen_service._matrices.clear()
+    result = ScreenService(make_store(rows)).screen('ROE > 0 and 당기순이익 > 0', year=2021)
+    screen_service._matrices.clear()
+
+    row = next(row for row in result['results'] if row['stock_code'] == '000009')
+    assert row['당기순이익'] == 90.0
+    assert row['ROE'] == 18.0
@@ -0,0 +1,66 @@
+"""전체 재무제표 적재/조회 테스트 (저장소 호출은 스레드에서)"""
+import asyncio
+import threading
+from backend.repositories.dart_repository import DART_STATUS_OK
+from backend.repositories.statement_store import StatementStore
+from backend.services.statement_service import StatementService
+
+
+class FakeRepo:
+    """get_full_statement()만 있는 DART 저장소"""
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = 0
+
+    async def get_full_statement(self, corp_code, bsns_year, reprt_code, fs_div):
+        self.calls += 1
+        return DART_STATUS_OK, self.items
+
+
+class ThreadRecordingStore(StatementStore):
+    """저장소 메서드를 부른 스레드 기록"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def filing(self, *key):
+        self.threads.add(threading.get_ident())
+        return super().filing(*key)
+
+    def replace_filing(self, *args):
+        self.threads.add(threading.get_ident())
+        return super().replace_filing(*args)
+
+    def lines(self, *key):
+        self.threads.add(threading.get_ident())
+        return super().lines(*key)
+
+
+def item(sj_div, account_id, account_nm, amount):
+    return {
+        'rcept_no': '20240312000001', 'sj_div': sj_div, 'account_id': account_id, 'account_nm': account_nm,
+        'thstrm_amount': str(amount), 'frmtrm_amount': str(amount), 'bfefrmtrm_amount': str(amount),
+    }
+
+
+def test_statements_load_once_and_keep_store_calls_off_the_event_loop(tmp_path):
+    repo = FakeRepo([
+        item('BS', 'ifrs-full_Assets', '자산총계', 1000),
+        item('IS', 'ifrs-full_Revenue', '매출액', 400),
+    ])
+    store = ThreadRecordingStore(str(tmp_path / 'statements.sqlite3'))
+    service = StatementService(repo, store)
+
+    async def run():
+        first = await service.get_statements('00000001', '2020')
+        second = await service.get_statements('00000001', '2020')
+        return first, second, threading.get_ident()
+
+    first, second, loop_thread = asyncio.run(run())
+
+    assert repo.calls == 1
+    assert first['rcept_no'] == second['rcept_no'] == '20240312000001'
+    assert [row['account_nm'] for row in second['lines']] == ['자산총계', '매출액']
+    assert store.threads and loop_thread not in store.threads
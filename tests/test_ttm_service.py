@@ -0,0 +1,83 @@
+"""TTM 계산 테스트 (1분기/반기/3분기/사업보고서)"""
+from backend.repositories.dart_repository import REPRT_ANNUAL, REPRT_HALF, REPRT_Q1, REPRT_Q3
+from backend.services.ttm_service import TTMEngine
+
+REVENUE = ('IS', '매출액')
+ASSETS = ('BS', '자산총계')
+
+
+def income(three_month, cumulative='', previous_three_month='', previous_cumulative='', rcept_no='1'):
+    return {
+        'rcept_no': rcept_no, 'sj_div': 'IS', 'account_nm': '매출액',
+        'thstrm_amount': three_month, 'thstrm_add_amount': cumulative,
+        'frmtrm_amount': previous_three_month, 'frmtrm_add_amount': previous_cumulative,
+    }
+
+
+def annual(current, previous='', before_previous='', rcept_no='1'):
+    return {
+        'rcept_no': rcept_no, 'sj_div': 'IS', 'account_nm': '매출액',
+        'thstrm_amount': current, 'frmtrm_amount': previous, 'bfefrmtrm_amount': before_previous,
+    }
+
+
+def ttm(engine: TTMEngine, period):
+    return engine._ttm.get(REVENUE, {}).get(period)
+
+
+def test_ttm_from_quarterly_and_annual_reports():
+    engine = TTMEngine()
+    engine.add_report('2023', REPRT_ANNUAL, [annual('1,000', '900')])
+    # 2023년 분기 누적: 200 / 450 / 700, 2024년: 300 / 600 / 900
+    engine.add_report('2024', REPRT_Q1, [income('300', '300', '200', '200')])
+    engine.add_report('2024', REPRT_HALF, [income('300', '600', '250', '450')])
+    engine.add_report('2024', REPRT_Q3, [income('300', '900', '250', '700')])
+
+    assert ttm(engine, (2023, 4)) == 1000
+    assert ttm(engine, (2024, 1)) == 1000 + 300 - 200
+    assert ttm(engine, (2024, 2)) == 1000 + 600 - 450
+    assert ttm(engine, (2024, 3)) == 1000 + 900 - 700
+    assert engine.latest_period() == (2024, 3)
+
+    recomputed = engine.add_report('2024', REPRT_ANNUAL, [annual('1,250', '1,000', '900', rcept_no='2')])
+    assert (2024, 4) in recomputed
+    assert ttm(engine, (2024, 4)) == 1250
+    assert engine.latest_period() == (2024, 4)
+
+
+def test_three_month_amount_is_not_used_as_year_to_date():
+    engine = TTMEngine()
+    engine.add_report('2023', REPRT_ANNUAL, [annual('1,000')])
+    engine.add_report('2023', REPRT_Q1, [income('200', '200')])
+    engine.add_report('2023', REPRT_HALF, [income('250', '450')])
+    engine.add_report('2023', REPRT_Q3, [income('250', '700')])
+    # 누적 금액 없이 3개월 금액만 있는 반기/3분기
+    engine.add_report('2024', REPRT_Q3, [income('300', rcept_no='3')])
+    assert ttm(engine, (2024, 3)) is None
+
+    engine.add_report('2024', REPRT_HALF, [income('300', rcept_no='2')])
+    assert ttm(engine, (2024, 2)) is None
+
+    engine.add_report('2024', REPRT_Q1, [income('300', rcept_no='1')])
+    assert ttm(engine, (2024, 1)) == 1000 + 300 - 200
+    assert ttm(engine, (2024, 2)) == 1000 + 600 - 450
+    assert ttm(engine, (2024, 3)) == 1000 + 900 - 700
+
+
+def test_balance_accounts_use_period_end_values():
+    engine = TTMEngine()
+    engine.add_report('2024', REPRT_HALF, [{
+        'rcept_no': '1', 'sj_div': 'BS', 'account_nm': '자산총계',
+        'thstrm_amount': '5,000', 'frmtrm_amount': '4,000',
+    }])
+
+    rows = {row['account_nm']: row for row in engine.series([(2023, 4), (2024, 2)])}
+    assert rows['자산총계']['kind'] == 'balance'
+    assert rows['자산총계']['values'] == {'2023Q4': 4000, '2024Q2': 5000}
+
+
+def test_same_report_is_applied_once():
+    engine = TTMEngine()
+    assert engine.add_report('2023', REPRT_ANNUAL, [annual('1,000')])
+    assert engine.add_report('2023', REPRT_ANNUAL, [annual('1,000')]) == set()
+    assert engine.has_report('2023', REPRT_ANNUAL, '1')